@@ -0,0 +1 @@
+"""Performance benchmarks for termgraph, see benchmarks/README.md."""
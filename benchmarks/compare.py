@@ -0,0 +1,111 @@
+"""Compare two benchmark runs and flag regressions.
+
+Usage: python -m benchmarks.compare BASELINE.json CURRENT.json [--threshold 0.1]
+
+Exits with status 1 when a case got slower, or used more memory, by more
+than the threshold. Times are compared by the fastest of the repeated
+runs, which is the least affected by noise from the rest of the system.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import sys
+
+# Cases faster than this are too noisy to flag.
+MIN_TIME = 0.001
+
+
+def load(filename: str) -> dict:
+    """Return the results of a run by (name, kind, rows)."""
+    with open(filename) as f:
+        run = json.load(f)
+    return {(r["name"], r["kind"], r["rows"]): r for r in run["results"]}
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float = 0.1, min_time: float = MIN_TIME
+) -> list[dict]:
+    """Compare the cases found in both runs.
+
+    :returns: One row per case with the time, memory and output size
+              ratios and whether it regressed
+    """
+    rows = []
+    for key in sorted(baseline.keys() & current.keys(), key=lambda k: (k[1], k[2], k[0])):
+        old, new = baseline[key], current[key]
+        time_ratio = new["min"] / old["min"] if old["min"] else 1.0
+
+        memory_ratio = None
+        if old.get("peak_bytes") and new.get("peak_bytes") is not None:
+            memory_ratio = new["peak_bytes"] / old["peak_bytes"]
+
+        output_ratio = None
+        if old.get("output_bytes") and new.get("output_bytes") is not None:
+            output_ratio = new["output_bytes"] / old["output_bytes"]
+
+        slower = time_ratio > 1 + threshold and new["min"] >= min_time
+        bigger = memory_ratio is not None and memory_ratio > 1 + threshold
+
+        rows.append(
+            {
+                "name": key[0],
+                "kind": key[1],
+                "rows": key[2],
+                "old": old["min"],
+                "new": new["min"],
+                "time_ratio": time_ratio,
+                "memory_ratio": memory_ratio,
+                "output_ratio": output_ratio,
+                "regression": slower or bigger,
+            }
+        )
+    return rows
+
+
+def _format_row(row: dict) -> str:
+    memory = f"{row['memory_ratio']:.2f}x" if row["memory_ratio"] is not None else "-"
+    output = f"{row['output_ratio']:.2f}x" if row["output_ratio"] is not None else "-"
+    flag = "REGRESSION" if row["regression"] else ""
+    return (
+        f"{row['name']:<26}{row['kind']:<11}{row['rows']:>10}"
+        f"{row['old'] * 1000:>10.2f}ms{row['new'] * 1000:>10.2f}ms"
+        f"{row['time_ratio']:>8.2f}x{memory:>8}{output:>8}  {flag}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="compare two benchmark runs")
+    parser.add_argument("baseline", help="JSON results of the earlier run")
+    parser.add_argument("current", help="JSON results of the new run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed slowdown or memory growth, as a fraction default:0.1",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=MIN_TIME,
+        help="Ignore slowdowns of cases faster than this many seconds",
+    )
+    args = parser.parse_args()
+
+    rows = compare(load(args.baseline), load(args.current), args.threshold, args.min_time)
+
+    print(
+        f"{'case':<26}{'kind':<11}{'rows':>10}{'baseline':>12}{'current':>12}"
+        f"{'time':>9}{'memory':>8}{'output':>8}"
+    )
+    for row in rows:
+        print(_format_row(row))
+
+    regressions = sum(row["regression"] for row in rows)
+    if regressions:
+        print(f"\n{regressions} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Synthetic data files for the benchmarks.
+
+Usage: python -m benchmarks.generate KIND ROWS FILENAME [--seed SEED]
+"""
+
+from __future__ import annotations
+import argparse
+import random
+from datetime import date, timedelta
+from typing import Callable, TextIO
+
+# Rows are written in batches to keep memory flat for large files.
+BATCH = 10000
+
+CATEGORIES = ["Alpha", "Beta", "Gamma"]
+
+# Ten years of days.
+CALENDAR_DAYS = 3653
+
+
+def _write_rows(f: TextIO, rows: int, make_row: Callable[[int], str]) -> None:
+    for start in range(0, rows, BATCH):
+        f.write("".join(make_row(i) for i in range(start, min(start + BATCH, rows))))
+
+
+def write_flat(f: TextIO, rows: int, rng: random.Random) -> None:
+    """One value per row, for bar and vertical charts."""
+    _write_rows(f, rows, lambda i: f"row{i},{rng.uniform(-500, 500):.2f}\n")
+
+
+def write_multi(f: TextIO, rows: int, rng: random.Random) -> None:
+    """One value per category, for multi-series and stacked charts."""
+    f.write("# Synthetic multi-category data\n")
+    f.write(f"@ {','.join(CATEGORIES)}\n")
+    _write_rows(
+        f,
+        rows,
+        lambda i: f"row{i}," + ",".join(f"{rng.uniform(0, 1000):.2f}" for _ in CATEGORIES) + "\n",
+    )
+
+
+def write_histogram(f: TextIO, rows: int, rng: random.Random) -> None:
+    """Normally distributed samples, for histograms."""
+    _write_rows(f, rows, lambda i: f"s{i},{rng.gauss(100, 15):.3f}\n")
+
+
+def write_calendar(f: TextIO, rows: int, rng: random.Random) -> None:
+    """One value per day up to today, for calendar heatmaps.
+
+    Dates repeat every CALENDAR_DAYS rows so any number of rows is valid.
+    """
+    days = min(rows, CALENDAR_DAYS)
+    first = date.today() - timedelta(days=days - 1)
+    _write_rows(
+        f,
+        rows,
+        lambda i: f"{(first + timedelta(days=i % days)).isoformat()},{rng.randint(0, 100)}\n",
+    )
+
+
+GENERATORS = {
+    "flat": write_flat,
+    "multi": write_multi,
+    "histogram": write_histogram,
+    "calendar": write_calendar,
+}
+
+
+def generate(kind: str, rows: int, filename: str, seed: int = 0) -> str:
+    """Write a synthetic data file and return its name."""
+    rng = random.Random(seed)
+    with open(filename, "w") as f:
+        GENERATORS[kind](f, rows, rng)
+    return filename
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="write synthetic termgraph data")
+    parser.add_argument("kind", choices=sorted(GENERATORS))
+    parser.add_argument("rows", type=int)
+    parser.add_argument("filename")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate(args.kind, args.rows, args.filename, args.seed)
+
+
+if __name__ == "__main__":
+    main()
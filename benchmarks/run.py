@@ -0,0 +1,292 @@
+"""Time parsing, normalization and drawing of every chart type.
+
+Usage: python -m benchmarks.run [--sizes N ...] [--repeat N] [--output FILE]
+
+Every case is timed `repeat` times and then run once more under tracemalloc
+for its peak memory. The results are printed as a table and, with
+--output, written as JSON for benchmarks.compare.
+"""
+
+from __future__ import annotations
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Union
+
+from termgraph.args import Args
+from termgraph.chart import (
+    BarChart,
+    HistogramChart,
+    LineChart,
+    ScatterChart,
+    SparklineChart,
+    StackedChart,
+    VerticalChart,
+)
+from termgraph.data import Data
+from termgraph.termgraph import calendar_heatmap
+
+from .generate import generate
+
+SIZES = [100, 1000, 10000, 100000]
+
+Case = Callable[[str], Callable[[], object]]
+
+
+class _NullWriter:
+    """Text sink that discards everything, stands in for the terminal.
+
+    While counting is set, the UTF-8 bytes written to any sink are added
+    up in written, see output_bytes().
+    """
+
+    counting = False
+    written = 0
+
+    def write(self, text: str) -> int:
+        if _NullWriter.counting:
+            _NullWriter.written += len(text.encode("utf-8"))
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _parse(path: str) -> Callable[[], object]:
+    return lambda: Data.from_file(path, {})
+
+
+def _normalize(path: str) -> Callable[[], object]:
+    data = Data.from_file(path, {})
+
+    def run() -> object:
+        data.invalidate()
+        return data.normalize(50)
+
+    return run
+
+
+def _draw(chart_cls: type, **kwargs) -> Case:
+    def case(path: str) -> Callable[[], object]:
+        data = Data.from_file(path, {})
+        args = Args(**kwargs)
+
+        def run() -> None:
+            data.invalidate()
+            with contextlib.redirect_stdout(_NullWriter()):
+                chart_cls(data, args).draw()
+
+        return run
+
+    return case
+
+
+def _calendar(path: str) -> Callable[[], object]:
+    data = Data.from_file(path, {})
+    args = {"color": None, "custom_tick": "", "start_dt": None}
+    return lambda: calendar_heatmap(data.data, data.labels, args, _NullWriter())
+
+
+# Cases by input kind, see benchmarks.generate.
+CASES: dict[str, dict[str, Case]] = {
+    "flat": {
+        "parse": _parse,
+        "normalize": _normalize,
+        "draw.BarChart": _draw(BarChart),
+        "draw.VerticalChart": _draw(VerticalChart, vertical=True),
+        "draw.SparklineChart": _draw(SparklineChart, spark=True),
+        "draw.LineChart": _draw(LineChart, line=True),
+    },
+    "multi": {
+        "parse": _parse,
+        "normalize": _normalize,
+        "draw.BarChart": _draw(BarChart),
+        "draw.StackedChart": _draw(StackedChart, stacked=True),
+        "draw.BarChart.colors": _draw(BarChart, colors=[91, 94, 92]),
+        "draw.StackedChart.colors": _draw(StackedChart, stacked=True, colors=[91, 94, 92]),
+        "draw.SparklineChart": _draw(SparklineChart, spark=True),
+        "draw.LineChart": _draw(LineChart, line=True),
+        "draw.ScatterChart": _draw(ScatterChart, scatter=True),
+    },
+    "histogram": {
+        "parse": _parse,
+        "draw.HistogramChart": _draw(HistogramChart, histogram=True, bins=20),
+    },
+    "calendar": {
+        "parse": _parse,
+        "draw.calendar_heatmap": _calendar,
+    },
+}
+
+
+def time_case(run: Callable[[], object], repeat: int) -> list[float]:
+    """Return the wall time of each of repeat runs, in seconds."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def peak_memory(run: Callable[[], object]) -> int:
+    """Return the peak of memory allocated during one run, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def output_bytes(run: Callable[[], object]) -> int:
+    """Return the bytes one run writes to the terminal, escapes included."""
+    _NullWriter.counting, _NullWriter.written = True, 0
+    try:
+        run()
+        return _NullWriter.written
+    finally:
+        _NullWriter.counting = False
+
+
+def run_benchmarks(
+    sizes: list[int],
+    repeat: int = 3,
+    kinds: Union[list[str], None] = None,
+    match: str = "",
+    memory: bool = True,
+    data_dir: Union[str, None] = None,
+    log: Callable[[str], None] = print,
+) -> dict:
+    """Run the benchmarks and return the results.
+
+    :sizes: Numbers of input rows
+    :repeat: Timed runs per case
+    :kinds: Input kinds to run, defaults to all of CASES
+    :match: Only run the cases whose name contains this
+    :memory: Measure the peak memory with tracemalloc
+    :data_dir: Where the generated inputs are kept, reused when present
+    :log: Called with a line of the table for every case
+    """
+    if data_dir is None:
+        data_dir = tempfile.mkdtemp(prefix="termgraph-bench-")
+    os.makedirs(data_dir, exist_ok=True)
+
+    results = []
+    log(
+        f"{'case':<26}{'kind':<11}{'rows':>10}{'median':>12}{'min':>12}{'peak':>12}"
+        f"{'output':>12}"
+    )
+
+    for kind in kinds or list(CASES):
+        for rows in sizes:
+            path = os.path.join(data_dir, f"{kind}-{rows}.dat")
+            if not os.path.exists(path):
+                generate(kind, rows, path)
+
+            for name, case in CASES[kind].items():
+                if match not in name:
+                    continue
+
+                run = case(path)
+                times = time_case(run, repeat)
+                peak = peak_memory(run) if memory else None
+                output = output_bytes(run) if name.startswith("draw") else None
+
+                result = {
+                    "name": name,
+                    "kind": kind,
+                    "rows": rows,
+                    "times": times,
+                    "median": statistics.median(times),
+                    "min": min(times),
+                    "peak_bytes": peak,
+                    "output_bytes": output,
+                }
+                results.append(result)
+                log(_format_result(result))
+
+    return {"meta": _meta(repeat), "results": results}
+
+
+def _format_result(result: dict) -> str:
+    peak = result["peak_bytes"]
+    peak_text = f"{peak / 2**20:.1f}MiB" if peak is not None else "-"
+    output = result["output_bytes"]
+    output_text = f"{output / 2**10:.1f}KiB" if output is not None else "-"
+    return (
+        f"{result['name']:<26}{result['kind']:<11}{result['rows']:>10}"
+        f"{result['median'] * 1000:>10.2f}ms{result['min'] * 1000:>10.2f}ms"
+        f"{peak_text:>12}{output_text:>12}"
+    )
+
+
+def _meta(repeat: int) -> dict:
+    try:
+        import numpy
+
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "numpy": numpy_version,
+        "repeat": repeat,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="benchmark termgraph")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=SIZES,
+        help="Numbers of input rows, up to 1e7 default: 100 1000 10000 100000",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+    parser.add_argument(
+        "--kinds", nargs="+", choices=sorted(CASES), help="Input kinds to run"
+    )
+    parser.add_argument(
+        "--match", default="", help="Only run cases whose name contains this"
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the tracemalloc run"
+    )
+    parser.add_argument("--data-dir", help="Keep the generated inputs here")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        args.sizes,
+        repeat=args.repeat,
+        kinds=args.kinds,
+        match=args.match,
+        memory=not args.no_memory,
+        data_dir=args.data_dir,
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
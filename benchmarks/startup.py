@@ -0,0 +1,130 @@
+"""Measure how long the termgraph CLI takes to start.
+
+Usage: python -m benchmarks.startup [--repeat N] [--budget-ms MS]
+
+The import of termgraph.termgraph is timed with `python -X importtime`,
+which also tells which modules it pulled in, and a whole run drawing a
+small chart is timed against a bare interpreter. Exits with status 1 when
+the import takes longer than the budget or imports one of HEAVY_MODULES,
+which only the charts needing them should load.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Union
+
+MODULE = "termgraph.termgraph"
+
+# Import time budget of MODULE, in milliseconds.
+BUDGET_MS = 40.0
+
+# Modules that must not be imported just to start the CLI.
+HEAVY_MODULES = (
+    "numpy",
+    "colorama",
+    "importlib.metadata",
+    "datetime",
+    "termgraph.live",
+    "termgraph.sketch",
+)
+
+SAMPLE = "a 1\nb 2\nc 3\n"
+
+
+def _env() -> dict:
+    # Let the first run write the bytecode cache, as an installed package has.
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def import_times(module: str = MODULE, python: str = sys.executable) -> dict:
+    """Import module in a fresh interpreter and return what it imported.
+
+    :returns: The cumulative import time in microseconds of every module
+              imported, by name
+    """
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=_env(),
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        try:
+            cumulative = int(fields[1])
+        except ValueError:
+            continue  # The header line
+        times[fields[2].strip()] = cumulative
+    return times
+
+
+def wall_time(command: list[str], repeat: int, stdin: str = "") -> float:
+    """Return the fastest of repeat runs of the command, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, input=stdin, capture_output=True, text=True, env=_env())
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def measure(repeat: int = 5, python: str = sys.executable) -> dict:
+    """Return the import time, the heavy modules imported and the wall times."""
+    import_times(python=python)  # Warm up the bytecode cache
+
+    runs = [import_times(python=python) for _ in range(repeat)]
+    return {
+        "import_ms": statistics.median(run[MODULE] for run in runs) / 1000,
+        "heavy_modules": [name for name in HEAVY_MODULES if name in runs[0]],
+        "interpreter_s": wall_time([python, "-c", "pass"], repeat),
+        "cli_s": wall_time([python, "-m", MODULE], repeat, SAMPLE),
+    }
+
+
+def check(result: dict, budget_ms: float = BUDGET_MS) -> list[str]:
+    """Return what is over budget, empty when startup is fine."""
+    problems = [f"imports {name}" for name in result["heavy_modules"]]
+    if result["import_ms"] > budget_ms:
+        problems.append(
+            f"import takes {result['import_ms']:.1f}ms, over the {budget_ms:g}ms budget"
+        )
+    return problems
+
+
+def main(argv: Union[list[str], None] = None) -> None:
+    parser = argparse.ArgumentParser(description="measure termgraph startup time")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs to time")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=BUDGET_MS,
+        help=f"Allowed import time of {MODULE} default:{BUDGET_MS:g}",
+    )
+    args = parser.parse_args(argv)
+
+    result = measure(args.repeat)
+    overhead = result["cli_s"] - result["interpreter_s"]
+    print(f"import {MODULE}: {result['import_ms']:.1f}ms (budget {args.budget_ms:g}ms)")
+    print(f"bare interpreter:      {result['interpreter_s'] * 1000:.1f}ms")
+    print(f"termgraph 3 rows:      {result['cli_s'] * 1000:.1f}ms (+{overhead * 1000:.1f}ms)")
+
+    problems = check(result, args.budget_ms)
+    if problems:
+        print("\n" + "\n".join(problems))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,40 @@
-__all__ = ["main", "Data", "Args", "Colors", "Chart", "HorizontalChart", "BarChart", "StackedChart", "VerticalChart", "HistogramChart"]
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .args import Args
+    from .chart import (
+        BarChart,
+        Chart,
+        Colors,
+        HistogramChart,
+        HorizontalChart,
+        LineChart,
+        ScatterChart,
+        SparklineChart,
+        StackedChart,
+        VerticalChart,
+    )
+    from .data import Data, RollingData
+    from .termgraph import main
+
+__all__ = ["main", "Data", "RollingData", "Args", "Colors", "Chart", "HorizontalChart", "BarChart", "StackedChart", "VerticalChart", "HistogramChart", "SparklineChart", "LineChart", "ScatterChart"]
 
 def __getattr__(name):
     if name == "main":
         from .termgraph import main
         return main
-    elif name in ["Data", "Args", "Colors", "Chart", "HorizontalChart", "BarChart", "StackedChart", "VerticalChart", "HistogramChart"]:
+    elif name in ["Data", "RollingData", "Args", "Colors", "Chart", "HorizontalChart", "BarChart", "StackedChart", "VerticalChart", "HistogramChart", "SparklineChart", "LineChart", "ScatterChart"]:
         # Import from the new modular structure
         if name == "Data":
             from .data import Data
             return Data
+        elif name == "RollingData":
+            from .data import RollingData
+            return RollingData
         elif name == "Args":
             from .args import Args
             return Args
-        elif name in ["Colors", "Chart", "HorizontalChart", "BarChart", "StackedChart", "VerticalChart", "HistogramChart"]:
-            from .chart import Colors, Chart, HorizontalChart, BarChart, StackedChart, VerticalChart, HistogramChart
-            return {"Colors": Colors, "Chart": Chart, "HorizontalChart": HorizontalChart, "BarChart": BarChart, "StackedChart": StackedChart, "VerticalChart": VerticalChart, "HistogramChart": HistogramChart}[name]
+        elif name in ["Colors", "Chart", "HorizontalChart", "BarChart", "StackedChart", "VerticalChart", "HistogramChart", "SparklineChart", "LineChart", "ScatterChart"]:
+            from .chart import Colors, Chart, HorizontalChart, BarChart, StackedChart, VerticalChart, HistogramChart, SparklineChart, LineChart, ScatterChart
+            return {"Colors": Colors, "Chart": Chart, "HorizontalChart": HorizontalChart, "BarChart": BarChart, "StackedChart": StackedChart, "VerticalChart": VerticalChart, "HistogramChart": HistogramChart, "SparklineChart": SparklineChart, "LineChart": LineChart, "ScatterChart": ScatterChart}[name]
     raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
\ No newline at end of file
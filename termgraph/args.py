@@ -20,16 +20,26 @@ class Args:
         "vertical": False,
         "stacked": False,
         "histogram": False,
+        "spark": False,
+        "spark_rows": False,
+        "line": False,
+        "scatter": False,
+        "height": 10,
         "bins": 5,
         "different_scale": False,
         "calendar": False,
         "start_dt": None,
+        "end_dt": None,
         "custom_tick": "",
         "delim": "",
         "verbose": False,
         "label_before": False,
         "percentage": False,
         "no_readable": False,
+        "scale": None,
+        "label_width": None,
+        "percentiles": False,
+        "window": None,
     }
 
     def __init__(self, **kwargs):
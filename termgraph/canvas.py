@@ -0,0 +1,90 @@
+"""Braille canvas for termgraph - draws points and lines with 2 by 4 dots per cell."""
+
+from __future__ import annotations
+from typing import Union
+
+from .utils import SGREncoder
+
+# The first braille pattern, without any dots.
+BRAILLE_BASE = 0x2800
+
+# Bit of the dot at (x, y) of a cell, indexed by y * 2 + x.
+_DOT_BITS = (0x01, 0x08, 0x02, 0x10, 0x04, 0x20, 0x40, 0x80)
+
+
+class BrailleCanvas:
+    """A grid of pixels drawn as braille characters.
+
+    Every character cell holds 2 by 4 pixels, so a canvas of width by
+    height cells has 2 * width by 4 * height pixels. Pixel (0, 0) is the
+    top left corner. A cell takes the color of the last pixel set in it.
+    """
+
+    def __init__(self, width: int, height: int):
+        """Initialize the canvas
+
+        :width: Width in character cells
+        :height: Height in character cells
+        """
+        if width < 1 or height < 1:
+            raise Exception("The canvas needs at least one cell")
+
+        self.width = width
+        self.height = height
+        self.dots = [bytearray(width) for _ in range(height)]
+        self.colors: list[list[Union[int, None]]] = [[None] * width for _ in range(height)]
+
+    @property
+    def pixel_width(self) -> int:
+        return self.width * 2
+
+    @property
+    def pixel_height(self) -> int:
+        return self.height * 4
+
+    def set(self, x: int, y: int, color: Union[int, None] = None) -> None:
+        """Set the pixel at (x, y), pixels outside of the canvas are ignored."""
+        if 0 <= x < self.width * 2 and 0 <= y < self.height * 4:
+            row, col = y >> 2, x >> 1
+            self.dots[row][col] |= _DOT_BITS[(y & 3) * 2 + (x & 1)]
+            self.colors[row][col] = color
+
+    def column(self, x: int, top: int, bottom: int, color: Union[int, None] = None) -> None:
+        """Set the pixels of column x from y = top to y = bottom."""
+        for y in range(max(top, 0), min(bottom, self.height * 4 - 1) + 1):
+            self.set(x, y, color)
+
+    def line(self, x0: int, y0: int, x1: int, y1: int, color: Union[int, None] = None) -> None:
+        """Set the pixels of the line from (x0, y0) to (x1, y1), with Bresenham's algorithm."""
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        step_x = 1 if x0 < x1 else -1
+        step_y = 1 if y0 < y1 else -1
+        error = dx + dy
+
+        while True:
+            self.set(x0, y0, color)
+            if x0 == x1 and y0 == y1:
+                return
+            double = 2 * error
+            if double >= dy:
+                error += dy
+                x0 += step_x
+            if double <= dx:
+                error += dx
+                y0 += step_y
+
+    def rows(self) -> list[str]:
+        """Return the lines of characters, from the top one down.
+
+        Cells without dots are spaces. Every line starts and ends in the
+        default color.
+        """
+        lines = []
+        for dots, colors in zip(self.dots, self.colors):
+            sgr = SGREncoder()
+            line = [
+                sgr.paint(chr(BRAILLE_BASE + bits), color) if bits else " "
+                for bits, color in zip(dots, colors)
+            ]
+            lines.append("".join(line) + sgr.reset())
+        return lines
@@ -3,21 +3,36 @@
 from __future__ import annotations
 import math
 import sys
-from typing import Union, List, Tuple
-from itertools import zip_longest
-from colorama import just_fix_windows_console
-from .constants import TICK, SM_TICK, AVAILABLE_COLORS
-from .utils import cvt_to_readable, print_row_core
-from .data import Data
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence, Union, TextIO
+from itertools import chain
+from .constants import TICK, SM_TICK, SPARK_TICKS, AVAILABLE_COLORS, PERCENTILES
+from .utils import (
+    SGREncoder,
+    cvt_to_readable,
+    fix_windows_console,
+    format_row_core,
+    write_output,
+)
+from .data import _ROW_TYPES, Data, _numpy, bin_counts
+from .canvas import BrailleCanvas
 from .args import Args
+from . import profiling
+
+if TYPE_CHECKING:
+    from .sketch import KLLSketch
 
-# colorama
-just_fix_windows_console()
 
 def format_value(
     value: Union[int, float], args
 ) -> str:
     """Format a value consistently across chart types."""
+    if profiling.active is None:
+        return _format_value(value, args)
+    with profiling.active.phase("format"):
+        return _format_value(value, args)
+
+
+def _format_value(value: Union[int, float], args) -> str:
     format_str = args.get_arg("format")
 
     # Initial format
@@ -66,7 +81,9 @@ class Chart:
 
         self.data = data
         self.args = args
-        self.normal_data = self._normalize()
+        with profiling.phase("normalize"):
+            # Its rows are whatever the chart draws from, bar lengths for most.
+            self.normal_data: list = self._normalize()
 
         # Get custom tick if set, otherwise use default TICK
         custom_tick = self.args.get_arg("custom_tick")
@@ -75,35 +92,117 @@ class Chart:
     def draw(self) -> None:
         """Draw the chart with the given data"""
 
+        self.render(sys.stdout)
+
+    def render(self, out: Union[TextIO, int, None] = None) -> str:
+        """Render the chart into a single string.
+
+        :out: Optional file-like object or file descriptor, the rendered
+              chart is written to it with a single bulk write.
+        :returns: The rendered chart.
+
+        """
+
+        buf: list[str] = []
+        with profiling.phase("render"):
+            self._render(buf)
+            text = "".join(buf)
+
+        if out is not None:
+            write_output(text, out)
+
+        return text
+
+    def update(self, label: Union[str, None] = None, values=None) -> None:
+        """Bring the chart up to date with rows added to or replaced in its data.
+
+        Data.append(), extend() and update() keep the memoized normalized
+        data of the bar, stacked and vertical charts current by normalizing
+        the changed rows only, which the chart picks up here. All rows are
+        normalized again when the changes moved the minimum or the maximum
+        the chart is scaled to.
+
+        :label: Optional label of a row to replace or append first, with
+                Data.update()
+        :values: The values of that row
+        """
+        if label is not None:
+            self.data.update(label, values)
+        with profiling.phase("normalize"):
+            self.normal_data = self._normalize()
+
+    async def render_async(self, out=None) -> str:
+        """Render the chart without blocking the event loop.
+
+        The chart is rendered in a worker thread. An asyncio.StreamWriter
+        is written to and drained, other outputs as in render() are written
+        from the worker thread, so a slow terminal doesn't block the loop.
+
+        :out: Optional asyncio.StreamWriter, file-like object or file
+              descriptor to write the rendered chart to.
+        :returns: The rendered chart.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(None, self.render)
+
+        if hasattr(out, "drain"):
+            out.write(text.encode("utf-8"))
+            await out.drain()
+        elif out is not None:
+            await loop.run_in_executor(None, write_output, text, out)
+
+        return text
+
+    def _render(self, buf: list[str]) -> None:
+        """Append the rendered chart to buf."""
+
         raise NotImplementedError()
 
-    def _print_header(self) -> None:
+    def _render_header(self, buf: list[str]) -> None:
         title = self.args.get_arg("title")
 
         if title is not None:
-            print("")
-            print(f"# {title}\n")
+            buf.append(f"\n# {title}\n\n")
 
         if len(self.data.categories) > 0:
-            colors = self.args.get_arg("colors")
+            arg = self.args.get_arg("colors")
+            colors: list[Union[int, None]] = arg if isinstance(arg, list) else []
+            sgr = SGREncoder()
 
             # Print categories' names above the graph.
             for i in range(len(self.data.categories)):
-                if colors is not None and isinstance(colors, list):
-                    sys.stdout.write(f"\033[{colors[i]}m")  # Start to write colorized.
-
-                sys.stdout.write(f"{self.tick} {self.data.categories[i]} ")
-                if colors:
-                    sys.stdout.write("\033[0m")  # Back to original.
+                color = colors[i] if i < len(colors) else None
+                buf.append(sgr.paint(f"{self.tick} {self.data.categories[i]} ", color))
 
-            print("\n")
+            buf.append(sgr.reset() + "\n\n")
 
     def _normalize(self) -> list[list[float]]:
         """Normalize the data and return it."""
         width = self.args.get_arg("width")
         if not isinstance(width, int):
             width = 50  # Default width
-        return self.data.normalize(width)
+        return self.data.normalize(width, self._scale())
+
+    def _scale(self) -> Union[tuple[float, float], None]:
+        """Return the fixed (min, max) scale from the arguments, if any."""
+        scale = self.args.get_arg("scale")
+        if isinstance(scale, (tuple, list)):
+            return scale[0], scale[1]
+        return None
+
+    def _val_min(self) -> Union[int, float]:
+        """Return the minimum value, taken from the fixed scale if set."""
+        scale = self._scale()
+        return scale[0] if scale is not None else self.data.find_min()
+
+    def _label_width(self) -> int:
+        """Return the width of the label column."""
+        label_width = self.args.get_arg("label_width")
+        if isinstance(label_width, int) and not isinstance(label_width, bool):
+            return label_width
+        return self.data.find_max_label_length()
 
 
 class HorizontalChart(Chart):
@@ -134,15 +233,74 @@ class HorizontalChart(Chart):
         2: ▇▇▇ 3
         3: ▇▇▇▇ 4
         """
-        doprint = self.args.get_arg("label_before") and not self.args.get_arg(
-            "vertical"
+        fix_windows_console()
+        sys.stdout.write(
+            self.format_row(value, num_blocks, val_min, color, label, tail)
         )
 
-        if doprint:
-            print(label, tail, " ", end="")
+    @classmethod
+    def render_chunks(
+        cls,
+        chunks: Iterable[Data],
+        args: Args,
+        out: Union[TextIO, int, None] = None,
+    ) -> None:
+        """Render a chart from consecutive chunks of data.
+
+        Each chunk, e.g. from Data.iter_file(), is rendered and written as
+        soon as it is read, so memory is bounded by the chunk size. All chunks
+        must share one scale, which is taken from the "scale" argument; use
+        Data.scan_file() for a first pass when it is not known up front. A
+        scale per category, "different_scale", is not supported.
 
+        :chunks: Iterable of Data objects
+        :args: The arguments for the chart, "scale" is required
+        :out: File-like object or file descriptor, defaults to sys.stdout
+        """
+        if args.get_arg("scale") is None:
+            raise Exception("Rendering chunks requires a fixed scale")
+        if args.get_arg("different_scale"):
+            raise Exception("Rendering chunks requires one scale for all the categories")
+
+        start = 0
+        for chunk in chunks:
+            chart = cls(chunk, args)
+            buf: list[str] = []
+            with profiling.phase("render"):
+                if start == 0:
+                    chart._render_header(buf)
+                chart._render_rows(buf, start)
+            write_output("".join(buf), out)
+            start += len(chunk.labels)
+
+    def _render(self, buf: list[str]) -> None:
+        """Renders the chart"""
+        self._render_header(buf)
+        self._render_rows(buf)
+
+    def _render_rows(self, buf: list[str], start: int = 0) -> None:
+        """Append the rows of the chart to buf.
+
+        :start: Index of the first row within the whole chart
+        """
 
-        print_row_core(
+        raise NotImplementedError()
+
+    def format_row(
+        self,
+        value: Union[int, float],
+        num_blocks: Union[int, float],
+        val_min: Union[int, float],
+        color: Union[int, None],
+        label: str = "",
+        tail: str = "",
+    ) -> str:
+        """Build a row for a horizontal graph, see print_row()."""
+        doprint = self.args.get_arg("label_before") and not self.args.get_arg(
+            "vertical"
+        )
+
+        row = format_row_core(
             value=float(value),
             num_blocks=int(num_blocks),
             val_min=float(val_min),
@@ -152,7 +310,9 @@ class HorizontalChart(Chart):
         )
 
         if doprint:
-            print()
+            return f"{label} {tail}  {row}\n"
+
+        return row
 
 
 class BarChart(HorizontalChart):
@@ -172,30 +332,16 @@ class BarChart(HorizontalChart):
         """Normalize the data and return it."""
         if self.args.get_arg("different_scale"):
             # Normalization per category
-            normal_data: List[List[float]] = [[] for _ in range(len(self.data.data))]
             width = self.args.get_arg("width")
             if not isinstance(width, int):
                 width = 50  # Default width
 
-            if self.data.dims and len(self.data.dims) > 1:
-                for i in range(self.data.dims[1]):
-                    cat_data = [[dat[i]] for dat in self.data.data]
-
-                    # Create temporary Data object for category data
-                    from .data import Data
-                    temp_data = Data(cat_data, [f"cat_{j}" for j in range(len(cat_data))])
-                    normal_cat_data = temp_data.normalize(width)
-
-                    for row_idx, norm_val in enumerate(normal_cat_data):
-                        normal_data[row_idx].append(norm_val[0])
-            return normal_data
+            return self.data.normalize_categories(width)
         else:
             return super()._normalize()
 
-    def draw(self) -> None:
-        """Draws the chart"""
-        self._print_header()
-
+    def _render_rows(self, buf: list[str], start: int = 0) -> None:
+        """Renders the rows of the chart"""
         colors = (
             self.args.get_arg("colors")
             if self.args.get_arg("colors") is not None
@@ -203,27 +349,30 @@ class BarChart(HorizontalChart):
             * (self.data.dims[1] if self.data.dims and len(self.data.dims) > 1 else 1)
         )
 
-        val_min = self.data.find_min()
+        val_min = self._val_min()
+        no_labels = self.args.get_arg("no_labels")
+        label_before = self.args.get_arg("label_before")
+        space_between = self.args.get_arg("space_between")
+        inline = not label_before and not self.args.get_arg("vertical")
+
+        if no_labels:
+            label_fmt = ""
+        else:
+            label_width = self._label_width()
+            label_fmt = "{:<{x}}" if label_before else "{:<{x}}: "
 
         for i in range(len(self.data.labels)):
-            if self.args.get_arg("no_labels"):
+            if no_labels:
                 # Hide the labels.
                 label = ""
             else:
-                if self.args.get_arg("label_before"):
-                    fmt = "{:<{x}}"
-                else:
-                    fmt = "{:<{x}}: "
-
-                label = fmt.format(
-                    self.data.labels[i], x=self.data.find_max_label_length()
-                )
+                label = label_fmt.format(self.data.labels[i], x=label_width)
 
             values = self.data.data[i]
             num_blocks = self.normal_data[i]
 
             # Handle both flat data (numbers) and nested data (lists)
-            if not isinstance(values, list):
+            if not isinstance(values, _ROW_TYPES):
                 # Flat data: convert single value to list
                 values = [values]
                 if isinstance(num_blocks, list):
@@ -231,8 +380,8 @@ class BarChart(HorizontalChart):
                 else:
                     num_blocks = [num_blocks]
 
-            if self.args.get_arg("space_between") and i != 0:
-                print()
+            if space_between and start + i != 0:
+                buf.append("\n")
 
             for j in range(len(values)):
                 # In Multiple series graph 1st category has label at the beginning,
@@ -246,7 +395,7 @@ class BarChart(HorizontalChart):
                     self.args
                 )
 
-                if self.args.get_arg("label_before"):
+                if label_before:
                     # remove leading " " from format_value
                     tail = tail.lstrip()
 
@@ -255,24 +404,22 @@ class BarChart(HorizontalChart):
                 else:
                     color = None
 
-                if not self.args.get_arg("label_before") and not self.args.get_arg(
-                    "vertical"
-                ):
-                    print(label, end="")
-
-                self.print_row(
-                    value=values[j],
-                    num_blocks=int(num_blocks[j]),
-                    val_min=val_min,
-                    color=color,
-                    label=label,
-                    tail=str(tail) if tail is not None else "",
+                if inline:
+                    buf.append(label)
+
+                buf.append(
+                    self.format_row(
+                        value=values[j],
+                        num_blocks=int(num_blocks[j]),
+                        val_min=val_min,
+                        color=color,
+                        label=label,
+                        tail=str(tail) if tail is not None else "",
+                    )
                 )
 
-                if not self.args.get_arg("label_before") and not self.args.get_arg(
-                    "vertical"
-                ):
-                    print(tail)
+                if inline:
+                    buf.append(f"{tail}\n")
 
 
 class StackedChart(HorizontalChart):
@@ -286,10 +433,8 @@ class StackedChart(HorizontalChart):
         """
         super().__init__(data, args)
 
-    def draw(self) -> None:
-        """Draws the stacked chart"""
-        self._print_header()
-
+    def _render_rows(self, buf: list[str], start: int = 0) -> None:
+        """Renders the rows of the stacked chart"""
         colors_arg = self.args.get_arg("colors")
         if isinstance(colors_arg, list):
             colors = colors_arg
@@ -298,32 +443,40 @@ class StackedChart(HorizontalChart):
                 self.data.dims[1] if self.data.dims and len(self.data.dims) > 1 else 1
             )
 
-        val_min = self.data.find_min()
-        normal_data = self._normalize()
+        val_min = self._val_min()
+        normal_data = self.normal_data
+        no_labels = self.args.get_arg("no_labels")
+        label_width = 0 if no_labels else self._label_width()
+        space_between = self.args.get_arg("space_between")
 
         for i in range(len(self.data.labels)):
-            if self.args.get_arg("no_labels"):
+            if no_labels:
                 # Hide the labels.
                 label = ""
             else:
-                label = f"{self.data.labels[i]:<{self.data.find_max_label_length()}}: "
+                label = f"{self.data.labels[i]:<{label_width}}: "
 
-            if self.args.get_arg("space_between") and i != 0:
-                print()
+            if space_between and start + i != 0:
+                buf.append("\n")
 
-            print(label, end="")
+            buf.append(label)
 
             values = self.data.data[i]
             num_blocks = normal_data[i]
 
+            # The segments switch colors without resetting in between.
+            sgr = SGREncoder()
             for j in range(len(values)):
-                print_row_core(
-                    value=values[j],
-                    num_blocks=int(num_blocks[j]),
-                    val_min=val_min,
-                    color=colors[j] if j < len(colors) else None,
-                    zero_as_small_tick=False,
-                    tick=self.tick,
+                buf.append(
+                    format_row_core(
+                        value=values[j],
+                        num_blocks=int(num_blocks[j]),
+                        val_min=val_min,
+                        color=colors[j] if j < len(colors) else None,
+                        zero_as_small_tick=False,
+                        tick=self.tick,
+                        sgr=sgr,
+                    )
                 )
 
                 tail = format_value(
@@ -331,88 +484,380 @@ class StackedChart(HorizontalChart):
                     self.args
                 )
 
-            print(tail)
+            buf.append(f"{sgr.reset()}{tail}\n")
 
 
 class VerticalChart(Chart):
-    """Class representing a vertical chart"""
+    """Class representing a vertical chart
+
+    Every value is a column of ticks. With several categories the values
+    of a row are drawn as a group of columns, colored by category. The
+    lines are computed one at a time from the normalized heights, and a
+    chart wider than the window argument is split into panels drawn one
+    below the other.
+    """
 
     def __init__(self, data: Data, args: Args = Args()):
         """Initialize the vertical chart"""
         super().__init__(data, args)
-        self.value_list: list[str] = []
-        self.zipped_list: list[tuple[str, ...]] = []
-        self.vertical_list: list[str] = []
-        self.maxi = 0
 
-    def _prepare_vertical(self, value: float, num_blocks: int):
-        """Prepare the vertical graph data."""
-        self.value_list.append(format_value(value, self.args))
+    def _render(self, buf: list[str]) -> None:
+        """Renders the vertical chart"""
+        self._render_header(buf)
+
+        count = len(self.data.labels)
+        per_panel = self._rows_per_panel()
+        for start in range(0, count, per_panel):
+            if start:
+                buf.append("\n")
+            buf.extend(self._render_panel(start, min(start + per_panel, count)))
+
+    def _categories(self) -> int:
+        return len(self.normal_data[0]) if self.normal_data else 1
+
+    def _rows_per_panel(self) -> int:
+        """Return how many groups of columns fit in the window."""
+        count = len(self.data.labels)
+        window = self.args.get_arg("window")
+        if not isinstance(window, int) or isinstance(window, bool):
+            return max(count, 1)
+
+        # A column is a cell and a space, groups get one more space.
+        categories = self._categories()
+        extra = 1 if categories > 1 else 0
+        stride = 2 * categories + extra
+        return max((window + 1 + extra) // stride, 1)
+
+    def _render_panel(self, start: int, end: int) -> Iterator[str]:
+        """Yield the lines drawing rows start to end of the data."""
+        categories = self._categories()
+        arg = self.args.get_arg("colors")
+        colors: list[Union[int, None]] = arg if isinstance(arg, list) else []
+
+        # Per column: the space before it, its cell, height and color.
+        seps: list[str] = []
+        cells: list[str] = []
+        heights: list[int] = []
+        column_colors: list[Union[int, None]] = []
+        line_width = 0
+        for blocks in self.normal_data[start:end]:
+            for j, num_blocks in enumerate(blocks):
+                num_blocks = int(num_blocks)
+                sep = "" if not cells else " " if j or categories == 1 else "  "
+                seps.append(sep)
+                line_width += len(sep) + 1
+                # Values too small for a block still get a small tick.
+                cells.append(self.tick if num_blocks > 0 else SM_TICK)
+                heights.append(max(num_blocks, 1))
+                column_colors.append(colors[j] if j < len(colors) else None)
+
+        # A cell is filled when the height of its column reaches the line.
+        # The color carries over from line to line, only changes are written.
+        sgr = SGREncoder()
+        for level in range(max(heights, default=0), 0, -1):
+            yield "".join(
+                [
+                    sep + sgr.paint(cell, color) if height >= level else sep + " "
+                    for sep, cell, height, color in zip(
+                        seps, cells, heights, column_colors
+                    )
+                ]
+            ) + "\n"
+
+        yield sgr.reset()
+
+        if not cells:
+            return
+
+        if not self.args.get_arg("no_values"):
+            yield "-" * (line_width + 1) + "\n"
+            yield "  ".join(
+                format_value(value, self.args)
+                for row in self.data.data[start:end]
+                for value in (row if isinstance(row, _ROW_TYPES) else [row])
+            ) + "\n"
+
+        if not self.args.get_arg("no_labels"):
+            yield "-" * (line_width + 1) + "\n"
+            labels = self.data.labels[start:end]
+            if categories > 1:
+                # Line the labels up with their group of columns.
+                group_width = 2 * categories - 1
+                labels = ["  ".join(label.ljust(group_width) for label in labels).rstrip()]
+            yield "  ".join(labels) + "\n"
+
+
+class SparklineChart(Chart):
+    """Class representing sparklines, one line per series
+
+    A series is a category column of the data, or a row with the
+    "spark_rows" argument. Its values are averaged into at most "width"
+    buckets, each drawn as one of eight block levels, followed by the last
+    value of the series. The levels span the range of all the data, or of
+    each series with the "different_scale" argument.
+    """
+
+    def __init__(self, data: Data, args: Args = Args()):
+        """Initialize the sparkline chart
+
+        :data: The data to be displayed on the chart
+        :args: The arguments for the chart
+        """
+        super().__init__(data, args)
 
-        if self.maxi < num_blocks:
-            self.maxi = num_blocks
+    def _series(self) -> tuple[list[str], list[list[float]], list]:
+        """Return the names, bucketed values and last values of the series."""
+        width = self.args.get_arg("width")
+        if not isinstance(width, int):
+            width = 50  # Default width
+        rows = self.data.data
+
+        if self.args.get_arg("spark_rows"):
+            values = [
+                _bucket_means(row if isinstance(row, _ROW_TYPES) else [row], width)
+                for row in rows
+            ]
+            lasts = [row[-1] if isinstance(row, _ROW_TYPES) else row for row in rows]
+            return list(self.data.labels), values, lasts
+
+        # Downsampling buckets the rows in bulk, leaving width rows at most.
+        reduced = self.data.downsample(width, "mean").data
+        if not isinstance(rows[0], _ROW_TYPES):
+            names = self.data.categories[:1] or [""]
+            return names, [list(reduced)], [rows[-1]]
+
+        count = len(rows[0])
+        names = list(self.data.categories) or [""] * count
+        values = [[row[j] for row in reduced] for j in range(count)]
+        return names, values, list(rows[-1])
+
+    def _normalize(self) -> list:
+        """Return the level of every cell of every series, 0 to 7."""
+        self._names, series, self._lasts = self._series()
+        top = len(SPARK_TICKS) - 1
 
-        if num_blocks > 0:
-            self.vertical_list.append((self.tick * num_blocks))
+        if self.args.get_arg("different_scale"):
+            # Every line spans all the levels.
+            scales = [(min(values), max(values)) for values in series]
         else:
-            self.vertical_list.append(SM_TICK)
+            scale = self._scale() or (self.data.find_min(), self.data.find_max())
+            scales = [scale] * len(series)
 
-    def draw(self) -> None:
-        """Draws the vertical chart"""
-        self._print_header()
+        levels = []
+        for values, (low, high) in zip(series, scales):
+            factor = top / (high - low) if high > low else 0.0
+            levels.append([int((value - low) * factor + 0.5) for value in values])
+        return levels
 
-        colors = self.args.get_arg("colors")
-        color = colors[0] if colors and isinstance(colors, list) else None
+    def _render(self, buf: list[str]) -> None:
+        """Renders the sparklines"""
+        title = self.args.get_arg("title")
+        if title is not None:
+            buf.append(f"\n# {title}\n\n")
 
-        for i in range(len(self.data.labels)):
-            values = self.data.data[i]
-            num_blocks = self.normal_data[i]
-            for j in range(len(values)):
-                self._prepare_vertical(values[j], int(num_blocks[j]))
+        arg = self.args.get_arg("colors")
+        colors: list[Union[int, None]] = arg if isinstance(arg, list) else []
+        by_row = self.args.get_arg("spark_rows")
 
-        # Zip_longest method in order to turn them vertically.
-        for row in zip_longest(*self.vertical_list, fillvalue=" "):
-            self.zipped_list.append(row)
+        label_width = max(len(name) for name in self._names)
+        if self.args.get_arg("no_labels") or not label_width:
+            label_fmt = ""
+        else:
+            label_fmt = "{:<{x}}: "
 
-        result_list: List[Tuple[str, ...]] = []
+        sgr = SGREncoder()
+        for i, (name, levels) in enumerate(zip(self._names, self.normal_data)):
+            color_index = 0 if by_row else i
+            color = colors[color_index] if color_index < len(colors) else None
+            line = "".join([SPARK_TICKS[level] for level in levels])
+            buf.append(label_fmt.format(name, x=label_width))
+            buf.append(sgr.paint(line, color) + sgr.reset())
+            buf.append(format_value(self._lasts[i], self.args) + "\n")
 
-        if self.zipped_list:
-            counter = 0
-            width = self.args.get_arg("width")
-            if not isinstance(width, int):
-                width = 50  # Default width
 
-            # Combined with the maxi variable, escapes the appending method at
-            # the correct point or the default one (width).
-            for row in reversed(self.zipped_list):
-                result_list.append(row)
-                counter += 1
+class LineChart(Chart):
+    """Class representing a line chart drawn with braille dots
 
-                if self.maxi == width:
-                    if counter == width:
-                        break
-                else:
-                    if counter == self.maxi:
-                        break
+    Every category column is a line on a canvas of "width" by "height"
+    cells, with 2 by 4 dots per cell. The x of a row is its label when all
+    labels are numbers, its index otherwise. The rows are bucketed by pixel
+    column, so drawing costs one pass over the data and one over the
+    cells, and the chart keeps its size for any number of rows.
+    """
 
-        if color:
-            sys.stdout.write(f"\033[{color}m")
+    def __init__(self, data: Data, args: Args = Args()):
+        """Initialize the line chart
 
-        for row in result_list:
-            print(*row)
+        :data: The data to be displayed on the chart
+        :args: The arguments for the chart
+        """
+        super().__init__(data, args)
 
-        sys.stdout.write("\033[0m")
+    def _size(self) -> tuple[int, int]:
+        """Return the width and height of the canvas in cells."""
+        width = self.args.get_arg("width")
+        if not isinstance(width, int):
+            width = 50  # Default width
+        height = self.args.get_arg("height")
+        if not isinstance(height, int):
+            height = 10  # Default height
+        return max(width, 1), max(height, 1)
+
+    def _normalize(self) -> list:
+        """Return the pixel buckets of every series."""
+        width, height = self._size()
+        self._low, self._high = self._scale() or (self.data.find_min(), self.data.find_max())
+        columns, series = self._pixels(width * 2, height * 4)
+        return [self._bucket(columns, rows, width * 2, height * 4) for rows in series]
+
+    def _pixels(self, pixel_width: int, pixel_height: int) -> tuple:
+        """Return the pixel column of every row and the pixel rows of every series.
+
+        Values outside of a fixed scale are put on its edge.
+        """
+        labels = self.data.labels
+        count = len(labels)
+        try:
+            xs = [float(label) for label in labels]
+        except ValueError:
+            xs = None
 
-        if result_list and not self.args.get_arg("no_values"):
-            print("-" * len(result_list[0]) * 2)
-            print("  ".join(self.value_list))
+        x_low: float
+        x_high: float
+        if xs is None:
+            x_low, x_high = 0, count - 1
+            self._x_labels = labels[0], labels[-1]
+        else:
+            x_low, x_high = min(xs), max(xs)
+            self._x_labels = labels[xs.index(x_low)], labels[xs.index(x_high)]
+
+        x_factor = (pixel_width - 1) / (x_high - x_low) if x_high > x_low else 0.0
+        bottom = pixel_height - 1
+        low, high = self._low, self._high
+        y_factor = bottom / (high - low) if high > low else 0.0
+
+        array = self.data.array
+        if array is not None:
+            np = _numpy()
+            x = np.arange(count, dtype=np.float64) if xs is None else np.array(xs)
+            columns = ((x - x_low) * x_factor + 0.5).astype(np.intp)
+            rows = bottom - ((array - low) * y_factor + 0.5).astype(np.intp)
+            np.clip(rows, 0, bottom, out=rows)
+            return columns, list(rows.T)
+
+        columns = [int((x - x_low) * x_factor + 0.5) for x in (xs or range(count))]
+        rows = self.data.data
+        if isinstance(rows[0], _ROW_TYPES):
+            values = [[row[j] for row in rows] for j in range(len(rows[0]))]
+        else:
+            values = [rows]
+        series = [
+            [min(max(bottom - int((v - low) * y_factor + 0.5), 0), bottom) for v in column]
+            for column in values
+        ]
+        return columns, series
 
-        if result_list and not self.args.get_arg("no_labels"):
-            print("-" * len(result_list[0]) * 2)
-            # Print Labels
-            labels = self.data.labels
-            if labels:
-                print("  ".join(labels))
+    def _bucket(self, columns, rows, pixel_width: int, pixel_height: int) -> Sequence:
+        """Return the first, top, bottom and last pixel row in every pixel column.
+
+        Columns without any row are -1.
+        """
+        if not isinstance(rows, list):
+            np = _numpy()
+            first = np.full(pixel_width, -1)
+            first[columns[::-1]] = rows[::-1]
+            top = np.full(pixel_width, pixel_height)
+            np.minimum.at(top, columns, rows)
+            bottom = np.full(pixel_width, -1)
+            np.maximum.at(bottom, columns, rows)
+            last = np.full(pixel_width, -1)
+            last[columns] = rows
+            return first.tolist(), top.tolist(), bottom.tolist(), last.tolist()
+
+        first = [-1] * pixel_width
+        top = [pixel_height] * pixel_width
+        bottom = [-1] * pixel_width
+        last = [-1] * pixel_width
+        for x, y in zip(columns, rows):
+            if first[x] < 0:
+                first[x] = y
+            if y < top[x]:
+                top[x] = y
+            if y > bottom[x]:
+                bottom[x] = y
+            last[x] = y
+        return first, top, bottom, last
+
+    def _draw(self, canvas: BrailleCanvas, buckets: Sequence, color: Union[int, None]) -> None:
+        """Draw the buckets of a series on the canvas."""
+        first, top, bottom, last = buckets
+        previous = None
+        for x in range(canvas.pixel_width):
+            if first[x] < 0:
+                continue
+            if previous is not None:
+                canvas.line(previous, last[previous], x, first[x], color)
+            canvas.column(x, top[x], bottom[x], color)
+            previous = x
+
+    def _render(self, buf: list[str]) -> None:
+        """Renders the chart"""
+        self._render_header(buf)
+
+        arg = self.args.get_arg("colors")
+        colors: list[Union[int, None]] = arg if isinstance(arg, list) else []
+        width, height = self._size()
+        canvas = BrailleCanvas(width, height)
+        for i, buckets in enumerate(self.normal_data):
+            self._draw(canvas, buckets, colors[i] if i < len(colors) else None)
+
+        high = format_value(self._high, self.args).strip()
+        low = format_value(self._low, self.args).strip()
+        gutter = max(len(high), len(low))
+        for i, row in enumerate(canvas.rows()):
+            label = high if i == 0 else low if i == height - 1 else ""
+            axis = "┤" if label else "│"
+            buf.append(f"{label:>{gutter}} {axis}{row}\n")
+        buf.append(f"{'':>{gutter}} └{'─' * width}\n")
+
+        if not self.args.get_arg("no_labels"):
+            first, last = self._x_labels
+            space = max(width - len(first) - len(last), 1)
+            buf.append(f"{'':>{gutter}}  {first}{' ' * space}{last}\n")
+
+
+class ScatterChart(LineChart):
+    """Class representing a scatter plot drawn with braille dots
+
+    Like the line chart, with a dot for every distinct pixel instead of
+    lines. Dots of several rows in one pixel are drawn once.
+    """
+
+    def _bucket(self, columns, rows, pixel_width: int, pixel_height: int) -> Sequence:
+        """Return the pixels (x, y) holding at least one row."""
+        if not isinstance(rows, list):
+            np = _numpy()
+            grid = np.zeros((pixel_height, pixel_width), dtype=bool)
+            grid[rows, columns] = True
+            ys, xs = np.nonzero(grid)
+            return list(zip(xs.tolist(), ys.tolist()))
+
+        # One bit per pixel row in every pixel column
+        masks = [0] * pixel_width
+        for x, y in zip(columns, rows):
+            masks[x] |= 1 << y
+        return [
+            (x, y)
+            for x, mask in enumerate(masks)
+            if mask
+            for y in range(mask.bit_length())
+            if mask >> y & 1
+        ]
+
+    def _draw(self, canvas: BrailleCanvas, buckets: Sequence, color: Union[int, None]) -> None:
+        """Draw the pixels of a series on the canvas."""
+        for x, y in buckets:
+            canvas.set(x, y, color)
 
 
 class HistogramChart(Chart):
@@ -426,9 +871,9 @@ class HistogramChart(Chart):
         """
         super().__init__(data, args)
 
-    def draw(self) -> None:
-        """Draws the histogram chart"""
-        self._print_header()
+    def _render(self, buf: list[str]) -> None:
+        """Renders the histogram chart"""
+        self._render_header(buf)
 
         colors_arg = self.args.get_arg("colors")
         if isinstance(colors_arg, list):
@@ -436,8 +881,7 @@ class HistogramChart(Chart):
         else:
             colors = [None]
 
-        val_min = self.data.find_min()
-        val_max = self.data.find_max()
+        val_min, val_max = self._value_range()
 
         # Calculate borders
         class_min = math.floor(val_min)
@@ -463,22 +907,7 @@ class HistogramChart(Chart):
             border = round(border, 1)
 
         # Count num of data via border
-        count_list = []
-
-        for start, end in zip(borders[:-1], borders[1:]):
-            count = 0
-            # Count values in this bin range
-            for row in self.data.data:
-                for v in row:  # Handle multi-dimensional data
-                    if start <= v < end:
-                        count += 1
-
-            count_list.append([count])
-
-        # Handle the case where the maximum value is exactly equal to the upper border
-        # Calculate total number of max values and add them to the last bin
-        count = sum(1 for row in self.data.data for v in row if v == class_max)
-        count_list[-1][0] += count
+        count_list = [[count] for count in self._count(borders, class_max)]
 
         width_arg = self.args.get_arg("width")
         if isinstance(width_arg, int):
@@ -498,21 +927,107 @@ class HistogramChart(Chart):
                 color = None
 
             if not self.args.get_arg("no_labels"):
-                print(f"{start_border:{max_len}} – {end_border:{max_len}}: ", end="")
+                buf.append(f"{start_border:{max_len}} – {end_border:{max_len}}: ")
 
             num_blocks = normal_counts[i]
 
-            print_row_core(
-                value=count_list[i][0],
-                num_blocks=int(num_blocks[0]),
-                val_min=0,  # Histogram always starts from 0
-                color=color,
-                zero_as_small_tick=False,
-                tick=self.tick,
+            buf.append(
+                format_row_core(
+                    value=count_list[i][0],
+                    num_blocks=int(num_blocks[0]),
+                    val_min=0,  # Histogram always starts from 0
+                    color=color,
+                    zero_as_small_tick=False,
+                    tick=self.tick,
+                )
             )
 
             tail = format_value(
                 count_list[i][0],
                 self.args
             )
-            print(tail)
+            buf.append(f"{tail}\n")
+
+        if self.args.get_arg("percentiles") and not self.args.get_arg("no_values"):
+            quantiles = self._quantiles(PERCENTILES)
+            buf.append(
+                " ".join(
+                    f"p{round(q * 100)}:{format_value(value, self.args)}"
+                    for q, value in zip(PERCENTILES, quantiles)
+                )
+                + "\n"
+            )
+
+    def _value_range(self) -> tuple[float, float]:
+        """Return the smallest and the largest value."""
+        return self.data.find_min(), self.data.find_max()
+
+    def _count(self, borders: list[float], class_max: int) -> list[int]:
+        """Return the number of values in each bin.
+
+        Values equal to class_max are counted in the last bin.
+        """
+        array = self.data.array
+        if array is not None:
+            counts = bin_counts(array, borders)
+            counts[-1] += int((array == class_max).sum())
+        else:
+            values = list(chain.from_iterable(self.data.data))
+            counts = bin_counts(values, borders)
+            counts[-1] += values.count(class_max)
+        return counts
+
+    def _quantiles(self, qs: Iterable[float]) -> list[float]:
+        """Return the values at the quantiles qs, by nearest rank."""
+        values = sorted(chain.from_iterable(self.data.data))
+        return [values[max(math.ceil(q * len(values)) - 1, 0)] for q in qs]
+
+
+class ApproxHistogramChart(HistogramChart):
+    """Class representing a histogram chart drawn from a quantile sketch
+
+    The bins are counted from a KLLSketch, so values can be added in
+    constant memory. Counts are approximate within the error bound of the
+    sketch, the range of the bins is exact.
+    """
+
+    def __init__(self, sketch: KLLSketch, args: Args = Args()):
+        """Initialize the histogram chart
+
+        :sketch: The sketch summarizing the values to be displayed
+        :args: The arguments for the chart
+        """
+        if not sketch.count:
+            raise Exception("No data provided")
+
+        self.sketch = sketch
+        super().__init__(Data([[sketch.min], [sketch.max]], ["min", "max"]), args)
+
+    def _value_range(self) -> tuple[float, float]:
+        return self.sketch.min, self.sketch.max
+
+    def _count(self, borders: list[float], class_max: int) -> list[int]:
+        counts = self.sketch.bin_counts(borders)
+        counts[-1] += self.sketch.rank(class_max, inclusive=True) - self.sketch.rank(class_max)
+        return counts
+
+    def _quantiles(self, qs: Iterable[float]) -> list[float]:
+        return [self.sketch.quantile(q) for q in qs]
+
+
+def _bucket_means(values, width: int) -> list[float]:
+    """Return the means of width runs of consecutive values, at most.
+
+    Each run is summed as a slice, so the Python work is per bucket.
+    """
+    count = len(values)
+    if count <= width:
+        return list(values)
+
+    means = []
+    start = 0
+    for i in range(1, width + 1):
+        end = count * i // width
+        means.append(sum(values[start:end]) / (end - start))
+        start = end
+    return means
@@ -0,0 +1,235 @@
+"""Client of the termgraph render server, see termgraph.server.
+
+This is the entry point of the termgraph command. It only imports what
+talking to the server takes, the rest of termgraph is imported when no
+server draws the chart. For that it uses _socket over socket and no json,
+both of which take longer to import than the whole chart takes to draw.
+
+Every message is a frame of one kind byte and a 4 byte length:
+
+    R  client to server, the request: NUL separated names and values,
+       "arg" for every argument, "env" for NAME=value, "cwd", "columns",
+       "lines", "stdout_tty" and "stdin_tty"
+    I  server asks for stdin, the client answers with its stdin
+    O  server to client, output for stdout
+    E  server to client, output for stderr
+    X  server to client, the exit status, the last frame
+"""
+
+from __future__ import annotations
+import os
+import stat
+import struct
+import sys
+
+import _socket
+
+HEADER = struct.Struct(">cI")
+
+# The environment of the client that changes the output.
+CLIENT_ENV = ("COLUMNS", "LINES", "NO_COLOR")
+
+# Arguments drawing as the input arrives, which the server, getting all
+# of stdin at once, can't do. They run here.
+LOCAL_ARGS = ("--follow", "--stream")
+
+
+def main():
+    """Draw the chart on the render server if there is one, here otherwise."""
+    status = forward_argv(sys.argv[1:])
+    if status is not None:
+        sys.exit(status)
+
+    from .termgraph import run
+
+    run()
+
+
+def forward_argv(argv: list[str]) -> int | None:
+    """Draw the chart of the command line arguments on the render server.
+
+    Runs with --client, or with TERMGRAPH_SERVER set when a server listens
+    on it, except for --follow and --stream. --client and --socket are only
+    recognized written in full.
+
+    :argv: The arguments, without the program name
+    :returns: The exit status, None when the chart is to be drawn here
+    """
+    client = "--client" in argv
+    if not (client or os.environ.get("TERMGRAPH_SERVER")) or "--serve" in argv:
+        return None
+    if any(_abbreviates(arg, LOCAL_ARGS) for arg in argv):
+        return None
+
+    path = None
+    forwarded = []
+    arguments = iter(argv)
+    for arg in arguments:
+        if arg == "--client":
+            continue
+        if arg == "--socket":
+            path = next(arguments, None)
+        elif arg.startswith("--socket="):
+            path = arg[len("--socket=") :]
+        else:
+            forwarded.append(arg)
+    path = path or default_socket()
+
+    try:
+        status = forward(forwarded, path)
+    except ConnectionError as e:
+        print(f">> Error: {e}")
+        return 2
+    if status is None and client:
+        print(f">> Error: No termgraph server is listening on {path}")
+        return 2
+    return status
+
+
+def _abbreviates(arg: str, options: tuple[str, ...]) -> bool:
+    """Return whether the argument is one of the options, possibly abbreviated."""
+    name = arg.partition("=")[0]
+    return len(name) > 3 and any(option.startswith(name) for option in options)
+
+
+def default_socket() -> str:
+    """Return $TERMGRAPH_SERVER, or a socket in a directory private to the user."""
+    path = os.environ.get("TERMGRAPH_SERVER")
+    if path:
+        return path
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "termgraph.sock")
+    directory = os.path.join(os.environ.get("TMPDIR") or "/tmp", f"termgraph-{os.getuid()}")
+    return os.path.join(directory, "termgraph.sock")
+
+
+def check_directory(directory: str) -> None:
+    """Raise ConnectionError unless only the user, or root, can replace its files.
+
+    A shared directory like /tmp is fine when it is sticky, as others can't
+    remove or rename the files of the user in it.
+    """
+    info = os.stat(directory or ".")
+    shared = info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    if info.st_uid not in (os.getuid(), 0) or (shared and not info.st_mode & stat.S_ISVTX):
+        raise ConnectionError(f"The directory {directory} of the termgraph server is not private")
+
+
+def _check_socket(path: str) -> None:
+    """Raise ConnectionError unless the socket belongs to the user alone."""
+    info = os.stat(path)
+    if info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise ConnectionError(f"The termgraph server socket {path} is not private to this user")
+    check_directory(os.path.dirname(path))
+
+
+def _check_peer(sock) -> None:
+    """Raise ConnectionError unless the server runs as the user, where the OS tells."""
+    if not hasattr(_socket, "SO_PEERCRED"):
+        return
+    credentials = struct.Struct("3i")
+    peer = sock.getsockopt(_socket.SOL_SOCKET, _socket.SO_PEERCRED, credentials.size)
+    _, uid, _ = credentials.unpack(peer)
+    if uid != os.getuid():
+        raise ConnectionError(f"The termgraph server runs as another user (uid {uid})")
+
+
+def forward(argv: list[str], path: str) -> int | None:
+    """Draw the chart of the arguments on the server and print it.
+
+    The arguments, environment and stdin are only sent to a server of the
+    user, on a socket nobody else can replace.
+
+    :argv: The arguments, without the program name
+    :path: The socket of the server
+    :returns: The exit status, None when no server listens on the socket
+    """
+    try:
+        _check_socket(path)
+    except FileNotFoundError:
+        return None
+
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        sock.close()
+        return None
+    try:
+        _check_peer(sock)
+    except BaseException:
+        sock.close()
+        raise
+
+    try:
+        columns, lines = os.get_terminal_size(sys.stdout.fileno())
+    except (OSError, ValueError):
+        columns, lines = 80, 24  # the defaults of shutil.get_terminal_size
+
+    fields = [
+        ("cwd", os.getcwd()),
+        ("columns", str(columns)),
+        ("lines", str(lines)),
+        ("stdout_tty", "1" if sys.stdout.isatty() else ""),
+        ("stdin_tty", "1" if sys.stdin.isatty() else ""),
+    ]
+    fields += [("env", f"{name}={os.environ[name]}") for name in CLIENT_ENV if name in os.environ]
+    fields += [("arg", arg) for arg in argv]
+    request = "\0".join(f"{name}\0{value}" for name, value in fields)
+
+    try:
+        send(sock, b"R", os.fsencode(request))
+        while True:
+            kind, payload = receive(sock)
+            if kind == b"O":
+                sys.stdout.buffer.write(payload)
+                sys.stdout.flush()
+            elif kind == b"E":
+                sys.stderr.buffer.write(payload)
+                sys.stderr.flush()
+            elif kind == b"I":
+                send(sock, b"I", sys.stdin.buffer.read())
+            elif kind == b"X":
+                return int(payload)
+            else:
+                raise ConnectionError(f"Unknown message from the termgraph server: {kind!r}")
+    finally:
+        sock.close()
+
+
+def parse_request(payload: bytes) -> dict:
+    """Return the request of a client, its arguments under "argv"."""
+    items = os.fsdecode(payload).split("\0")
+    request: dict = {"argv": [], "env": {}}
+    for name, value in zip(items[::2], items[1::2]):
+        if name == "arg":
+            request["argv"].append(value)
+        elif name == "env":
+            key, _, value = value.partition("=")
+            request["env"][key] = value
+        else:
+            request[name] = value
+    return request
+
+
+def send(sock, kind: bytes, payload: bytes) -> None:
+    """Send a frame of the kind."""
+    sock.sendall(HEADER.pack(kind, len(payload)) + payload)
+
+
+def receive(sock) -> tuple[bytes, bytes]:
+    """Return the kind and the payload of the next frame."""
+    kind, size = HEADER.unpack(_receive_exactly(sock, HEADER.size))
+    return kind, _receive_exactly(sock, size)
+
+
+def _receive_exactly(sock, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("The termgraph server closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
@@ -11,10 +11,19 @@ UNITS = ["", "K", "M", "B", "T"]
 # Default delimiter
 DELIM = ","
 
+# Default number of rows per chunk when streaming input
+CHUNK_SIZE = 10000
+
+# Quantiles printed below a histogram with --percentiles
+PERCENTILES = (0.5, 0.9, 0.99)
+
 # Graph characters
 TICK = "▇"
 SM_TICK = "▏"
 
+# Levels of a sparkline, from the lowest value to the highest
+SPARK_TICKS = "▁▂▃▄▅▆▇█"
+
 # ANSI escape SGR Parameters color codes
 AVAILABLE_COLORS = {
     "red": 91,
@@ -1,9 +1,73 @@
 """Data class for termgraph - handles all data-related operations."""
 
 from __future__ import annotations
-from typing import Union
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence, TextIO, Union, cast
+from array import array
+from bisect import bisect_right
+from collections import Counter, deque
+from contextlib import contextmanager
+from functools import cached_property
+from itertools import chain, repeat
+import csv
+import gc
+import math
+import mmap
+import re
+import struct
 import sys
-from .constants import DELIM
+from .constants import CHUNK_SIZE, DELIM
+from . import profiling
+
+# NumPy is optional and only imported once there is enough data to use it,
+# see _numpy(). Only used after _numpy() returned it.
+np: Any = None
+_numpy_checked = False
+
+# Blank, comment and category lines.
+_SPECIAL_LINE = re.compile(r"\n[^\S\n]*(?:[#@][^\n]*)?(?=\n|\Z)")
+
+# Whitespace other than plain spaces and newlines.
+_OTHER_SPACE = re.compile(r"[^\S \n]")
+
+# Buffers with these memoryview formats can be wrapped as data.
+_NUMERIC_FORMATS = frozenset("bBhHiIlLqQnNefd")
+
+# Ways to aggregate a run of rows in Data.downsample().
+DOWNSAMPLE_METHODS = ("mean", "min", "max", "sum", "lttb")
+
+_AGGREGATES: dict[str, Callable[..., Any]] = {
+    "mean": lambda values: sum(values) / len(values),
+    "min": min,
+    "max": max,
+    "sum": sum,
+}
+
+# Sample taken by bin_counts() to tell whether the values are discrete.
+_DISCRETE_SAMPLE = 1024
+_DISCRETE_MAX_DISTINCT = 256
+
+# Below this many values the pure Python code is faster than building an array.
+_NUMPY_MIN_VALUES = 1024
+
+# Memoryview formats of the .npy dtypes that are read in place.
+_NPY_FORMATS = {
+    "f8": "d",
+    "f4": "f",
+    "f2": "e",
+    "i8": "q",
+    "i4": "i",
+    "i2": "h",
+    "i1": "b",
+    "u8": "Q",
+    "u4": "I",
+    "u2": "H",
+    "u1": "B",
+}
+
+# One item of a struct format, like "2d".
+_STRUCT_ITEM = re.compile(r"(\d*)\s*([a-zA-Z?])")
+
+_NATIVE_ORDER = "<" if sys.byteorder == "little" else ">"
 
 
 class Data:
@@ -39,10 +103,349 @@ class Data:
         if len(data) != len(labels):
             raise Exception("The dimensions of the data and labels must be the same")
 
-        self.labels = labels
-        self.data = data
+        self._stats: Union[DataStats, None] = None
+        self._rows_by_label: Union[dict[str, int], None] = None
+        self._labels = labels
+        self._data = data
         self.categories = categories or []
-        self.dims = self._find_dims(data, labels)
+        self._validate_dims()
+
+    @property
+    def data(self) -> list:
+        """The data to graph on the chart."""
+        return self._data
+
+    @data.setter
+    def data(self, data: list) -> None:
+        self._data = data
+        self.invalidate()
+
+    @property
+    def labels(self) -> list[str]:
+        """The labels of the data."""
+        return self._labels
+
+    @labels.setter
+    def labels(self, labels: list[str]) -> None:
+        self._labels = labels
+        self.invalidate()
+
+    @property
+    def stats(self) -> DataStats:
+        """The memoized statistics of the data, see DataStats."""
+        if self._stats is None:
+            self._stats = DataStats(self)
+        return self._stats
+
+    @property
+    def dims(self) -> Union[tuple[int, ...], None]:
+        """The dimensions of the data, e.g. (rows, categories)."""
+        return self.stats.dims
+
+    def _validate_dims(self) -> Union[tuple[int, ...], None]:
+        """Find the dimensions up front, raising if the rows don't match.
+
+        They are memoized with the statistics, the charts reuse them.
+        """
+        return self.dims
+
+    def invalidate(self) -> None:
+        """Drop the memoized statistics.
+
+        Assigning data or labels does this already, call it after changing
+        the lists in place. append(), extend() and update() keep the
+        statistics up to date instead.
+        """
+        self._stats = None
+        self._rows_by_label = None
+
+    def append(self, label: str, values) -> None:
+        """Add a row at the end.
+
+        :label: The label of the row
+        :values: A number for flat data, a list of one value per category
+                 otherwise
+        """
+        self.extend([label], [values])
+
+    def extend(self, labels: list[str], rows: list) -> None:
+        """Add rows at the end.
+
+        The memoized statistics and normalized data are updated for the new
+        rows only, unless they change the minimum or the maximum that the
+        normalized data was scaled to.
+
+        :labels: The labels of the rows
+        :rows: The rows, as for append()
+        """
+        if len(labels) != len(rows):
+            raise Exception("The dimensions of the data and labels must be the same")
+        rows = [self._check_row(row) for row in rows]
+        if not rows:
+            return
+
+        self._make_growable()
+        start = len(self._data)
+        self._data.extend(rows)
+        self._labels.extend(labels)
+
+        if self._rows_by_label is not None:
+            for index, label in enumerate(labels, start):
+                self._rows_by_label[label] = index
+        if self._stats is not None:
+            self._stats._added(start)
+
+    def update(self, label: str, values) -> None:
+        """Replace the values of the last row with the label, or append a row.
+
+        Like extend(), only the statistics of the row are updated, unless
+        the row held the minimum or the maximum of the data.
+
+        :label: The label of the row
+        :values: As for append()
+        """
+        if self._rows_by_label is None:
+            self._rows_by_label = {label: i for i, label in enumerate(self._labels)}
+        index = self._rows_by_label.get(label)
+        if index is None:
+            self.append(label, values)
+            return
+
+        row = self._check_row(values)
+        self._make_growable()
+        old = self._data[index]
+        self._data[index] = row
+        if self._stats is not None:
+            self._stats._replaced(index, old)
+
+    def _check_row(self, row):
+        """Return the row as stored, raise when it doesn't fit the data."""
+        dims = self.dims
+        if dims is None or len(dims) > 2:
+            raise Exception("Only flat data and rows of categories can grow")
+        if len(dims) == 1:
+            if isinstance(row, (tuple, *_ROW_TYPES)):
+                raise Exception(f"Expected a single value, not {row!r}")
+            return row
+        if not isinstance(row, (tuple, *_ROW_TYPES)) or len(row) != dims[1]:
+            raise Exception(f"Expected {dims[1]} values, not {row!r}")
+        return list(row)
+
+    def _make_growable(self) -> None:
+        """Copy wrapped buffers and other sequences into lists once."""
+        if not isinstance(self._data, list):
+            data = self._data
+            if isinstance(data, (_BufferRows, _ColumnRows)):
+                self._data = [list(row) for row in data]
+            else:
+                self._data = list(data)
+            # The array can be a view of the buffer, which isn't ours to change.
+            if self._stats is not None:
+                self._stats.__dict__.pop("array", None)
+        if not isinstance(self._labels, list):
+            self._labels = list(self._labels)
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buf,
+        labels: Union[list[str], None] = None,
+        categories: Union[list[str], None] = None,
+        columns: Union[int, None] = None,
+    ) -> Data:
+        """Wrap a buffer of numbers without copying it.
+
+        Accepts anything supporting the buffer protocol: array.array,
+        memoryview, bytes or a C-contiguous NumPy array. A 1-D buffer is flat
+        data, or rows of `columns` values when columns is given. The rows of
+        a 2-D buffer are the data rows and its columns the categories.
+        Rows are read through memoryview slices of the buffer.
+
+        Args:
+            buf: The buffer holding the values, row by row
+            labels: The labels of the rows, defaults to the row numbers
+            categories: The categories of the columns
+            columns: Number of values per row of a 1-D buffer
+
+        Returns:
+            Data object reading from the buffer
+        """
+        view = _numeric_view(buf)
+
+        if view.ndim == 2:
+            # shape is only None for 0-d views, the format only known at runtime
+            width = view.shape[1]  # type: ignore[index]
+            view = view.cast("B").cast(view.format)  # type: ignore[call-overload]
+        elif columns is not None:
+            if columns < 1 or len(view) % columns:
+                raise Exception(
+                    f"A buffer of {len(view)} values can't be split in rows of {columns}"
+                )
+            width = columns
+        else:
+            width = 0
+
+        data = _BufferRows(view, width) if width else view
+        if labels is None:
+            labels = [str(i) for i in range(len(data))]
+
+        # The rows are read like a list of lists, or of numbers.
+        return cls(cast(list, data), labels, categories)
+
+    @classmethod
+    def from_npy(
+        cls,
+        filename: str,
+        labels: Union[list[str], None] = None,
+        categories: Union[list[str], None] = None,
+    ) -> Data:
+        """Memory-map a NumPy .npy file and wrap its values without reading them.
+
+        NumPy isn't needed. The array must hold numbers in the native byte
+        order and C order. A 1-D array is flat data, the rows of a 2-D array
+        are the data rows and its columns the categories.
+
+        Args:
+            filename: Path to the .npy file
+            labels: The labels of the rows, defaults to the row numbers
+            categories: The categories of the columns
+
+        Returns:
+            Data object reading from the mapped file
+        """
+        with open(filename, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise Exception(f"Not a .npy file: {filename}")
+
+        view = memoryview(mapped)
+        fmt, shape, offset = _npy_header(view)
+        size = math.prod(shape) * struct.calcsize(fmt)
+        if len(shape) not in (1, 2) or offset + size > len(view):
+            raise Exception(f"Unsupported .npy array of shape {shape}")
+
+        # The format is only known at runtime, typeshed lists literal ones.
+        values = view[offset : offset + size].cast(fmt, shape)  # type: ignore[call-overload]
+        return cls.from_buffer(values, labels, categories)
+
+    @classmethod
+    def from_struct(
+        cls,
+        buf,
+        fmt: str,
+        labels: Union[list[str], None] = None,
+        categories: Union[list[str], None] = None,
+    ) -> Data:
+        """Read packed binary records described by a struct format.
+
+        Every record is a row, e.g. "<d d" for rows of two little-endian
+        doubles. Records of a single number type laid out like in memory are
+        wrapped without copying, others are unpacked with struct.
+
+        Args:
+            buf: The records, anything supporting the buffer protocol
+            fmt: The struct format of a record
+            labels: The labels of the rows, defaults to the row numbers
+            categories: The categories of the values of a record
+
+        Returns:
+            Data object reading from the records
+        """
+        record = struct.Struct(fmt)
+        view = memoryview(buf).cast("B")
+        if len(view) % record.size:
+            raise Exception(
+                f"{len(view)} bytes is not a whole number of {record.size} byte records"
+            )
+
+        layout = _record_layout(fmt)
+        if layout is not None:
+            code, count = layout
+            columns = count if count > 1 else None
+            values = view.cast(code)  # type: ignore[call-overload]
+            return cls.from_buffer(values, labels, categories, columns)
+
+        rows = [list(values) for values in record.iter_unpack(view)]
+        data: list = rows
+        if rows and len(rows[0]) == 1:
+            data = [row[0] for row in rows]
+        if labels is None:
+            labels = [str(i) for i in range(len(data))]
+        return cls(data, labels, categories)
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns,
+        labels: Union[list[str], None] = None,
+        categories: Union[list[str], None] = None,
+    ) -> Data:
+        """Wrap one buffer per category without copying them.
+
+        Args:
+            columns: A mapping from category name to a 1-D buffer, or a
+                     sequence of 1-D buffers, all of the same length
+            labels: The labels of the rows, defaults to the row numbers
+            categories: The categories, defaults to the keys of the mapping
+
+        Returns:
+            Data object reading from the buffers
+        """
+        if isinstance(columns, Mapping):
+            if categories is None:
+                categories = [str(name) for name in columns]
+            columns = list(columns.values())
+
+        views = [_numeric_view(column) for column in columns]
+        if not views:
+            raise Exception("No data provided")
+        if any(view.ndim != 1 for view in views):
+            raise Exception("Every column must be a 1-D buffer")
+        if len(set(map(len, views))) != 1:
+            raise Exception("The columns must all have the same length")
+
+        data = _ColumnRows(views)
+        if labels is None:
+            labels = [str(i) for i in range(len(data))]
+
+        # The rows are read like a list of lists.
+        return cls(cast(list, data), labels, categories)
+
+    @classmethod
+    def from_dataframe(cls, frame, label_column: Union[str, None] = None) -> Data:
+        """Wrap a pandas DataFrame or Series.
+
+        The numeric columns of a DataFrame become the categories, read
+        without copying when the columns are contiguous, as they are for a
+        DataFrame of one dtype. A Series becomes flat data. The labels are
+        the index, or the values of label_column.
+
+        Args:
+            frame: A pandas DataFrame or Series
+            label_column: Column to take the labels from instead of the index
+
+        Returns:
+            Data object reading from the frame
+        """
+        if _numpy() is None:
+            raise Exception("Data.from_dataframe() requires NumPy")
+
+        if label_column is not None:
+            labels = [str(label) for label in frame[label_column]]
+        else:
+            labels = [str(label) for label in frame.index]
+
+        if not hasattr(frame, "columns"):
+            return cls.from_buffer(np.ascontiguousarray(frame.to_numpy()), labels)
+
+        if label_column is not None:
+            frame = frame.drop(columns=[label_column])
+        numeric = frame.select_dtypes("number")
+        columns = {
+            str(name): np.ascontiguousarray(numeric[name].to_numpy()) for name in numeric.columns
+        }
+        return cls.from_columns(columns, labels)
 
     @classmethod
     def from_file(cls, filename: str, args: dict) -> Data:
@@ -68,12 +471,222 @@ class Data:
         """
         stdin = filename == "-"
 
-        # Get delimiter from args or use default
-        delim = args.get("delim") or DELIM
-
         if args.get("verbose"):
             print(f">> Reading data from {('stdin' if stdin else filename)}")
 
+        if args.get("binary") or (not stdin and filename.endswith(".npy")):
+            return cls._from_binary_file(filename, args)
+        if args.get("csv") or args.get("label_col") or args.get("cols"):
+            return cls._from_csv_file(filename, args)
+
+        try:
+            with profiling.phase("read"):
+                if stdin:
+                    stdin_buffer = getattr(sys.stdin, "buffer", None)
+                    text = sys.stdin.read() if stdin_buffer is None else stdin_buffer.read()
+                else:
+                    text = _read_file(filename)
+        except FileNotFoundError:
+            print(f">> Error: The specified file [{filename}] does not exist.")
+            sys.exit()
+        except IOError:
+            print("An IOError has occurred!")
+            sys.exit()
+        finally:
+            if stdin:
+                sys.stdin.close()
+
+        return cls.from_bytes(text, args)
+
+    @classmethod
+    def from_bytes(cls, buf: Union[bytes, bytearray, memoryview, str], args: dict) -> Data:
+        """Parse a whole input in the termgraph text format and return a Data object.
+
+        Produces the same Data as from_file(), but works on the complete
+        input at once: the delimiter is sniffed once and the numeric columns
+        are converted in bulk, falling back to line by line parsing for
+        irregular input.
+
+        Args:
+            buf: UTF-8 encoded bytes-like object or str
+            args: Dictionary of arguments including optional "delim"
+
+        Returns:
+            Data object with parsed data, labels, and categories
+        """
+        with profiling.phase("parse"):
+            text = buf if isinstance(buf, str) else str(buf, "utf-8")
+            categories, labels, data = _parse_text(text, args.get("delim") or DELIM)
+            data_obj = cls(data, labels, categories)
+
+        if profiling.active is not None:
+            lines = text.count("\n") + (not text.endswith("\n"))
+            _count_parsed(data_obj, lines)
+        return data_obj
+
+    @classmethod
+    async def from_async_iter(cls, *sources, args: Union[dict, None] = None) -> Data:
+        """Read async sources of lines at the same time and return one Data object.
+
+        For asyncio programs: reading waits on the event loop and parsing
+        runs in a worker thread, so slow producers don't block the loop.
+
+        Args:
+            sources: asyncio.StreamReader objects, e.g. of FIFOs or
+                subprocess pipes, or async iterables of str or bytes lines.
+                Their rows are merged in the order of the sources.
+            args: Dictionary of arguments as for from_bytes()
+
+        Returns:
+            Data object with the rows of all sources
+        """
+        import asyncio
+
+        texts = await asyncio.gather(*(_read_async(source) for source in sources))
+        text = b"".join(texts)
+        if not text.strip():
+            raise Exception("No data provided")
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, cls.from_bytes, text, args or {})
+
+    @classmethod
+    def _from_binary_file(cls, filename: str, args: dict) -> Data:
+        """Read a .npy file, or records in the "binary" struct format."""
+        labels = None
+        try:
+            if args.get("labels"):
+                with open(args["labels"]) as f:
+                    labels = [line.rstrip("\r\n") for line in f]
+
+            with profiling.phase("parse"):
+                if args.get("binary"):
+                    buf = _read_binary(filename)
+                    data_obj = cls.from_struct(
+                        buf, args["binary"], labels, args.get("categories")
+                    )
+                else:
+                    data_obj = cls.from_npy(filename, labels, args.get("categories"))
+        except FileNotFoundError as e:
+            print(f">> Error: The specified file [{e.filename}] does not exist.")
+            sys.exit()
+
+        _count_parsed(data_obj)
+        return data_obj
+
+    @classmethod
+    def from_csv(
+        cls,
+        lines: Iterable[str],
+        label_col: Union[str, int, None] = None,
+        cols: Union[Sequence[Union[str, int]], None] = None,
+        delimiter: str = ",",
+    ) -> Data:
+        """Read CSV rows, converting only the selected columns.
+
+        The rows are split by the csv module, so quoted fields may hold
+        delimiters. A first row without any number after its first field is
+        a header, and names the categories. Columns are given by their name
+        in the header or by their number counted from 1, like cut does.
+
+        Args:
+            lines: Lines of CSV, e.g. an open file
+            label_col: Column of the labels, default: the first one
+            cols: Columns of the values, default: those with a number, or
+                  none, in the first row
+            delimiter: Field delimiter
+
+        Returns:
+            Data object with one category per selected column
+        """
+        reader = csv.reader(lines, delimiter=delimiter)
+        first = next((row for row in reader if row), None)
+        names: list[str] = []
+        if first is not None and all(_maybe_float(field) is None for field in first[1:]):
+            names = first
+            first = next((row for row in reader if row), None)
+        header = bool(names)
+        if first is None:
+            raise Exception("No data provided")
+        rows = chain([first], reader)
+
+        label_index = 0 if label_col is None else _csv_column(label_col, names)
+        if cols is None:
+            # A missing value is drawn, so the rows lacking it are reported.
+            fields = first + [""] * (len(names) - len(first))
+            value_index = [
+                i
+                for i, field in enumerate(fields)
+                if i != label_index and (not field.strip() or _maybe_float(field) is not None)
+            ]
+        else:
+            value_index = [_csv_column(col, names) for col in cols]
+        if not value_index:
+            raise Exception("No CSV columns to draw")
+
+        labels: list[str] = []
+        data: list[list[float]] = []
+        for row in rows:
+            if not row:
+                continue
+            try:
+                data.append([float(row[i]) for i in value_index])
+                labels.append(row[label_index])
+            except (ValueError, IndexError):
+                raise Exception(
+                    f"Line {reader.line_num}: no number in every selected column: {row}"
+                )
+
+        categories = [names[i] for i in value_index] if header else []
+        return cls(data, labels, categories)
+
+    @classmethod
+    def _from_csv_file(cls, filename: str, args: dict) -> Data:
+        """Read a file or stdin in CSV mode."""
+        delimiter = args.get("delim") or ("\t" if filename.endswith(".tsv") else ",")
+        # Column names may be quoted to hold commas, as in the CSV itself.
+        cols = next(csv.reader([args["cols"]])) if args.get("cols") else None
+
+        try:
+            with profiling.phase("parse"):
+                if filename == "-":
+                    data_obj = cls.from_csv(sys.stdin, args.get("label_col"), cols, delimiter)
+                else:
+                    with open(filename, newline="") as f:
+                        data_obj = cls.from_csv(f, args.get("label_col"), cols, delimiter)
+        except FileNotFoundError:
+            print(f">> Error: The specified file [{filename}] does not exist.")
+            sys.exit()
+
+        _count_parsed(data_obj)
+        return data_obj
+
+    @classmethod
+    def iter_file(
+        cls,
+        filename: Union[str, TextIO],
+        args: dict,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[Data]:
+        """Read data from a file or stdin lazily, one Data chunk at a time.
+
+        Same format and arguments as from_file(), but at most chunk_size rows
+        are held in memory. Every chunk carries the categories read so far.
+
+        Args:
+            filename: Path to data file, "-" for stdin or an open text file
+            args: Dictionary of arguments including optional "delim" and "verbose"
+            chunk_size: Maximum number of rows per chunk
+
+        Yields:
+            Data objects with consecutive rows of the input
+        """
+        stdin = filename == "-"
+        is_path = isinstance(filename, str)
+
+        if args.get("verbose") and is_path:
+            print(f">> Reading data from {('stdin' if stdin else filename)}")
+
         categories: list[str] = []
         labels: list[str] = []
         data: list = []
@@ -81,28 +694,25 @@ class Data:
         f = None
 
         try:
-            f = sys.stdin if stdin else open(filename, "r")
-            for line in f:
-                line = line.strip()
-                if line:
-                    if not line.startswith("#"):
-                        # Line contains categories.
-                        if line.startswith("@"):
-                            cols = line.split(delim)
-                            cols[0] = cols[0].replace("@ ", "")
-                            categories = cols
-
-                        # Line contains label and values.
-                        else:
-                            if line.find(delim) > 0:
-                                cols = line.split(delim)
-                                row_delim = delim
-                            else:
-                                cols = line.split()
-                                row_delim = " "
-                            labeled_row = _label_row([col.strip() for col in cols], row_delim)
-                            data.append(labeled_row.data)
-                            labels.append(labeled_row.label)
+            if isinstance(filename, str):
+                f = sys.stdin if stdin else open(filename, "r")
+                lines = f
+            else:
+                lines = filename
+
+            for row in _parse_lines(lines, args.get("delim") or DELIM):
+                if isinstance(row, list):
+                    categories = row
+                    continue
+
+                data.append(row.data)
+                labels.append(row.label)
+                if len(data) >= chunk_size:
+                    yield cls(data, labels, categories)
+                    labels, data = [], []
+
+            if data:
+                yield cls(data, labels, categories)
         except FileNotFoundError:
             print(f">> Error: The specified file [{filename}] does not exist.")
             sys.exit()
@@ -113,12 +723,44 @@ class Data:
             if f is not None:
                 f.close()
 
-        return cls(data, labels, categories)
+    @classmethod
+    def scan_file(
+        cls,
+        filename: Union[str, TextIO],
+        args: dict,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> tuple[Union[int, float], Union[int, float], int]:
+        """Read through a file in chunks and return its scale.
+
+        This is the first pass of a two-pass render with iter_file(): the
+        result can be used as the "scale" and "label_width" chart arguments.
 
-    def _find_dims(self, data, labels, dims=None) -> Union[tuple[int], None]:
+        Returns:
+            Tuple of (minimum value, maximum value, maximum label length)
+        """
+        min_datum = max_datum = None
+        max_label_length = 0
+
+        for chunk in cls.iter_file(filename, args, chunk_size):
+            chunk_min, chunk_max = chunk.find_min(), chunk.find_max()
+            if min_datum is None or chunk_min < min_datum:
+                min_datum = chunk_min
+            if max_datum is None or chunk_max > max_datum:
+                max_datum = chunk_max
+            max_label_length = max(max_label_length, chunk.find_max_label_length())
+
+        if min_datum is None or max_datum is None:
+            raise Exception("No data provided")
+
+        return min_datum, max_datum, max_label_length
+
+    def _find_dims(self, data, labels, dims=None) -> Union[tuple[int, ...], None]:
         if dims is None:
             dims = []
-        if all([isinstance(data[i], list) for i in range(len(data))]):
+            fast_dims = _find_dims_2d(data)
+            if fast_dims is not None:
+                return fast_dims
+        if all([isinstance(data[i], _ROW_TYPES) for i in range(len(data))]):
             last = None
 
             for i in range(len(data)):
@@ -138,33 +780,31 @@ class Data:
 
         return tuple(dims)
 
+    @property
+    def array(self):
+        """The data as a contiguous float64 2-D NumPy array.
+
+        Flat data is returned with a single column. None when NumPy is not
+        installed, the data is too small to benefit from it or the data
+        can not be represented as a 2-D float array.
+        """
+        return self.stats.array
+
     def find_min(self) -> Union[int, float]:
         """Return the minimum value in sublist of list."""
-        # Check if data is flat (list of numbers) or nested (list of lists)
-        is_flat = all(not isinstance(item, list) for item in self.data)
-
-        if is_flat:
-            return min(self.data)
-        else:
-            return min(value for sublist in self.data for value in sublist)
+        return self.stats.min
 
     def find_max(self) -> Union[int, float]:
         """Return the maximum value in sublist of list."""
-        # Check if data is flat (list of numbers) or nested (list of lists)
-        is_flat = all(not isinstance(item, list) for item in self.data)
-
-        if is_flat:
-            return max(self.data)
-        else:
-            return max(value for sublist in self.data for value in sublist)
+        return self.stats.max
 
     def find_min_label_length(self) -> int:
         """Return the minimum length for the labels."""
-        return min(len(label) for label in self.labels)
+        return self.stats.min_label_length
 
     def find_max_label_length(self) -> int:
         """Return the maximum length for the labels."""
-        return max(len(label) for label in self.labels)
+        return self.stats.max_label_length
 
     def __str__(self):
         """Returns the string representation of the data.
@@ -218,59 +858,715 @@ class Data:
 
         return "\n".join(output)
 
-    def normalize(self, width: int) -> list:
-        """Normalize the data and return it."""
-        # Check if data is flat (list of numbers) or nested (list of lists)
-        is_flat = all(not isinstance(item, list) for item in self.data)
+    def normalize(
+        self, width: int, scale: Union[tuple[float, float], None] = None
+    ) -> list:
+        """Normalize the data and return it.
+
+        The result is memoized per width and scale, treat it as read-only.
+
+        :width: The number of ticks for the largest value
+        :scale: Optional (min, max) to scale against instead of the extremes
+                of this data, so chunks of a larger input share one scale.
+        """
+        key = (width, None if scale is None else tuple(scale))
+        normal = self.stats.normal
+        if key not in normal:
+            normal[key] = self._normalize(width, scale)
+        return normal[key]
+
+    def _normalize(
+        self,
+        width: int,
+        scale: Union[tuple[float, float], None] = None,
+        rows: Union[list, None] = None,
+    ) -> list:
+        """Normalize all the data, or only the given rows of it."""
+        if scale is None:
+            min_datum, max_datum = self.find_min(), self.find_max()
+        else:
+            min_datum, max_datum = scale
+
+        # Negative data is offset so that the minimum becomes zero.
+        offset = abs(min_datum) if min_datum < 0 else 0
+
+        is_flat = self.stats.is_flat
+        data = self.data if rows is None else rows
+
+        if min_datum + offset == max_datum + offset:
+            # Nothing to scale, return the (offset) data as is.
+            if not offset:
+                return data
+            if is_flat:
+                return [d + offset for d in data]
+            return [[d + offset for d in datum] for datum in data]
+
+        # max_dat / width is the value for a single tick. norm_factor is the
+        # inverse of this value
+        # If you divide a number to the value of single tick, you will find how
+        # many ticks it does contain basically.
+        norm_factor = width / float(max_datum + offset)
+
+        if rows is None and self.array is not None:
+            normal = (self.array + offset) * norm_factor
+            return normal.ravel().tolist() if is_flat else normal.tolist()
 
         if is_flat:
-            # Handle flat list data
-            min_datum = min(self.data)
-            if min_datum < 0:
-                min_datum = abs(min_datum)
-                data_offset = [d + min_datum for d in self.data]
-            else:
-                data_offset = self.data
+            return [(v + offset) * norm_factor for v in data]
 
-            min_datum = min(data_offset)
-            max_datum = max(data_offset)
+        return [[(v + offset) * norm_factor for v in datum] for datum in data]
 
-            if min_datum == max_datum:
-                return data_offset
+    def normalize_categories(self, width: int) -> list:
+        """Normalize every category (column) on its own scale and return it.
 
-            norm_factor = width / float(max_datum)
-            return [v * norm_factor for v in data_offset]
-        else:
-            # Handle nested list data (original logic)
-            data_offset = []
-            min_datum = min(value for sublist in self.data for value in sublist)
-            if min_datum < 0:
-                min_datum = abs(min_datum)
-                for datum in self.data:
-                    data_offset.append([d + min_datum for d in datum])
+        The result is memoized per width, treat it as read-only.
+        """
+        key = ("categories", width)
+        normal = self.stats.normal
+        if key not in normal:
+            normal[key] = self._normalize_categories(width)
+        return normal[key]
+
+    def _normalize_categories(self, width: int, rows: Union[list, None] = None) -> list:
+        """Normalize all the data per category, or only the given rows of it."""
+        if rows is None and self.array is not None and isinstance(self.data[0], _ROW_TYPES):
+            array = self.array
+            col_min = array.min(axis=0)
+            shifted = array + np.where(col_min < 0, -col_min, 0.0)
+            shifted_min = shifted.min(axis=0)
+            shifted_max = shifted.max(axis=0)
+
+            # Flat categories are left unscaled, like normalize() does.
+            norm_factor = np.ones_like(shifted_max)
+            np.divide(width, shifted_max, out=norm_factor, where=shifted_min != shifted_max)
+            return (shifted * norm_factor).tolist()
+
+        data = self.data if rows is None else rows
+        if not (self.dims and len(self.dims) > 1):
+            return [[] for _ in range(len(data))]
+
+        offsets: list[float] = []
+        factors: list[float] = []
+        for col_min, col_max in zip(self.stats.column_min, self.stats.column_max):
+            offset = abs(col_min) if col_min < 0 else 0
+            offsets.append(offset)
+            if col_min + offset == col_max + offset:
+                factors.append(1)  # Flat categories are left unscaled
             else:
-                data_offset = self.data
-            min_datum = min(value for sublist in data_offset for value in sublist)
-            max_datum = max(value for sublist in data_offset for value in sublist)
+                factors.append(width / float(col_max + offset))
 
-            if min_datum == max_datum:
-                return data_offset
+        return [
+            [(v + offset) * factor for v, offset, factor in zip(row, offsets, factors)]
+            for row in data
+        ]
 
-            # max_dat / width is the value for a single tick. norm_factor is the
-            # inverse of this value
-            # If you divide a number to the value of single tick, you will find how
-            # many ticks it does contain basically.
-            norm_factor = width / float(max_datum)
-            normal_data = []
-            for datum in data_offset:
-                normal_data.append([v * norm_factor for v in datum])
+    def downsample(self, max_points: int, method: str = "mean") -> Data:
+        """Reduce the rows to at most max_points and return the new Data.
 
-            return normal_data
+        :max_points: The largest number of rows to keep
+        :method: "mean", "min", "max" or "sum" aggregate each run of
+                 consecutive rows into one row labelled like its first row.
+                 "lttb" (Largest-Triangle-Three-Buckets) keeps the rows that
+                 preserve the shape of the series best.
+        :returns: This Data when it already fits, a new Data otherwise
+        """
+        if method not in DOWNSAMPLE_METHODS:
+            raise Exception(f"Invalid downsample method: {method}")
+        if max_points < 1:
+            raise Exception("max_points must be at least 1")
+
+        count = len(self.data)
+        if count <= max_points:
+            return self
+
+        if method == "lttb":
+            rows = _lttb_indices(self._row_totals(), max_points)
+            return Data(
+                [self.data[i] for i in rows],
+                [self.labels[i] for i in rows],
+                self.categories,
+            )
+
+        # Bucket i holds the rows starts[i] up to starts[i + 1].
+        starts = [count * i // max_points for i in range(max_points)]
+        labels = [self.labels[i] for i in starts]
+        is_flat = not isinstance(self.data[0], _ROW_TYPES)
+
+        if self.array is not None:
+            if method == "min":
+                reduced = np.minimum.reduceat(self.array, starts)
+            elif method == "max":
+                reduced = np.maximum.reduceat(self.array, starts)
+            else:
+                reduced = np.add.reduceat(self.array, starts)
+                if method == "mean":
+                    sizes = np.diff(np.append(starts, count))
+                    reduced = reduced / sizes[:, np.newaxis]
+            data = reduced.ravel().tolist() if is_flat else reduced.tolist()
+            return Data(data, labels, self.categories)
+
+        aggregate = _AGGREGATES[method]
+        bounds = starts + [count]
+        buckets = [self.data[a:b] for a, b in zip(bounds, bounds[1:])]
+        if is_flat:
+            data = [aggregate(bucket) for bucket in buckets]
+        else:
+            data = [[aggregate(col) for col in zip(*bucket)] for bucket in buckets]
+        return Data(data, labels, self.categories)
+
+    def _row_totals(self) -> list:
+        """Return one value per row, the sum of the categories of a row."""
+        if self.array is not None:
+            return self.array.sum(axis=1)
+        if not isinstance(self.data[0], _ROW_TYPES):
+            return self.data
+        return [sum(row) for row in self.data]
 
     def __repr__(self):
         return f"Data(data={self.data if len(str(self.data)) < 25 else str(self.data)[:25] + '...'}, labels={self.labels}, categories={self.categories})"
 
 
+class RollingData(Data):
+    """Data of a window of the last rows pushed, up to a fixed capacity.
+
+    The values are held in one preallocated array of floats per column,
+    used as a ring buffer: pushing a row into a full window overwrites the
+    oldest row in place. The minimum and maximum of every column over the
+    window are kept in monotonic deques, so pushing a row and evicting one
+    take amortized O(1) and the extremes never need a scan. data and labels
+    are views of the ring, oldest row first, that charts read without
+    copying the window.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        categories: Union[list[str], None] = None,
+        columns: Union[int, None] = None,
+    ):
+        """Initialize an empty window
+
+        :capacity: The largest number of rows in the window
+        :categories: The categories of the data
+        :columns: The number of values per row, defaults to one per
+                  category, or a single one without categories
+        """
+        if capacity < 1:
+            raise Exception("The capacity must be at least 1")
+        width = columns or len(categories or []) or 1
+        if categories and len(categories) != width:
+            raise Exception("The categories and the values per row must be as many")
+
+        self.capacity = capacity
+        self.categories = categories or []
+        self._start = 0  # Slot of the oldest row
+        self._size = 0
+        self._pushed = 0  # Sequence number of the next row
+
+        self._columns = [array("d", [0.0]) * capacity for _ in range(width)]
+        self._label_slots = [""] * capacity
+        # (sequence number, value) of the rows that can still become the
+        # minimum (maximum) of a column, values increasing (decreasing).
+        self._lows: list[deque] = [deque() for _ in range(width)]
+        self._highs: list[deque] = [deque() for _ in range(width)]
+
+        self._stats = None
+        self._rows_by_label = None
+        # Views of the ring, read like the lists of rows and labels.
+        self._data = cast(list, _RingRows(self, self._columns))
+        self._labels = cast(list, _RingView(self, self._label_slots))
+
+    @property
+    def data(self) -> list:
+        """The rows of the window, oldest first."""
+        return self._data
+
+    @data.setter
+    def data(self, data: list) -> None:
+        raise Exception("The rows of RollingData can only be pushed")
+
+    @property
+    def labels(self) -> list[str]:
+        """The labels of the window, oldest first."""
+        return self._labels
+
+    @labels.setter
+    def labels(self, labels: list[str]) -> None:
+        raise Exception("The rows of RollingData can only be pushed")
+
+    @property
+    def stats(self) -> DataStats:
+        """The statistics of the window, see DataStats."""
+        if self._stats is None:
+            self._stats = _RollingStats(self)
+        return self._stats
+
+    def push(self, label: str, values) -> None:
+        """Add a row, evicting the oldest one when the window is full.
+
+        :label: The label of the row
+        :values: The values of the row, a number with a single column
+        """
+        if not isinstance(values, (tuple, *_ROW_TYPES)):
+            values = (values,)
+        if len(values) != len(self._columns):
+            raise Exception(f"Expected {len(self._columns)} values, not {values!r}")
+        try:
+            values = [float(value) for value in values]
+        except (TypeError, ValueError):
+            raise Exception(f"Expected numbers, not {values!r}")
+
+        capacity = self.capacity
+        if self._size == capacity:
+            evicted = self._pushed - capacity
+            for queue in chain(self._lows, self._highs):
+                if queue[0][0] == evicted:
+                    queue.popleft()
+            slot = self._start
+            self._start = (slot + 1) % capacity
+        else:
+            slot = (self._start + self._size) % capacity
+            self._size += 1
+
+        sequence = self._pushed
+        self._pushed += 1
+        self._label_slots[slot] = label
+        for column, lows, highs, value in zip(self._columns, self._lows, self._highs, values):
+            column[slot] = value
+            while lows and lows[-1][1] >= value:
+                lows.pop()
+            lows.append((sequence, value))
+            while highs and highs[-1][1] <= value:
+                highs.pop()
+            highs.append((sequence, value))
+
+        # The window changed, the extremes come from the deques.
+        self._stats = None
+
+    def extend(self, labels: list[str], rows: list) -> None:
+        """Push rows in order, see push()."""
+        if len(labels) != len(rows):
+            raise Exception("The dimensions of the data and labels must be the same")
+        for label, row in zip(labels, rows):
+            self.push(label, row)
+
+    def update(self, label: str, values) -> None:
+        """Not supported, rows only enter the window by push()."""
+        raise Exception("The rows of RollingData can only be pushed")
+
+    def clear(self) -> None:
+        """Empty the window."""
+        self._start = self._size = 0
+        for queue in chain(self._lows, self._highs):
+            queue.clear()
+        self._stats = None
+
+
+class _BufferRows:
+    """The rows of a row-major buffer, each a memoryview slice of it."""
+
+    def __init__(self, view: memoryview, width: int):
+        self.view = view
+        self.width = width
+
+    def __len__(self) -> int:
+        return len(self.view) // self.width
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        start = index * self.width
+        return self.view[start : start + self.width]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        view, width = self.view, self.width
+        for start in range(0, len(view), width):
+            yield view[start : start + width]
+
+    def to_numpy(self):
+        return np.asarray(self.view).reshape(-1, self.width)
+
+    def __repr__(self):
+        return repr([row.tolist() for row in self])
+
+
+class _ColumnRow:
+    """One row across column buffers."""
+
+    def __init__(self, columns: list[memoryview], index: int):
+        self._columns = columns
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [column[self._index] for column in self._columns[index]]
+        return self._columns[index][self._index]
+
+    def __iter__(self) -> Iterator:
+        index = self._index
+        return (column[index] for column in self._columns)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _ColumnRows:
+    """The rows of data held as one buffer per category."""
+
+    def __init__(self, columns: list[memoryview]):
+        self.columns = columns
+        self.width = len(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return _ColumnRow(self.columns, index)
+
+    def __iter__(self) -> Iterator[_ColumnRow]:
+        return (_ColumnRow(self.columns, i) for i in range(len(self)))
+
+    def to_numpy(self):
+        return np.column_stack(self.columns)
+
+    def __repr__(self):
+        return repr([list(row) for row in self])
+
+
+class _RingView:
+    """The items of the ring buffer of a RollingData, oldest first."""
+
+    def __init__(self, ring: RollingData, items):
+        self.ring = ring
+        self.items = items
+
+    def _item(self, slot: int):
+        return self.items[slot]
+
+    def __len__(self) -> int:
+        return self.ring._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        ring = self.ring
+        if index < 0:
+            index += ring._size
+        if not 0 <= index < ring._size:
+            raise IndexError("index out of range")
+        return self._item((ring._start + index) % ring.capacity)
+
+    def __iter__(self) -> Iterator:
+        ring = self.ring
+        start, capacity = ring._start, ring.capacity
+        return (self._item((start + i) % capacity) for i in range(ring._size))
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _RingRows(_RingView):
+    """The rows of a RollingData, each a row across its column buffers."""
+
+    def _item(self, slot: int) -> _ColumnRow:
+        return _ColumnRow(self.items, slot)
+
+    def to_numpy(self):
+        ring = self.ring
+        order = (ring._start + np.arange(ring._size)) % ring.capacity
+        return np.column_stack([np.frombuffer(column)[order] for column in self.items])
+
+    def __repr__(self):
+        return repr([list(row) for row in self])
+
+
+# What counts as a row of nested data.
+_ROW_TYPES = (list, memoryview, _ColumnRow)
+
+
+def _numeric_view(buf) -> memoryview:
+    """Return a memoryview of the numbers in buf without copying them."""
+    try:
+        view = buf if isinstance(buf, memoryview) else memoryview(buf)
+    except (TypeError, ValueError) as e:
+        raise Exception(f"Can't read the values from a buffer: {e}")
+
+    if view.format.lstrip("@") not in _NUMERIC_FORMATS:
+        raise Exception(f"Unsupported buffer format: {view.format}")
+    if view.ndim not in (1, 2):
+        raise Exception("Only 1-D and 2-D buffers are supported")
+    if not view.c_contiguous:
+        raise Exception("The buffer must be C-contiguous")
+
+    return view
+
+
+class DataStats:
+    """Lazily computed, memoized statistics of a Data object.
+
+    Every statistic is computed on first use and kept until the Data is
+    changed, charts share them through Data.stats instead of rescanning the
+    data for every row.
+    """
+
+    def __init__(self, data: Data):
+        self._data = data
+
+        # Normalized data by (width, scale) or ("categories", width).
+        self.normal: dict[tuple, list] = {}
+
+    @cached_property
+    def dims(self) -> Union[tuple[int, ...], None]:
+        return self._data._find_dims(self._data.data, self._data.labels)
+
+    @cached_property
+    def is_flat(self) -> bool:
+        """True for a list of numbers, False for a list of lists."""
+        data = self._data.data
+        if isinstance(data, memoryview):
+            return True
+        if isinstance(data, (_BufferRows, _ColumnRows, _RingRows)):
+            return False
+        return all(not isinstance(item, _ROW_TYPES) for item in data)
+
+    @cached_property
+    def array(self):
+        """See Data.array."""
+        data, dims = self._data.data, self.dims
+        if dims is None or len(dims) > 2:
+            return None
+        if len(data) * (dims[1] if len(dims) > 1 else 1) < _NUMPY_MIN_VALUES:
+            return None
+        if _numpy() is None:
+            return None
+
+        is_flat = not isinstance(data[0], _ROW_TYPES)
+        if isinstance(data, (_BufferRows, _ColumnRows, _RingRows)):
+            source = data.to_numpy()
+        elif isinstance(data, memoryview):
+            source = np.asarray(data)
+        else:
+            source = data
+        try:
+            array = np.ascontiguousarray(source, dtype=np.float64)
+        except (TypeError, ValueError):
+            return None
+
+        if array.ndim == 1:
+            return array.reshape(-1, 1)
+        if array.ndim == 2 and not is_flat:
+            return array
+        return None
+
+    def _value_at(self, index: int) -> Union[int, float]:
+        """Return the original value at a flat index of the array."""
+        data = self._data.data
+        if not isinstance(data[0], _ROW_TYPES):
+            return data[index]
+        row, col = divmod(index, self.array.shape[1])
+        return data[row][col]
+
+    @cached_property
+    def min(self) -> Union[int, float]:
+        if self.array is not None:
+            return self._value_at(int(self.array.argmin()))
+        if self.is_flat:
+            return min(self._data.data)
+        return min(value for sublist in self._data.data for value in sublist)
+
+    @cached_property
+    def max(self) -> Union[int, float]:
+        if self.array is not None:
+            return self._value_at(int(self.array.argmax()))
+        if self.is_flat:
+            return max(self._data.data)
+        return max(value for sublist in self._data.data for value in sublist)
+
+    @cached_property
+    def column_min(self) -> list:
+        """The minimum of every category (column), one value for flat data."""
+        if self.is_flat:
+            return [self.min]
+        return [min(column) for column in zip(*self._data.data)]
+
+    @cached_property
+    def column_max(self) -> list:
+        """The maximum of every category (column), one value for flat data."""
+        if self.is_flat:
+            return [self.max]
+        return [max(column) for column in zip(*self._data.data)]
+
+    @cached_property
+    def min_label_length(self) -> int:
+        return min(len(label) for label in self._data.labels)
+
+    @cached_property
+    def max_label_length(self) -> int:
+        return max(len(label) for label in self._data.labels)
+
+    def _added(self, start: int) -> None:
+        """Update the statistics computed so far for the rows from start on."""
+        data = self._data
+        rows, labels = data.data[start:], data.labels[start:]
+        cache = self.__dict__
+        scale, columns = self._scales()
+
+        if "dims" in cache:
+            cache["dims"] = (len(data.data),) + cache["dims"][1:]
+        # Copying the rows into the array is no cheaper than rebuilding it.
+        cache.pop("array", None)
+
+        values = rows if self.is_flat else list(chain.from_iterable(rows))
+        self._merge("min", min, min(values))
+        self._merge("max", max, max(values))
+        if self.is_flat:
+            self._merge("column_min", _merge_columns(min), [min(values)])
+            self._merge("column_max", _merge_columns(max), [max(values)])
+        else:
+            self._merge("column_min", _merge_columns(min), [min(c) for c in zip(*rows)])
+            self._merge("column_max", _merge_columns(max), [max(c) for c in zip(*rows)])
+        self._merge("min_label_length", min, min(map(len, labels)))
+        self._merge("max_label_length", max, max(map(len, labels)))
+
+        for key, normal in list(self.normal.items()):
+            rows_normal = self._normalize_rows(key, rows, scale, columns)
+            if rows_normal is None:
+                del self.normal[key]
+            else:
+                normal.extend(rows_normal)
+
+    def _replaced(self, index: int, old) -> None:
+        """Update the statistics computed so far for a row that was replaced."""
+        row = self._data.data[index]
+        cache = self.__dict__
+        scale, columns = self._scales()
+
+        array = cache.get("array")
+        if array is not None:
+            array[index] = row
+
+        new_values = [row] if self.is_flat else row
+        old_values = [old] if self.is_flat else old
+        self._replace("min", min, old_values, new_values)
+        self._replace("max", max, old_values, new_values)
+        for name, pick in (("column_min", min), ("column_max", max)):
+            extremes = cache.get(name)
+            if extremes is None:
+                continue
+            for column, (old_value, new_value) in enumerate(zip(old_values, new_values)):
+                if pick(extremes[column], new_value) == new_value:
+                    extremes[column] = new_value
+                elif old_value == extremes[column]:
+                    del cache[name]  # Only a rescan tells the new extreme
+                    break
+
+        for key, normal in list(self.normal.items()):
+            rows_normal = self._normalize_rows(key, [row], scale, columns)
+            if rows_normal is None:
+                del self.normal[key]
+            else:
+                normal[index] = rows_normal[0]
+
+    def _scales(self) -> tuple:
+        """Return the computed (min, max) and (column_min, column_max), as copies."""
+        cache = self.__dict__
+        columns = [cache.get(name) for name in ("column_min", "column_max")]
+        return (
+            (cache.get("min"), cache.get("max")),
+            tuple(None if c is None else list(c) for c in columns),
+        )
+
+    def _merge(self, name: str, pick, value) -> None:
+        """Merge the value of new rows into a statistic, if computed."""
+        cache = self.__dict__
+        if name in cache:
+            cache[name] = pick(cache[name], value)
+
+    def _replace(self, name: str, pick, old_values: list, new_values: list) -> None:
+        """Update an extreme for values replacing old_values, if computed."""
+        cache = self.__dict__
+        if name not in cache:
+            return
+        new = pick(new_values)
+        if pick(cache[name], new) == new:
+            cache[name] = new
+        elif cache[name] in old_values:
+            del cache[name]  # Only a rescan tells the new extreme
+
+    def _normalize_rows(self, key: tuple, rows: list, scale: tuple, columns: tuple):
+        """Return the normalized rows for a memoized key, None when the
+        whole data has to be normalized again for it.
+        """
+        data = self._data
+        if self.normal[key] is data.data:
+            return None  # Unscaled data, normalized as is
+        new_scale, new_columns = self._scales()
+        if key[0] == "categories":
+            if None in columns or new_columns != columns:
+                return None
+            return data._normalize_categories(key[1], rows)
+        width, fixed = key
+        if fixed is None and (None in scale or new_scale != scale):
+            return None
+        return data._normalize(width, fixed or scale, rows)
+
+
+class _RollingStats(DataStats):
+    """DataStats of a RollingData, the extremes read from its deques."""
+
+    def __init__(self, data: RollingData):
+        super().__init__(data)
+        self._ring = data
+
+    @property
+    def dims(self) -> tuple[int, ...]:
+        ring = self._ring
+        return (ring._size, len(ring._columns))
+
+    @property
+    def is_flat(self) -> bool:
+        return False
+
+    @property
+    def column_min(self) -> list:
+        return self._fronts(self._ring._lows)
+
+    @property
+    def column_max(self) -> list:
+        return self._fronts(self._ring._highs)
+
+    @property
+    def min(self) -> float:
+        return min(self.column_min)
+
+    @property
+    def max(self) -> float:
+        return max(self.column_max)
+
+    def _fronts(self, queues: list[deque]) -> list:
+        if not self._ring._size:
+            raise Exception("No data provided")
+        return [queue[0][1] for queue in queues]
+
+
+def _merge_columns(pick):
+    """Return a function merging two lists of column extremes with pick."""
+    return lambda a, b: [pick(x, y) for x, y in zip(a, b)]
+
+
 class _LabeledRow:
     """Internal helper class for parsing data rows with labels."""
     def __init__(self, label: str, data: list[float]):
@@ -278,6 +1574,423 @@ class _LabeledRow:
         self.data = data
 
 
+def _numpy():
+    """Import NumPy on first use, returns None when it isn't installed.
+
+    Importing NumPy takes longer than drawing a small chart, so it is left
+    out of the CLI startup until some data is large enough to need it.
+    """
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+        except ImportError:  # NumPy is optional
+            return None
+        np = numpy
+    return np
+
+
+def _is_ndarray(values) -> bool:
+    """Tell if values is a NumPy array, without importing NumPy for it."""
+    numpy = sys.modules.get("numpy")
+    return (
+        numpy is not None
+        and isinstance(values, numpy.ndarray)
+        and _numpy() is not None
+    )
+
+
+def bin_counts(values: Iterable, borders: Sequence[float]) -> list[int]:
+    """Count the values falling in each bin.
+
+    Bin i holds the values v with borders[i] <= v < borders[i + 1], values
+    outside of the borders are not counted. Each value is placed with a
+    binary search over the ascending borders, O(n log bins). Data with few
+    distinct values, like integer counts, is tallied with a Counter first
+    so every distinct value is only placed once.
+
+    :values: The values to count, a NumPy array is counted vectorized
+    :borders: The edges of the bins, one more than the number of bins
+    :returns: The number of values in each bin
+    """
+    bins = len(borders) - 1
+
+    if _is_ndarray(values):
+        index = np.searchsorted(borders, np.ravel(values), side="right") - 1
+        index = index[(index >= 0) & (index < bins)]
+        return np.bincount(index, minlength=bins).tolist()
+
+    # Index 0 is below the first border and bins + 1 from the last border on.
+    counts = [0] * (bins + 2)
+    if _is_discrete(values):
+        for value, count in Counter(values).items():
+            counts[bisect_right(borders, value)] += count
+    else:
+        for index, count in Counter(map(bisect_right, repeat(borders), values)).items():
+            counts[index] = count
+
+    return counts[1:-1]
+
+
+def _is_discrete(values: Iterable) -> bool:
+    """Guess from a sample whether a sequence repeats few distinct values."""
+    if not isinstance(values, Sequence) or len(values) < 4 * _DISCRETE_SAMPLE:
+        return False
+    return len(set(values[:_DISCRETE_SAMPLE])) <= _DISCRETE_MAX_DISTINCT
+
+
+def _lttb_indices(values, max_points: int) -> list[int]:
+    """Return the indexes Largest-Triangle-Three-Buckets keeps of a series.
+
+    The first and last points are always kept. The points in between are
+    split into max_points - 2 buckets and from each bucket the point forming
+    the largest triangle with the point kept before it and the average of
+    the next bucket is kept.
+    """
+    count = len(values)
+    if max_points >= count:
+        return list(range(count))
+    if max_points < 3:
+        return [0, count - 1][:max_points]
+
+    use_numpy = _is_ndarray(values)
+    every = (count - 2) / (max_points - 2)
+    kept = [0]
+    a = 0
+
+    for i in range(max_points - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, count)
+
+        # Average of the next bucket, the last point for the last bucket.
+        next_x = (end + next_end - 1) / 2
+        if use_numpy:
+            next_y = float(values[end:next_end].mean())
+        else:
+            next_y = sum(values[end:next_end]) / (next_end - end)
+
+        a_x, a_y = a, values[a]
+        dx, dy = next_x - a_x, next_y - a_y
+
+        # Twice the triangle area, the constant factor doesn't change the max.
+        if use_numpy:
+            x = np.arange(start, end)
+            areas = np.abs(dx * (values[start:end] - a_y) - dy * (x - a_x))
+            a = start + int(areas.argmax())
+        else:
+            a = max(
+                range(start, end),
+                key=lambda j: abs(dx * (values[j] - a_y) - dy * (j - a_x)),
+            )
+        kept.append(a)
+
+    kept.append(count - 1)
+    return kept
+
+
+def _find_dims_2d(data: list) -> Union[tuple[int, ...], None]:
+    """Find the dimensions of flat or list of flat lists data without
+    walking it in Python. Returns None for anything else, which is left
+    to Data._find_dims().
+    """
+    if not data:
+        return None
+
+    if isinstance(data, (_BufferRows, _ColumnRows)):
+        return (len(data), data.width)
+    if isinstance(data, memoryview):
+        return (len(data),)
+
+    if not any(map(isinstance, data, repeat(_ROW_TYPES))):
+        return (len(data),)
+
+    if not all(map(isinstance, data, repeat(_ROW_TYPES))):
+        return None
+
+    widths = set(map(len, data))
+    if len(widths) != 1 or 0 in widths:
+        return None
+
+    if any(map(isinstance, chain.from_iterable(data), repeat(_ROW_TYPES))):
+        return None
+
+    return (len(data), widths.pop())
+
+
+def _count_parsed(data: Data, lines: Union[int, None] = None) -> None:
+    """Count the rows and values read into the active profiler, if any."""
+    if profiling.active is None:
+        return
+    rows = len(data.labels)
+    profiling.count("rows", rows)
+    profiling.count("values", math.prod(data.dims or (0,)))
+    if lines is not None:
+        profiling.count("lines skipped", lines - rows)
+
+
+def _csv_column(col: Union[str, int], header: list[str]) -> int:
+    """Return the index of a CSV column given by header name or number."""
+    if isinstance(col, str):
+        col = col.strip()
+        if col in header:
+            return header.index(col)
+        if not col.isdigit():
+            raise Exception(f"No CSV column named {col!r}")
+    index = int(col) - 1
+    if index < 0:
+        raise Exception(f"CSV columns are numbered from 1, not {col}")
+    return index
+
+
+async def _read_async(source) -> bytes:
+    """Return the whole input of an async source, ending in a new line."""
+    import asyncio
+
+    chunks = []
+    if isinstance(source, asyncio.StreamReader):
+        # Much faster than a line at a time
+        while True:
+            chunk = await source.read(1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    else:
+        async for line in source:
+            chunks.append(line.encode("utf-8") if isinstance(line, str) else line)
+            if not line.endswith("\n" if isinstance(line, str) else b"\n"):
+                chunks.append(b"\n")
+
+    if chunks and not chunks[-1].endswith(b"\n"):
+        chunks.append(b"\n")
+    return b"".join(chunks)
+
+
+def _read_binary(filename: str):
+    """Return the bytes of a file or stdin, memory-mapping regular files."""
+    if filename == "-":
+        return sys.stdin.buffer.read()
+
+    with open(filename, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and special files can't be mapped.
+            return f.read()
+
+
+def _npy_header(view: memoryview) -> tuple[str, tuple[int, ...], int]:
+    """Return the memoryview format, the shape and the data offset of a .npy file."""
+    import ast
+
+    if bytes(view[:6]) != b"\x93NUMPY":
+        raise Exception("Not a .npy file")
+
+    if view[6] == 1:
+        start, length = 10, int.from_bytes(view[8:10], "little")
+    else:
+        start, length = 12, int.from_bytes(view[8:12], "little")
+    header = ast.literal_eval(str(view[start : start + length], "latin1"))
+
+    descr = header["descr"]
+    fmt = _NPY_FORMATS.get(descr[1:]) if isinstance(descr, str) else None
+    if fmt is None or descr[0] not in ("|", "=", _NATIVE_ORDER):
+        raise Exception(f"Unsupported .npy data type: {descr}")
+    if header["fortran_order"]:
+        raise Exception("Unsupported .npy array in Fortran order")
+
+    return fmt, tuple(header["shape"]), start + length
+
+
+def _record_layout(fmt: str) -> Union[tuple[str, int], None]:
+    """Return the memoryview format and the number of values of a record.
+
+    None when the struct format mixes types, or lays the values out
+    differently than memory does, so the records can't be cast in place.
+    """
+    order = fmt[0] if fmt[:1] in ("@", "=", "<", ">", "!") else "@"
+    items = _STRUCT_ITEM.findall(fmt.lstrip("@=<>!"))
+    codes = {code for _, code in items}
+    if len(codes) != 1:
+        return None
+
+    code = codes.pop()
+    if code not in _NUMERIC_FORMATS:
+        return None
+    if order in "<>!" and order.replace("!", ">") != _NATIVE_ORDER:
+        return None
+    if struct.calcsize(order + code) != struct.calcsize("@" + code):
+        return None
+
+    return code, sum(int(count or 1) for count, _ in items)
+
+
+def _read_file(filename: str) -> str:
+    """Read a whole file as text, memory-mapping regular files."""
+    with open(filename, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and special files can't be mapped.
+            return str(f.read(), "utf-8")
+
+        try:
+            with memoryview(mapped) as view:
+                return str(view, "utf-8")
+        finally:
+            mapped.close()
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector.
+
+    Parsing creates millions of small acyclic objects, for which collections
+    are pure overhead.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _parse_text(text: str, delim: str) -> tuple[list[str], list[str], list]:
+    """Parse a whole input in the termgraph text format.
+
+    Returns (categories, labels, data), the same as _parse_lines() would.
+    """
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    categories: list[str] = []
+    labels: list[str] = []
+    data: list = []
+
+    with _gc_paused():
+        # Blank, comment and category lines split the input into runs of
+        # data lines, which are parsed in bulk. Every line, including the
+        # first one, is matched with the newline in front of it.
+        text = "\n" + text
+        start = 0
+        for match in _SPECIAL_LINE.finditer(text):
+            if match.start() > start:
+                _parse_data_lines(text[start + 1 : match.start()], delim, labels, data)
+            start = match.end()
+
+            line = match.group().strip()
+            if line.startswith("@"):
+                for header in _parse_lines([line], delim):
+                    if isinstance(header, list):
+                        categories = header
+
+        if start < len(text):
+            _parse_data_lines(text[start + 1 :], delim, labels, data)
+
+    return categories, labels, data
+
+
+def _parse_data_lines(text: str, delim: str, labels: list[str], data: list) -> None:
+    """Parse data lines and append them to labels and data."""
+    lines = text.split("\n")
+    parsed = _parse_body(text, lines, delim)
+
+    if parsed is not None:
+        labels.extend(parsed[0])
+        data.extend(parsed[1])
+        return
+
+    for row in _parse_lines(lines, delim):
+        if isinstance(row, _LabeledRow):
+            data.append(row.data)
+            labels.append(row.label)
+
+
+def _parse_body(
+    text: str, lines: list[str], delim: str
+) -> Union[tuple[list[str], list], None]:
+    """Bulk parse regular data lines: one label followed by the same number
+    of numeric values on every line, with the same delimiter.
+
+    Returns (labels, data), or None when the lines need _parse_lines().
+    """
+    # Sniff the delimiter once, every line has to agree with it.
+    sep: Union[str, None]
+    if lines[0].strip().find(delim) > 0:
+        sep = delim
+    elif delim in text:
+        return None
+    elif (
+        "  " in text
+        or "\n " in text
+        or " \n" in text
+        or text.startswith(" ")
+        or text.endswith(" ")
+        or _OTHER_SPACE.search(text)
+    ):
+        # Irregular whitespace, split line by line.
+        sep = None
+    else:
+        sep = " "
+
+    if sep is None:
+        rows = list(map(str.split, lines))
+        widths = set(map(len, rows))
+        tokens = list(chain.from_iterable(rows))
+    else:
+        widths = {count + 1 for count in set(map(str.count, lines, repeat(sep)))}
+        tokens = text.replace("\n", sep).split(sep)
+
+    if len(widths) != 1:
+        return None
+    width = widths.pop()
+    if width < 2:
+        return None
+
+    labels = list(map(str.strip, tokens[::width]))
+    if "" in labels:
+        return None
+
+    try:
+        columns = [list(map(float, tokens[i::width])) for i in range(1, width)]
+    except ValueError:
+        return None
+
+    return labels, list(map(list, zip(*columns)))
+
+
+def _parse_lines(
+    lines: Iterable[str], delim: str
+) -> Iterator[Union[list[str], _LabeledRow]]:
+    """Parse lines of the termgraph text format.
+
+    Yields the list of category names for category lines and a _LabeledRow
+    for every data line. Blank lines and comments are skipped.
+    """
+    for line in lines:
+        line = line.strip()
+        if line:
+            if not line.startswith("#"):
+                # Line contains categories.
+                if line.startswith("@"):
+                    cols = line.split(delim)
+                    cols[0] = cols[0].replace("@ ", "")
+                    yield cols
+
+                # Line contains label and values.
+                else:
+                    if line.find(delim) > 0:
+                        cols = line.split(delim)
+                        row_delim = delim
+                    else:
+                        cols = line.split()
+                        row_delim = " "
+                    yield _label_row([col.strip() for col in cols], row_delim)
+
+
 def _label_row(row: list[str], delim: str) -> _LabeledRow:
     """Parse a row of data, extracting label and numeric values."""
     data = []
@@ -0,0 +1,205 @@
+"""Calendar heatmap for termgraph - daily values indexed by ordinal day."""
+
+from __future__ import annotations
+import re
+from collections import Counter
+from datetime import date
+from typing import Iterable, Mapping, Sequence, Union
+
+from .constants import DAYS
+from .utils import SGREncoder
+
+# Weeks in a panel of the heatmap, one year and a bit.
+WEEKS = 53
+
+# Cells for values above 0, 25%, 50% and 75% of the largest value.
+TICKS = ("░", "▒", "▓", "█")
+
+# Dates in event lines: ISO 8601, or the Common Log Format of access logs.
+_EVENT_DATE = re.compile(r"\d{4}-\d{2}-\d{2}|\[\d{2}/[A-Z][a-z]{2}/\d{4}:")
+
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
+        1,
+    )
+}
+
+
+def parse_day(text: str) -> Union[int, None]:
+    """Return the ordinal day of a YYYY-MM-DD date, None when it isn't one."""
+    if len(text) != 10 or text[4] != "-" or text[7] != "-":
+        return None
+    try:
+        return date(int(text[:4]), int(text[5:7]), int(text[8:])).toordinal()
+    except ValueError:
+        return None
+
+
+def _event_day(key: str) -> Union[int, None]:
+    """Return the ordinal day of a date matched by _EVENT_DATE."""
+    if not key.startswith("["):
+        return parse_day(key)
+
+    # [10/Oct/2000:
+    month = _MONTHS.get(key[4:7])
+    if month is None:
+        return None
+    try:
+        return date(int(key[8:12]), month, int(key[1:3])).toordinal()
+    except ValueError:
+        return None
+
+
+class DailyValues:
+    """Values by day, kept in a dense list indexed from the first day.
+
+    Days are ordinal numbers as returned by date.toordinal(), so the value
+    of any day is found by subtraction. Days without a value are None.
+    """
+
+    def __init__(self, first: int, values: list[Union[float, None]]):
+        """Initialize the days
+
+        :first: Ordinal of the day of values[0]
+        :values: Value of every day from the first one on
+        """
+        self.first = first
+        self.values = values
+
+    @classmethod
+    def from_labels(cls, labels: Sequence[str], values: Iterable[float]) -> DailyValues:
+        """Index values by their YYYY-MM-DD labels.
+
+        Every label is parsed once. The last value of a day wins and labels
+        that aren't dates are skipped.
+        """
+        days: dict[int, float] = {}
+        for label, value in zip(labels, values):
+            day = parse_day(label)
+            if day is not None:
+                days[day] = value
+        return cls._from_days(days)
+
+    @classmethod
+    def from_events(cls, lines: Iterable[str]) -> DailyValues:
+        """Count the events of each day in a single pass over the lines.
+
+        Every line is an event on the first date found in it, either ISO
+        like 2024-05-01T12:00:00 or like [01/May/2024:12:00:00 +0000] in
+        web server access logs. Lines without a date are skipped. Only the
+        distinct dates are parsed, after counting.
+        """
+        keys: Counter[str] = Counter()
+        for line in lines:
+            if line[4:5] == "-" and line[7:8] == "-":
+                keys[line[:10]] += 1  # The line starts with an ISO date
+            else:
+                match = _EVENT_DATE.search(line)
+                if match is not None:
+                    keys[match.group()] += 1
+
+        days: Counter[int] = Counter()
+        for key, count in keys.items():
+            day = _event_day(key)
+            if day is not None:
+                days[day] += count
+        return cls._from_days(days)
+
+    @classmethod
+    def _from_days(cls, days: Mapping[int, float]) -> DailyValues:
+        if not days:
+            return cls(0, [])
+
+        first = min(days)
+        values: list[Union[float, None]] = [None] * (max(days) - first + 1)
+        for day, value in days.items():
+            values[day - first] = value
+        return cls(first, values)
+
+    @property
+    def last(self) -> int:
+        """Ordinal of the last day with a value."""
+        return self.first + len(self.values) - 1
+
+    def __getitem__(self, day: int) -> Union[float, None]:
+        index = day - self.first
+        if 0 <= index < len(self.values):
+            return self.values[index]
+        return None
+
+    def max(self) -> float:
+        """Return the largest value."""
+        return float(max(value for value in self.values if value is not None))
+
+
+def render_heatmap(
+    days: DailyValues,
+    start: int,
+    end: int,
+    color: Union[int, None] = None,
+    custom_tick: str = "",
+) -> str:
+    """Return the heatmap of the days from start to end.
+
+    Weeks are columns, starting on the Monday on or before start. Every
+    53 weeks a new panel is started below the last one, with its year in
+    the corner, so a range of several years is drawn as stacked years.
+
+    :days: The values to draw
+    :start: Ordinal of the first day to draw
+    :end: Ordinal of the last day to draw
+    :color: ANSI color code of the cells
+    :custom_tick: Draw every cell above 0 with this instead of shades
+    """
+    ticks = (custom_tick,) * 4 if custom_tick else TICKS
+    max_val = days.max() if days.values else 0.0
+    levels = (max_val * 0.75, max_val * 0.50, max_val * 0.25)
+
+    def cell(value: Union[float, None]) -> str:
+        if value is None:
+            return " "
+        if value > levels[0]:
+            return ticks[3]
+        if value > levels[1]:
+            return ticks[2]
+        if value > levels[2]:
+            return ticks[1]
+        # show nothing if value is zero
+        if value == 0.0:
+            return " "
+        return ticks[0]
+
+    monday = start - date.fromordinal(start).weekday()
+    panels = max(-(-(end - monday + 1) // (WEEKS * 7)), 1)
+    buf: list[str] = []
+
+    for panel in range(panels):
+        first = monday + panel * WEEKS * 7
+        weeks = min(WEEKS, -(-(end - first + 1) // 7))
+        first_dt = date.fromordinal(first)
+
+        if panel:
+            buf.append("\n")
+
+        # top legend for months
+        buf.append(f"{first_dt.year:<5}" if panels > 1 else "     ")
+        month_start = date(first_dt.year, first_dt.month, 1).toordinal()
+        for month in range(-(-weeks * 7 // 31) + 1):
+            buf.append(date.fromordinal(month_start + month * 31).strftime("%b") + " ")
+            if custom_tick:  # assume custom tick is emoji which is one wider
+                buf.append(" ")
+        buf.append("\n")
+
+        for weekday in range(7):
+            buf.append(DAYS[weekday] + ": ")
+            # One escape before the first cell and one after the last.
+            sgr = SGREncoder()
+            for week in range(weeks):
+                day = first + weekday + week * 7
+                tick = cell(days[day]) if day <= end else " "
+                buf.append(sgr.paint(tick, color))
+            buf.append(sgr.reset() + "\n")
+
+    return "".join(buf)
@@ -0,0 +1,248 @@
+"""Follow mode for termgraph - redraws a chart in place as data streams in."""
+
+from __future__ import annotations
+import re
+import shutil
+import sys
+import threading
+import time
+from typing import Callable, Iterable, Iterator, TextIO, Union
+
+from .chart import Chart
+from .constants import DELIM
+from .data import Data, _parse_lines
+
+# ANSI escape sequences used for redrawing
+HIDE_CURSOR = "\033[?25l"
+SHOW_CURSOR = "\033[?25h"
+CLEAR_SCREEN = "\033[H\033[2J"
+CLEAR_LINE = "\033[2K"
+CLEAR_BELOW = "\033[J"
+
+_ESCAPE = re.compile(r"\033\[[0-9;?]*[A-Za-z]")
+
+
+class LiveRenderer:
+    """Diffing renderer that redraws a chart in place.
+
+    It remembers the lines of the frame on screen and, for the next frame,
+    only rewrites the lines that changed, moving the cursor over the others.
+    """
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.size: Union[tuple[int, int], None] = None
+
+    def frame(self, text: str, size: Union[tuple[int, int], None] = None) -> str:
+        """Return the output that turns the frame on screen into text.
+
+        :text: The rendered chart
+        :size: Terminal (columns, lines), looked up when not given
+        :returns: Escape sequences and changed lines to write
+        """
+        if size is None:
+            size = _terminal_size()
+
+        lines = text.split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+
+        # Lines scrolled off the top can't be reached with the cursor anymore.
+        lines = lines[: max(size[1] - 1, 1)]
+
+        buf: list[str] = []
+
+        if self.size is not None and size != self.size:
+            # The terminal reflows on resize, start over from a clean screen.
+            buf.append(CLEAR_SCREEN)
+            self.lines = []
+        elif self.lines:
+            # Back to the first line of the frame on screen.
+            buf.append(f"\033[{len(self.lines)}F")
+
+        self.size = size
+
+        skip = 0
+        for i, line in enumerate(lines):
+            if i < len(self.lines) and self.lines[i] == line:
+                skip += 1
+                continue
+
+            if skip:
+                buf.append(f"\033[{skip}E")
+                skip = 0
+            buf.append(f"{CLEAR_LINE}{line}\n")
+
+        if skip:
+            buf.append(f"\033[{skip}E")
+
+        if len(lines) < len(self.lines):
+            buf.append(CLEAR_BELOW)
+
+        self.lines = lines
+        return "".join(buf)
+
+
+class _Feed:
+    """Reads rows on a background thread, the latest values of a label win."""
+
+    def __init__(self, lines: Iterable[str], delim: str):
+        self.rows: dict[str, list[float]] = {}
+        self.categories: list[str] = []
+        self.lock = threading.Lock()
+        self.changed = threading.Event()
+        self.done = threading.Event()
+
+        self._thread = threading.Thread(
+            target=self._read, args=(lines, delim), daemon=True
+        )
+        self._thread.start()
+
+    def _read(self, lines: Iterable[str], delim: str) -> None:
+        try:
+            for line in lines:
+                try:
+                    rows = list(_parse_lines([line], delim))
+                except ValueError:
+                    continue  # Skip lines that can't be parsed
+
+                with self.lock:
+                    for row in rows:
+                        if isinstance(row, list):
+                            self.categories = row
+                        elif self._fits(row.data):
+                            self.rows[row.label] = row.data
+                self.changed.set()
+        finally:
+            self.done.set()
+            self.changed.set()
+
+    def _fits(self, values: list[float]) -> bool:
+        """Only keep rows with as many values as the first one."""
+        if not values:
+            return False
+        for first in self.rows.values():
+            return len(first) == len(values)
+        return True
+
+    def snapshot(self) -> Union[Data, None]:
+        """Return the current rows as Data, None before the first row."""
+        with self.lock:
+            if not self.rows:
+                return None
+            return Data(
+                [list(values) for values in self.rows.values()],
+                list(self.rows),
+                list(self.categories),
+            )
+
+
+def _tail(f: TextIO, poll_interval: float) -> Iterator[str]:
+    """Yield complete lines of a file, waiting for more at the end."""
+    pending = ""
+    while True:
+        line = f.readline()
+        if not line:
+            time.sleep(poll_interval)
+            continue
+
+        pending += line
+        if pending.endswith("\n"):
+            yield pending
+            pending = ""
+
+
+def _terminal_size() -> tuple[int, int]:
+    size = shutil.get_terminal_size()
+    return size.columns, size.lines
+
+
+def _visible_len(line: str) -> int:
+    return len(_ESCAPE.sub("", line))
+
+
+def render_fitted(
+    make_chart: Callable[[Data, int], Chart], data: Data, width: int, columns: int
+) -> str:
+    """Render a chart, narrowing the bars until no line wraps."""
+    while True:
+        text = make_chart(data, width).render()
+        overflow = max(map(_visible_len, text.split("\n"))) - columns
+        if overflow <= 0 or width <= 1:
+            return text
+        width = max(width - overflow, 1)
+
+
+def follow(
+    filename: str,
+    args: dict,
+    make_chart: Callable[[Data, int], Chart],
+    out: Union[TextIO, None] = None,
+    max_fps: float = 10.0,
+    poll_interval: float = 0.25,
+) -> None:
+    """Read data continuously and keep a chart up to date in place.
+
+    Stdin is read until it is closed, a file is followed like `tail -f`
+    until interrupted. A row whose label was seen before replaces it.
+
+    Frames are drawn at most max_fps times a second: updates arriving in
+    between are coalesced into the next frame, and when writing a frame
+    takes longer than the frame interval the interval is stretched, which
+    drops the frames the terminal could not keep up with.
+
+    :filename: Path to data file, or "-" for stdin
+    :args: Dictionary of arguments including optional "delim" and "width"
+    :make_chart: Called with the Data and the bar width, returns the chart
+    :out: Terminal to draw on, defaults to sys.stdout
+    """
+    out = out if out is not None else sys.stdout
+    width = args.get("width") or 50
+    min_interval = 1.0 / max_fps
+
+    f = None
+    if filename == "-":
+        lines: Iterable[str] = sys.stdin
+    else:
+        f = open(filename, "r")
+        lines = _tail(f, poll_interval)
+
+    feed = _Feed(lines, args.get("delim") or DELIM)
+    renderer = LiveRenderer()
+    interval = min_interval
+    last_frame = 0.0
+
+    out.write(HIDE_CURSOR)
+    try:
+        while True:
+            changed = feed.changed.wait(poll_interval)
+            size = _terminal_size()
+            if not changed and size == renderer.size:
+                continue
+
+            # Let a burst of updates land in one frame.
+            delay = last_frame + interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            feed.changed.clear()
+            done = feed.done.is_set()
+
+            data = feed.snapshot()
+            if data is not None:
+                started = time.monotonic()
+                text = render_fitted(make_chart, data, width, size[0])
+                out.write(renderer.frame(text, size))
+                out.flush()
+                last_frame = time.monotonic()
+                interval = max(min_interval, last_frame - started)
+
+            if done:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        out.write(SHOW_CURSOR)
+        out.flush()
+        if f is not None:
+            f.close()
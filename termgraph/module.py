@@ -3,10 +3,36 @@
 # termgraph.py - draw basic graphs on terminal
 # https://github.com/mkaz/termgraph
 
-# Import all classes from their dedicated files to maintain backward compatibility
-from .data import Data
-from .args import Args
-from .chart import Colors, Chart, HorizontalChart, BarChart, StackedChart, HistogramChart
+# Re-export everything to maintain backward compatibility, the classes are
+# imported from their dedicated files on first use.
+from typing import TYPE_CHECKING
 
-# Re-export everything to maintain existing API
-__all__ = ['Data', 'Args', 'Colors', 'Chart', 'HorizontalChart', 'BarChart', 'StackedChart', 'HistogramChart']
+if TYPE_CHECKING:
+    from .args import Args
+    from .chart import (
+        BarChart,
+        Chart,
+        Colors,
+        HistogramChart,
+        HorizontalChart,
+        LineChart,
+        ScatterChart,
+        SparklineChart,
+        StackedChart,
+    )
+    from .data import Data
+
+__all__ = ['Data', 'Args', 'Colors', 'Chart', 'HorizontalChart', 'BarChart', 'StackedChart', 'HistogramChart', 'SparklineChart', 'LineChart', 'ScatterChart']
+
+
+def __getattr__(name):
+    if name == "Data":
+        from .data import Data
+        return Data
+    elif name == "Args":
+        from .args import Args
+        return Args
+    elif name in __all__:
+        from . import chart
+        return getattr(chart, name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -0,0 +1,157 @@
+"""Profiling for termgraph - times the phases of reading and drawing a chart."""
+
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+# The profiler measuring the current run, None when not profiling. The
+# instrumented code checks it before doing any work, so profiling costs
+# next to nothing when it is off.
+active: Union[Profiler, None] = None
+
+REPORT_FORMATS = ("human", "json")
+
+
+class Profiler:
+    """Collects the wall time of phases, counters and the peak memory.
+
+    Used as a context manager, the profiler is active while the block runs
+    and Data and the charts report to it:
+
+        with Profiler() as profiler:
+            data = Data.from_file("data.dat", {})
+            BarChart(data, args).draw()
+        print(profiler.report())
+
+    Phases are read, parse, normalize, render, format and write. Phases
+    can nest, format runs inside render, so their times overlap. The
+    phases of worker processes are merged in, added up over the processes.
+    """
+
+    def __init__(self, memory: bool = False):
+        """Initialize the profiler
+
+        :memory: Trace the memory allocations with tracemalloc for the peak
+                 memory, which makes allocating code several times slower
+        """
+        self.memory = memory
+        self.phases: dict[str, list] = {}
+        self.counters: dict[str, int] = {}
+        self.peak_memory: Union[int, None] = None
+        self.total = 0.0
+        self._depth = 0
+        self._start = 0.0
+        self._previous: Union[Profiler, None] = None
+
+    def __enter__(self) -> Profiler:
+        global active
+        self._previous, active = active, self
+        if self.memory:
+            import tracemalloc
+
+            tracemalloc.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global active
+        self.total += time.perf_counter() - self._start
+        if self.memory:
+            import tracemalloc
+
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        active = self._previous
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the time spent in the block to the phase."""
+        stats = self.phases.get(name)
+        if stats is None:
+            # seconds, calls and nesting depth of the first call
+            stats = self.phases[name] = [0.0, 0, self._depth]
+
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats[0] += time.perf_counter() - start
+            stats[1] += 1
+            self._depth -= 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add n to the counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other: Profiler) -> None:
+        """Add the phases and counters of another profiler, like the one of
+        a worker process, nested in the current phase.
+
+        The peak memory is the highest of the two.
+        """
+        for name, (seconds, calls, depth) in other.phases.items():
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = [0.0, 0, self._depth + depth]
+            stats[0] += seconds
+            stats[1] += calls
+        for name, value in other.counters.items():
+            self.count(name, value)
+        if other.peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, other.peak_memory)
+
+    def __getstate__(self) -> dict:
+        # Sent back by worker processes, without the profiler around it.
+        return dict(self.__dict__, _previous=None)
+
+    def as_dict(self) -> dict:
+        """Return the measurements, times in milliseconds."""
+        return {
+            "total_ms": self.total * 1000,
+            "phases": {
+                name: {"ms": seconds * 1000, "calls": calls}
+                for name, (seconds, calls, _) in self.phases.items()
+            },
+            "counters": dict(self.counters),
+            "peak_memory_bytes": self.peak_memory,
+        }
+
+    def report(self, format: str = "human") -> str:
+        """Return the measurements as a table, or as JSON."""
+        if format == "json":
+            import json
+
+            return json.dumps(self.as_dict()) + "\n"
+        if format != "human":
+            raise Exception(f"Unknown report format: {format}")
+
+        lines = [f"{'phase':<14}{'ms':>10}{'calls':>9}"]
+        for name, (seconds, calls, depth) in self.phases.items():
+            name = "  " * depth + name
+            lines.append(f"{name:<14}{seconds * 1000:>10.3f}{calls:>9}")
+        lines.append(f"{'total':<14}{self.total * 1000:>10.3f}")
+
+        lines.append("")
+        for name, value in self.counters.items():
+            lines.append(f"{name:<14}{value:>10}")
+        if self.peak_memory is not None:
+            lines.append(f"{'peak memory':<14}{self.peak_memory / 1024:>10.1f} KiB")
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the block as the phase of the active profiler, if any."""
+    if active is None:
+        yield
+    else:
+        with active.phase(name):
+            yield
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to the counter of the active profiler, if any."""
+    if active is not None:
+        active.count(name, n)
@@ -0,0 +1,239 @@
+"""Render server for termgraph - draws charts for clients over a Unix socket.
+
+Starting Python and importing the charts takes longer than drawing most
+charts. "termgraph --serve" keeps a pool of worker processes with the
+modules loaded, and "termgraph --client", or any termgraph run with the
+TERMGRAPH_SERVER environment variable set, sends its arguments to one of
+them and prints the chart it gets back. The client and the messages are
+in termgraph.client.
+"""
+
+from __future__ import annotations
+import io
+import os
+import socket
+import sys
+from typing import Union
+
+from .client import check_directory, parse_request, receive, send
+
+
+def serve(path: str, jobs: Union[int, None] = None) -> None:
+    """Draw the charts of the clients connecting to the socket, until interrupted.
+
+    :path: The socket to listen on, removed when the server stops
+    :jobs: Worker processes drawing charts at the same time, defaults to
+           the number of CPUs
+    """
+    import signal
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.mkdir(directory, 0o700)
+    check_directory(directory)
+
+    if os.path.exists(path):
+        if _listening(path):
+            raise Exception(f"A termgraph server is already listening on {path}")
+        os.unlink(path)  # left behind by a server that was killed
+
+    # The workers draw the charts themselves, they never forward them.
+    os.environ.pop("TERMGRAPH_SERVER", None)
+    _warm_up()
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Created 0600 right away, there's no moment others could connect.
+    umask = os.umask(0o177)
+    try:
+        listener.bind(path)
+    finally:
+        os.umask(umask)
+    listener.listen(128)
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    workers: set[int] = set()
+    try:
+        while True:
+            while len(workers) < (jobs or os.cpu_count() or 1):
+                pid = os.fork()
+                if pid == 0:
+                    _work(listener)
+                workers.add(pid)
+            # Workers only exit on errors, replace them.
+            pid, _ = os.wait()
+            workers.discard(pid)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        listener.close()
+        os.unlink(path)
+
+
+def _listening(path: str) -> bool:
+    """Return whether a server listens on the socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+    return True
+
+
+def _warm_up() -> None:
+    """Import the modules the charts use, for every worker to inherit."""
+    import datetime  # noqa: F401
+
+    from . import canvas, chart, heatmap, live, sketch  # noqa: F401
+    from .data import _numpy
+    from .termgraph import _parser
+
+    _numpy()
+    _parser()
+
+
+def _work(listener: socket.socket) -> None:
+    """Serve requests in a worker process, never returns."""
+    import signal
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    status = 0
+    try:
+        while True:
+            conn, _ = listener.accept()
+            with conn:
+                try:
+                    _handle(conn)
+                except OSError:
+                    pass  # the client went away
+    except KeyboardInterrupt:
+        pass
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        status = 1
+    finally:
+        os._exit(status)
+
+
+def _handle(conn: socket.socket) -> None:
+    """Run termgraph with the arguments, input and output of the client."""
+    from .termgraph import run
+
+    kind, payload = receive(conn)
+    if kind != b"R":
+        return
+    request = parse_request(payload)
+
+    # The size of the terminal of the client, unless set in its environment
+    env: dict[str, Union[str, None]] = {
+        "COLUMNS": request["columns"],
+        "LINES": request["lines"],
+        "NO_COLOR": None,
+    }
+    env.update(request["env"])
+    for name, value in env.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    os.chdir(request["cwd"])
+
+    tty = bool(request["stdout_tty"])
+    stdout = _client_stream(conn, b"O", tty)
+    stderr = _client_stream(conn, b"E", tty)
+    saved = sys.argv, sys.stdin, sys.stdout, sys.stderr
+    sys.argv = ["termgraph"] + request["argv"]
+    sys.stdin = _ClientStdin(conn, bool(request["stdin_tty"]))  # type: ignore[assignment]
+    sys.stdout, sys.stderr = stdout, stderr
+
+    try:
+        run()
+        status = 0
+    except SystemExit as exit:
+        if exit.code is None or isinstance(exit.code, int):
+            status = exit.code or 0
+        else:
+            print(exit.code, file=sys.stderr)
+            status = 1
+    except Exception:
+        import traceback
+
+        traceback.print_exc()
+        status = 1
+    finally:
+        sys.argv, sys.stdin, sys.stdout, sys.stderr = saved
+        for stream in (stdout, stderr):
+            try:
+                stream.flush()
+            except OSError:
+                pass
+
+    send(conn, b"X", str(status).encode())
+
+
+class _ClientWriter(io.RawIOBase):
+    """Raw stream sending what is written to the client as frames of a kind."""
+
+    def __init__(self, conn: socket.socket, kind: bytes, tty: bool):
+        self.conn = conn
+        self.kind = kind
+        self.tty = tty
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def write(self, data) -> int:
+        send(self.conn, self.kind, bytes(data))
+        return len(data)
+
+
+def _client_stream(conn: socket.socket, kind: bytes, tty: bool) -> io.TextIOWrapper:
+    """Return a text stream writing to the client, buffered up to 64 KiB."""
+    buffer = io.BufferedWriter(_ClientWriter(conn, kind, tty), 1 << 16)
+    return io.TextIOWrapper(buffer, encoding="utf-8", line_buffering=False)
+
+
+class _ClientStdin:
+    """Stdin of the client, asked for on first use.
+
+    Charts of files never read stdin, so their clients aren't asked for it.
+    """
+
+    def __init__(self, conn: socket.socket, tty: bool):
+        self.conn = conn
+        self.tty = tty
+        self._stream: Union[io.TextIOWrapper, None] = None
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+
+    def _fetch(self) -> io.TextIOWrapper:
+        if self._stream is None:
+            send(self.conn, b"I", b"")
+            kind, payload = receive(self.conn)
+            if kind != b"I":
+                raise Exception(f"Expected stdin from the client, not {kind!r}")
+            self._stream = io.TextIOWrapper(io.BytesIO(payload), encoding="utf-8")
+        return self._stream
+
+    def __iter__(self):
+        return iter(self._fetch())
+
+    def __getattr__(self, name: str):
+        return getattr(self._fetch(), name)
@@ -0,0 +1,164 @@
+"""Quantile sketch for termgraph - summarizes unbounded input in bounded memory."""
+
+from __future__ import annotations
+import math
+import random
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, islice
+from typing import Iterable, Union
+
+
+class KLLSketch:
+    """Mergeable quantile sketch after Karnin, Lang and Liberty (KLL).
+
+    Values are kept in a stack of compactors. Level h holds values that
+    stand for 2**h inputs each. When a level fills up it is sorted and every
+    other value, starting at a random offset, is promoted to the level
+    above while the rest is dropped. The total number of kept values stays
+    around 3 * k no matter how many values are added.
+
+    Error bound: the rank of a value, and so the count in a range, is off
+    by at most about 1.65% of the number of values added for k=200, with
+    99% confidence. The error shrinks in proportion to 1/k. The minimum,
+    the maximum and the number of values are exact.
+    """
+
+    def __init__(self, k: int = 200, seed: Union[int, None] = None):
+        """Initialize the sketch
+
+        :k: Capacity of the top compactor, larger is more accurate
+        :seed: Seed for the random compaction offsets, for repeatable results
+        """
+        if k < 8:
+            raise Exception("k must be at least 8")
+
+        self.k = k
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.compactors: list[list[float]] = [[]]
+        self._random = random.Random(seed)
+        self._size = 0
+        self._max_size = self._capacity(0)
+        self._sorted: Union[tuple[list[float], list[int]], None] = None
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(int(self.k * (2 / 3) ** depth), 2)
+
+    def update(self, value: float) -> None:
+        """Add a value to the sketch."""
+        self.compactors[0].append(value)
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        self._size += 1
+        self._sorted = None
+        if self._size >= self._max_size:
+            self._compress()
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Add all the values to the sketch."""
+        values = iter(values)
+        while True:
+            # Fill the sketch up in one go, then compact.
+            batch = list(islice(values, max(self._max_size - self._size, 1)))
+            if not batch:
+                return
+
+            self.compactors[0].extend(batch)
+            self.count += len(batch)
+            self.min = min(self.min, min(batch))
+            self.max = max(self.max, max(batch))
+
+            self._size += len(batch)
+            self._sorted = None
+            if self._size >= self._max_size:
+                self._compress()
+
+    def merge(self, other: KLLSketch) -> None:
+        """Add the values summarized by another sketch to this one."""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        self._size = sum(map(len, self.compactors))
+        self._sorted = None
+        while self._size >= self._max_size:
+            self._compress()
+
+    def _grow(self) -> None:
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _compress(self) -> None:
+        """Compact every level that is over its capacity, lowest first."""
+        for level, items in enumerate(self.compactors):
+            if len(items) < self._capacity(level):
+                continue
+
+            if level + 1 == len(self.compactors):
+                self._grow()
+
+            items.sort()
+            # An odd value out stays at this level.
+            leftover = [items.pop()] if len(items) % 2 else []
+            self.compactors[level + 1].extend(items[self._random.random() < 0.5 :: 2])
+            items[:] = leftover
+
+        self._size = sum(map(len, self.compactors))
+
+    def _weighted(self) -> tuple[list[float], list[int]]:
+        """Return the kept values in order and their cumulative weights."""
+        if self._sorted is None:
+            pairs = sorted(
+                (value, 1 << level)
+                for level, items in enumerate(self.compactors)
+                for value in items
+            )
+            values = [value for value, _ in pairs]
+            weights = list(accumulate(weight for _, weight in pairs))
+            self._sorted = (values, weights)
+        return self._sorted
+
+    def rank(self, value: float, inclusive: bool = False) -> int:
+        """Return about how many values are smaller than value.
+
+        :inclusive: Count the values equal to value too
+        """
+        values, weights = self._weighted()
+        index = (bisect_right if inclusive else bisect_left)(values, value)
+        return weights[index - 1] if index else 0
+
+    def quantile(self, q: float) -> float:
+        """Return about the smallest value with a fraction q of the values at or below it."""
+        if not self.count:
+            raise Exception("No data provided")
+        if not 0 <= q <= 1:
+            raise Exception("The quantile must be between 0 and 1")
+
+        values, weights = self._weighted()
+        if q == 0:
+            return self.min
+
+        # Compaction keeps the total weight equal to the number of values.
+        index = bisect_left(weights, q * self.count)
+        return min(max(values[min(index, len(values) - 1)], self.min), self.max)
+
+    def bin_counts(self, borders: list[float]) -> list[int]:
+        """Return about how many values fall in each bin.
+
+        Bin i holds the values v with borders[i] <= v < borders[i + 1], like
+        termgraph.data.bin_counts() does for exact data.
+        """
+        ranks = [self.rank(border) for border in borders]
+        return [end - start for start, end in zip(ranks, ranks[1:])]
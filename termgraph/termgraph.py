@@ -1,31 +1,70 @@
 from __future__ import annotations
 import argparse
+import functools
 import sys
-from datetime import datetime, timedelta
-from colorama import just_fix_windows_console
 import os
 import re
-import importlib.metadata
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Callable, Iterator, TextIO, TypeVar, Union
 
-from .constants import AVAILABLE_COLORS, DAYS
-from .data import Data
+from .constants import AVAILABLE_COLORS
+from .data import DOWNSAMPLE_METHODS, Data
+from . import profiling
+from .profiling import REPORT_FORMATS
 from .args import Args
-from .chart import Chart, BarChart, StackedChart, HistogramChart, VerticalChart
+from .utils import write_output
 
-__version__ = importlib.metadata.version("termgraph")
+if TYPE_CHECKING:
+    from .chart import Chart
 
-# colorama
-just_fix_windows_console()
+T = TypeVar("T")
+
+# Startup time matters when termgraph is called from scripts, so modules only
+# some of the charts need are imported by the functions using them.
+
+
+def __getattr__(name: str):
+    if name == "__version__":
+        return _version()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def _version() -> str:
+    """Return the installed version, importlib.metadata is slow to import."""
+    import importlib.metadata
+
+    return importlib.metadata.version("termgraph")
 
 
 def init_args() -> dict:
     """Parse and return the arguments."""
+    parser = _parser()
+
+    if len(sys.argv) == 1:
+        if sys.stdin.isatty():
+            parser.print_usage()
+            sys.exit(2)
+
+    args = vars(parser.parse_args())
+
+    # The charts of several files are drawn one after the other.
+    args["filenames"] = _expand_globs(args["filename"])
+    args["filename"] = args["filenames"][0]
+    args["spark"] = args["spark"] or args["spark_rows"]
+    args["calendar"] = args["calendar"] or args["events"]
+
+    return args
+
+
+@functools.lru_cache(maxsize=None)
+def _parser() -> argparse.ArgumentParser:
+    """Return the argument parser, built once and kept by the render server."""
     parser = argparse.ArgumentParser(description="draw basic graphs on terminal")
     parser.add_argument(
         "filename",
-        nargs="?",
-        default="-",
-        help="data file name (comma or space separated). Defaults to stdin.",
+        nargs="*",
+        default=["-"],
+        help="data file names or glob patterns, space separated. Defaults to stdin.",
     )
     parser.add_argument("--title", help="Title of graph")
     parser.add_argument(
@@ -47,9 +86,42 @@ def init_args() -> dict:
         help="Print a new line after every field",
     )
     parser.add_argument("--color", nargs="*", help="Graph bar color( s )")
+    parser.add_argument(
+        "--color-mode",
+        choices=["auto", "always", "never"],
+        default="auto",
+        help="Color the output, auto: only on a terminal without NO_COLOR set",
+    )
     parser.add_argument("--vertical", action="store_true", help="Vertical graph")
+    parser.add_argument(
+        "--window",
+        type=int,
+        help="Split vertical graphs wider than this many characters into panels",
+    )
     parser.add_argument("--stacked", action="store_true", help="Stacked bar graph")
     parser.add_argument("--histogram", action="store_true", help="Histogram")
+    parser.add_argument(
+        "--spark",
+        action="store_true",
+        help="Sparklines, one line per category fitted to the width",
+    )
+    parser.add_argument(
+        "--spark-rows",
+        action="store_true",
+        help="Sparklines of the values of each row, implies --spark",
+    )
+    parser.add_argument(
+        "--line", action="store_true", help="Line chart drawn with braille dots"
+    )
+    parser.add_argument(
+        "--scatter", action="store_true", help="Scatter plot drawn with braille dots"
+    )
+    parser.add_argument(
+        "--height",
+        type=int,
+        default=10,
+        help="height of line and scatter charts in lines default:10",
+    )
     parser.add_argument("--bins", default=5, type=int, help="Bins of Histogram")
     parser.add_argument(
         "--different-scale",
@@ -60,21 +132,149 @@ def init_args() -> dict:
         "--calendar", action="store_true", help="Calendar Heatmap chart"
     )
     parser.add_argument("--start-dt", help="Start date for Calendar chart")
+    parser.add_argument(
+        "--end-dt",
+        help="End date for Calendar chart, longer ranges are stacked by year",
+    )
+    parser.add_argument(
+        "--events",
+        action="store_true",
+        help="Calendar of the number of input lines per day, implies --calendar",
+    )
     parser.add_argument(
         "--custom-tick", default="", help="Custom tick mark, emoji approved"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Processes parsing several input files, or drawing charts with "
+        "--serve, default: number of CPUs",
+    )
+    parser.add_argument(
+        "--shared-scale",
+        action="store_true",
+        help="Draw the charts of several input files to the same scale",
+    )
+    parser.add_argument(
+        "--binary",
+        metavar="FORMAT",
+        help='Read packed binary records with this struct format, e.g. "<d d"',
+    )
+    parser.add_argument(
+        "--labels",
+        metavar="FILE",
+        help="Labels of binary or .npy input, one per line, default: row numbers",
+    )
+    parser.add_argument(
+        "--categories",
+        nargs="+",
+        metavar="NAME",
+        help="Category names of the columns of binary or .npy input",
+    )
+    parser.add_argument(
+        "--csv",
+        action="store_true",
+        help="Read CSV input, a first row without numbers names the categories",
+    )
+    parser.add_argument(
+        "--label-col",
+        metavar="COL",
+        help="CSV column of the labels, by name or number, default: 1",
+    )
+    parser.add_argument(
+        "--cols",
+        metavar="COLS",
+        help="Comma separated CSV columns to draw, by name or number, default: numeric",
+    )
     parser.add_argument(
         "--delim", default="", help="Custom delimiter, default , or space"
     )
     parser.add_argument(
         "--verbose", action="store_true", help="Verbose output, helpful for debugging"
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time of each phase and counters to stderr",
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=REPORT_FORMATS,
+        help="Format of the --profile report default:human",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Add the peak memory to the --profile report, slows down the run",
+    )
     parser.add_argument(
         "--label-before",
         action="store_true",
         default=False,
         help="Display the values before the bars",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read and draw the input in chunks, bar and stacked charts only",
+    )
+    parser.add_argument(
+        "--scale",
+        nargs=2,
+        type=float,
+        metavar=("MIN", "MAX"),
+        help="Fixed scale for the bars, lets --stream read the input only once",
+    )
+    parser.add_argument(
+        "--label-width", type=int, help="Fixed width of the label column"
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Keep reading the input and redraw the chart in place",
+    )
+    parser.add_argument(
+        "--fps",
+        type=_positive_float,
+        default=10.0,
+        help="Maximum redraws per second with --follow default:10",
+    )
+    parser.add_argument(
+        "--max-points",
+        type=_max_points,
+        metavar="N|auto",
+        help="Aggregate the rows down to N, or to what fits the terminal with auto",
+    )
+    parser.add_argument(
+        "--aggregate",
+        choices=DOWNSAMPLE_METHODS,
+        default="mean",
+        help="How --max-points combines rows default:mean",
+    )
+    parser.add_argument(
+        "--approx",
+        action="store_true",
+        help="Histogram of unbounded input in constant memory, counts are approximate",
+    )
+    parser.add_argument(
+        "--percentiles",
+        action="store_true",
+        help="Print p50, p90 and p99 below a histogram",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Draw the charts of clients connecting to the socket, with --jobs workers",
+    )
+    parser.add_argument(
+        "--client",
+        action="store_true",
+        help="Draw the chart on the server listening on the socket",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Socket of the render server, default: $TERMGRAPH_SERVER or one per user",
+    )
     parser.add_argument(
         "--version", action="store_true", help="Display version and exit"
     )
@@ -85,25 +285,135 @@ def init_args() -> dict:
         "--percentage", action="store_true", help="Display the number in percentage"
     )
 
-    if len(sys.argv) == 1:
-        if sys.stdin.isatty():
-            parser.print_usage()
-            sys.exit(2)
+    return parser
 
-    args = vars(parser.parse_args())
 
-    return args
+def _expand_globs(patterns: list[str]) -> list[str]:
+    """Expand the glob patterns the shell left alone, in sorted order."""
+    import glob
+
+    filenames = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else []
+        # Patterns matching nothing are reported as missing files later.
+        filenames.extend(matches or [pattern])
+    return filenames
+
+
+def _max_points(value: str) -> Union[int, str]:
+    """Parse the --max-points value, a positive number or "auto"."""
+    if value == "auto":
+        return value
+    try:
+        points = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid value: '{value}'")
+    if points < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return points
+
+
+def _positive_float(value: str) -> float:
+    """Parse a number that must be above 0, like the --fps value."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid value: '{value}'")
+    if not number > 0:
+        raise argparse.ArgumentTypeError("must be above 0")
+    return number
 
 
 def main():
     """Main function."""
+    from .client import forward_argv
+
+    status = forward_argv(sys.argv[1:])
+    if status is not None:
+        sys.exit(status)
+    run()
+
+
+def run():
+    """Draw the chart of the command line arguments."""
     args = init_args()
 
     if args["version"]:
-        print(f"termgraph v{__version__}")
+        print(f"termgraph v{_version()}")
         sys.exit()
 
+    if args["serve"]:
+        from .client import default_socket
+        from .server import serve
+
+        serve(args["socket"] or default_socket(), args["jobs"])
+        return
+    if args["client"]:
+        # Only reached with an abbreviated --client
+        print(">> Error: --client can't be abbreviated")
+        sys.exit(2)
+
+    # Decided once, for the worker processes drawing several files too.
+    args["color_mode"] = "always" if _colored(args) else "never"
+
+    if args["profile"] or args["profile_format"] or args["profile_memory"]:
+        from .profiling import Profiler
+
+        with Profiler(memory=args["profile_memory"]) as profiler:
+            _draw(args)
+        sys.stderr.write(profiler.report(args["profile_format"] or "human"))
+    else:
+        _draw(args)
+
+
+def _draw(args: dict) -> None:
+    """Read the input and draw the chart chosen by the arguments."""
+    if len(args.get("filenames") or []) > 1:
+        try:
+            multi_chart(args)
+        except BrokenPipeError:
+            pass
+        return
+
+    other_format = (
+        args.get("binary")
+        or args["filename"].endswith(".npy")
+        or args.get("csv")
+        or args.get("label_col")
+        or args.get("cols")
+    )
+    if other_format and (args["follow"] or args["stream"] or args["approx"]):
+        print(">> Error: --follow, --stream and --approx only read the termgraph format")
+        sys.exit(2)
+
+    if args["follow"]:
+        follow_chart(args)
+        return
+
+    if args["approx"]:
+        try:
+            approx_chart(args)
+        except BrokenPipeError:
+            pass
+        return
+
+    if args["stream"]:
+        try:
+            stream_chart(args)
+        except BrokenPipeError:
+            pass
+        return
+
+    if args.get("events"):
+        try:
+            events_calendar(args)
+        except BrokenPipeError:
+            pass
+        return
+
     data_obj = Data.from_file(args["filename"], args)
+    if args.get("max_points") and not _fits_width(args):
+        data_obj = downsample(data_obj, args)
     colors = _extract_colors(data_obj, args)
 
     try:
@@ -118,19 +428,33 @@ def main():
 
 def chart(data_obj: Data, args: dict, colors: list) -> None:
     """Handle the normalization of data and the printing of the graph."""
-    # Convert CLI args dict to chart Args class, mapping incompatible keys
-    chart_args_dict = dict(args)
-    if "color" in chart_args_dict:
-        chart_args_dict["colors"] = chart_args_dict.pop("color")
+    _make_chart(data_obj, args, colors).render(sys.stdout)
 
-    # Remove CLI-specific args that don't belong in chart Args
-    cli_only_args = ["filename", "delim", "verbose", "version"]
-    for cli_arg in cli_only_args:
-        chart_args_dict.pop(cli_arg, None)
 
-    chart_args = Args(**chart_args_dict)
-    if colors:
-        chart_args.update_args(colors=colors)
+def _fits_width(args: dict) -> bool:
+    """Return whether the chart fits any number of rows in its size itself."""
+    return bool(
+        args["histogram"]
+        or args["calendar"]
+        or args["spark"]
+        or args["line"]
+        or args["scatter"]
+    )
+
+
+def _make_chart(data_obj: Data, args: dict, colors: list) -> Chart:
+    """Return the chart chosen by the arguments."""
+    from .chart import (
+        BarChart,
+        HistogramChart,
+        LineChart,
+        ScatterChart,
+        SparklineChart,
+        StackedChart,
+        VerticalChart,
+    )
+
+    chart_args = _chart_args(args, colors)
 
     # Choose chart type
     chart_obj: Chart
@@ -138,12 +462,322 @@ def chart(data_obj: Data, args: dict, colors: list) -> None:
         chart_obj = StackedChart(data_obj, chart_args)
     elif args["histogram"]:
         chart_obj = HistogramChart(data_obj, chart_args)
+    elif args["spark"]:
+        chart_obj = SparklineChart(data_obj, chart_args)
+    elif args["line"]:
+        chart_obj = LineChart(data_obj, chart_args)
+    elif args["scatter"]:
+        chart_obj = ScatterChart(data_obj, chart_args)
     elif args["vertical"]:
         chart_obj = VerticalChart(data_obj, chart_args)
     else:
         chart_obj = BarChart(data_obj, chart_args)
 
-    chart_obj.draw()
+    return chart_obj
+
+
+def multi_chart(args: dict) -> None:
+    """Draw a chart of every input file, one after the other.
+
+    The files are read and their charts rendered in parallel by a pool of
+    processes, and written in the order of the files as they are ready.
+    With --shared-scale the files are scanned first, and all charts drawn
+    to the scale of all the data, with aligned labels.
+    """
+    if args["follow"] or args["stream"] or args["approx"] or args.get("events"):
+        print(">> Error: --follow, --stream, --approx and --events read a single file")
+        sys.exit(2)
+
+    filenames = args["filenames"]
+    # Checked before any chart is drawn, the workers can't stop the others.
+    missing = [f for f in filenames if f != "-" and not os.path.exists(f)]
+    if missing:
+        for filename in missing:
+            print(f">> Error: The specified file [{filename}] does not exist.")
+        sys.exit(2)
+
+    jobs = args.get("jobs")
+    # Workers don't share stdin, it is read here.
+    stdin_data = Data.from_file("-", args) if "-" in filenames else None
+
+    if args.get("shared_scale") and not (args["histogram"] or args["calendar"]):
+        file_args = [dict(args, filename=filename) for filename in filenames]
+        scans = list(_map_files(_scan_file, file_args, jobs, stdin_data))
+        if args["scale"] is None:
+            args = dict(args, scale=[min(s[0] for s in scans), max(s[1] for s in scans)])
+        if args["label_width"] is None:
+            args = dict(args, label_width=max(s[2] for s in scans))
+
+    file_args = []
+    for filename in filenames:
+        title = f"{args['title']} ({filename})" if args["title"] else filename
+        file_args.append(dict(args, filename=filename, title=title))
+
+    for text in _map_files(_render_file, file_args, jobs, stdin_data):
+        write_output(text)
+
+
+def _map_files(
+    func: Callable[[dict, Union[Data, None]], T],
+    file_args: list[dict],
+    jobs: Union[int, None],
+    stdin_data: Union[Data, None] = None,
+) -> Iterator[T]:
+    """Yield func(args) for the arguments of every file, in order.
+
+    The calls run in a pool of jobs processes, defaulting to the number of
+    CPUs. The file "-" is handled here with the Data already read.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    remote = [args for args in file_args if args["filename"] != "-"]
+
+    if jobs == 1 or len(remote) < 2:
+        for args in file_args:
+            yield func(args, stdin_data if args["filename"] == "-" else None)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # The workers time their phases themselves, merged into the report here.
+    profiler = profiling.active
+    call: Callable[..., Any] = (
+        func if profiler is None else functools.partial(_call_profiled, func)
+    )
+
+    workers = min(jobs, len(remote))
+    with ProcessPoolExecutor(workers) as pool:
+        results = pool.map(
+            call, remote, chunksize=max(len(remote) // (workers * 4), 1)
+        )
+        for args in file_args:
+            if args["filename"] == "-":
+                yield func(args, stdin_data)
+            elif profiler is None:
+                yield next(results)
+            else:
+                result, worker_profiler = next(results)
+                profiler.merge(worker_profiler)
+                yield result
+
+
+def _call_profiled(
+    func: Callable[[dict, Union[Data, None]], T], args: dict
+) -> tuple[T, profiling.Profiler]:
+    """Return func(args) and the profiler timing it, in a worker process."""
+    with profiling.Profiler(memory=args["profile_memory"]) as profiler:
+        result = func(args, None)
+    return result, profiler
+
+
+def _scan_file(
+    args: dict, data_obj: Union[Data, None] = None
+) -> tuple[Union[int, float], Union[int, float], int]:
+    """Return the minimum, the maximum and the longest label of a file."""
+    if data_obj is None:
+        data_obj = Data.from_file(args["filename"], args)
+    return data_obj.find_min(), data_obj.find_max(), data_obj.find_max_label_length()
+
+
+def _render_file(args: dict, data_obj: Union[Data, None] = None) -> str:
+    """Read a file and return its rendered chart."""
+    if data_obj is None:
+        data_obj = Data.from_file(args["filename"], args)
+    if args.get("max_points") and not _fits_width(args):
+        data_obj = downsample(data_obj, args)
+    colors = _extract_colors(data_obj, args)
+
+    if args["calendar"]:
+        import io
+
+        out = io.StringIO()
+        out.write(f"\n# {args['title']}\n\n")
+        calendar_heatmap(data_obj.data, data_obj.labels, args, out)
+        return out.getvalue()
+    return _make_chart(data_obj, args, colors).render()
+
+
+def stream_chart(args: dict) -> None:
+    """Read the input in chunks and draw a bar or stacked chart as it goes.
+
+    Without --scale the input is read twice, first to find the scale and the
+    label width, then to draw. Stdin is spooled to a temporary file for that.
+    """
+    if args["vertical"] or args["histogram"] or args["calendar"]:
+        print(">> Error: --stream only supports bar and stacked charts")
+        sys.exit(2)
+    if args["different_scale"]:
+        # Every chunk would be scaled to the maxima of its own categories.
+        print(">> Error: --stream doesn't support --different-scale")
+        sys.exit(2)
+
+    from .chart import BarChart, StackedChart
+
+    source: Union[str, TextIO] = args["filename"]
+    spool = None
+
+    try:
+        if args["scale"] is None:
+            if source == "-":
+                import shutil
+                import tempfile
+
+                spool = tempfile.TemporaryFile("w+")
+                shutil.copyfileobj(sys.stdin, spool)
+                spool.seek(0)
+                source = spool
+
+            min_datum, max_datum, label_width = Data.scan_file(source, args)
+            args = dict(args, scale=[min_datum, max_datum], verbose=False)
+            if args["label_width"] is None:
+                args["label_width"] = label_width
+
+            if spool is not None:
+                spool.seek(0)
+
+        chunks = Data.iter_file(source, args)
+        first = next(chunks, None)
+        if first is None:
+            raise Exception("No data provided")
+
+        colors = _extract_colors(first, args)
+        chart_args = _chart_args(args, colors)
+        chart_cls = StackedChart if args["stacked"] else BarChart
+        chart_cls.render_chunks(chain([first], chunks), chart_args, sys.stdout)
+    finally:
+        if spool is not None:
+            spool.close()
+
+
+def approx_chart(args: dict) -> None:
+    """Read the input in chunks into a quantile sketch and draw a histogram."""
+    if not args["histogram"]:
+        print(">> Error: --approx only supports histograms")
+        sys.exit(2)
+
+    from .chart import ApproxHistogramChart
+    from .sketch import KLLSketch
+
+    sketch = KLLSketch()
+    for chunk in Data.iter_file(args["filename"], args):
+        sketch.extend(chain.from_iterable(chunk.data))
+
+    if not sketch.count:
+        raise Exception("No data provided")
+
+    chart_args = _chart_args(args, _extract_colors(Data([0], ["min"]), args))
+    ApproxHistogramChart(sketch, chart_args).render(sys.stdout)
+
+
+def follow_chart(args: dict) -> None:
+    """Keep a bar or stacked chart up to date as data arrives."""
+    if args["vertical"] or args["histogram"] or args["calendar"]:
+        print(">> Error: --follow only supports bar and stacked charts")
+        sys.exit(2)
+
+    from .chart import BarChart, StackedChart
+    from .live import follow
+
+    chart_cls = StackedChart if args["stacked"] else BarChart
+
+    def make_chart(data_obj: Data, width: int) -> Chart:
+        if args["max_points"]:
+            data_obj = downsample(data_obj, args)
+        chart_args = _chart_args(dict(args, width=width), _extract_colors(data_obj, args))
+        return chart_cls(data_obj, chart_args)
+
+    try:
+        follow(args["filename"], args, make_chart, sys.stdout, max_fps=args["fps"])
+    except FileNotFoundError:
+        print(f">> Error: The specified file [{args['filename']}] does not exist.")
+        sys.exit()
+
+
+def downsample(data_obj: Data, args: dict) -> Data:
+    """Aggregate the rows of the data to the --max-points limit."""
+    max_points = args["max_points"]
+    if max_points == "auto":
+        max_points = _fitting_points(data_obj, args)
+    return data_obj.downsample(max_points, args["aggregate"])
+
+
+def _fitting_points(data_obj: Data, args: dict) -> int:
+    """Return how many rows of the data fit in the terminal."""
+    import shutil
+
+    columns, lines = shutil.get_terminal_size()
+    categories = data_obj.dims[1] if data_obj.dims and len(data_obj.dims) > 1 else 1
+
+    if args["vertical"]:
+        # Every value is a column of a tick and a space.
+        return max(columns // (2 * categories), 1)
+
+    # Leave room for the title, the category legend and the prompt.
+    lines -= 4
+    if args["space_between"]:
+        lines //= 2
+    if not args["stacked"]:
+        lines //= categories
+    return max(lines, 1)
+
+
+def _chart_args(args: dict, colors: list) -> Args:
+    """Convert CLI args dict to chart Args class, mapping incompatible keys."""
+    chart_args_dict = dict(args)
+    if "color" in chart_args_dict:
+        chart_args_dict["colors"] = chart_args_dict.pop("color")
+
+    # Remove CLI-specific args that don't belong in chart Args
+    cli_only_args = [
+        "filename",
+        "delim",
+        "verbose",
+        "version",
+        "stream",
+        "follow",
+        "fps",
+        "max_points",
+        "aggregate",
+        "approx",
+        "events",
+        "filenames",
+        "jobs",
+        "shared_scale",
+        "binary",
+        "labels",
+        "categories",
+        "csv",
+        "label_col",
+        "cols",
+        "profile",
+        "profile_format",
+        "profile_memory",
+        "serve",
+        "client",
+        "socket",
+        "color_mode",
+    ]
+    for cli_arg in cli_only_args:
+        chart_args_dict.pop(cli_arg, None)
+
+    chart_args = Args(**chart_args_dict)
+    if not _colored(args):
+        chart_args.update_args(colors=None)
+    elif colors:
+        chart_args.update_args(colors=colors)
+
+    return chart_args
+
+
+def _colored(args: dict) -> bool:
+    """Return whether the output is colored, following "color_mode".
+
+    In auto mode only a terminal gets colors, and only when the NO_COLOR
+    environment variable isn't set. Without the key the output is colored.
+    """
+    mode = args.get("color_mode", "always")
+    if mode == "auto":
+        return sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+    return mode == "always"
 
 
 def _extract_colors(data_obj: Data, args: dict) -> list:
@@ -217,86 +851,81 @@ def read_data(args: dict) -> tuple[list, list, list, list]:
 
     # Use new Data.from_file() method
     data_obj = Data.from_file(args["filename"], args)
+    if args.get("max_points") and not _fits_width(args):
+        data_obj = downsample(data_obj, args)
     colors = _extract_colors(data_obj, args)
 
     return data_obj.categories, data_obj.labels, data_obj.data, colors
 
 
-def calendar_heatmap(data: dict, labels: list, args: dict) -> None:
-    """Print a calendar heatmap."""
-    if args["color"]:
-        colornum = AVAILABLE_COLORS.get(args["color"][0])
-    else:
-        colornum = AVAILABLE_COLORS.get("blue")
+def calendar_heatmap(
+    data: list, labels: list, args: dict, out: Union[TextIO, int, None] = None
+) -> None:
+    """Print a calendar heatmap of one value per day, labeled YYYY-MM-DD.
 
-    dt_dict = {}
-    for i in range(len(labels)):
-        dt_dict[labels[i]] = data[i][0]
+    The heatmap is built in memory and written with a single bulk write to
+    out, which defaults to sys.stdout.
+    """
+    from .heatmap import DailyValues
 
-    # get max value
-    max_val = float(max(data)[0])
+    days = DailyValues.from_labels(labels, (row[0] for row in data))
+    _draw_calendar(days, args, out)
 
-    tick_1 = "░"
-    tick_2 = "▒"
-    tick_3 = "▓"
-    tick_4 = "█"
 
-    if args["custom_tick"]:
-        tick_1 = tick_2 = tick_3 = tick_4 = args["custom_tick"]
+def events_calendar(args: dict, out: Union[TextIO, int, None] = None) -> None:
+    """Print a calendar heatmap of the number of events per day.
 
-    # check if start day set, otherwise use one year ago
-    if args["start_dt"]:
-        start_dt = datetime.strptime(args["start_dt"], "%Y-%m-%d")
+    Every input line is an event, a timestamp or an access log line, and
+    the input is read in a single streaming pass.
+    """
+    from .heatmap import DailyValues
+
+    if args["filename"] == "-":
+        days = DailyValues.from_events(sys.stdin)
     else:
-        start = datetime.now()
-        start_dt = datetime(year=start.year - 1, month=start.month, day=start.day)
-
-    # modify start date to be a Monday, subtract weekday() from day
-    start_dt = start_dt - timedelta(start_dt.weekday())
-
-    # TODO: legend doesn't line up properly for all start dates/data
-    # top legend for months
-    sys.stdout.write("     ")
-    for month in range(13):
-        month_dt = datetime(
-            year=start_dt.year, month=start_dt.month, day=1
-        ) + timedelta(days=month * 31)
-        sys.stdout.write(month_dt.strftime("%b") + " ")
-        if args["custom_tick"]:  # assume custom tick is emoji which is one wider
-            sys.stdout.write(" ")
-
-    sys.stdout.write("\n")
-
-    for day in range(7):
-        sys.stdout.write(DAYS[day] + ": ")
-        for week in range(53):
-            day_ = start_dt + timedelta(days=day + week * 7)
-            day_str = day_.strftime("%Y-%m-%d")
-
-            if day_str in dt_dict:
-                if dt_dict[day_str] > max_val * 0.75:
-                    tick = tick_4
-                elif dt_dict[day_str] > max_val * 0.50:
-                    tick = tick_3
-                elif dt_dict[day_str] > max_val * 0.25:
-                    tick = tick_2
-                # show nothing if value is zero
-                elif dt_dict[day_str] == 0.0:
-                    tick = " "
-                # show values for less than 0.25
-                else:
-                    tick = tick_1
-            else:
-                tick = " "
+        with open(args["filename"]) as f:
+            days = DailyValues.from_events(f)
+
+    if not days.values:
+        raise Exception("No dates found in the events")
+    _draw_calendar(days, args, out)
+
 
-            if colornum:
-                sys.stdout.write(f"\033[{colornum}m")
+def _draw_calendar(days, args: dict, out: Union[TextIO, int, None]) -> None:
+    """Draw the days in the date range of the arguments.
 
-            sys.stdout.write(tick)
-            if colornum:
-                sys.stdout.write("\033[0m")
+    Without --start-dt the calendar starts a year ago, or on the first day
+    of the data with --end-dt. Without --end-dt it shows 53 weeks.
+    """
+    from datetime import date, datetime
+    from .heatmap import WEEKS, render_heatmap
+
+    if not _colored(args):
+        colornum = None
+    elif args["color"]:
+        colornum = AVAILABLE_COLORS.get(args["color"][0])
+    else:
+        colornum = AVAILABLE_COLORS.get("blue")
+
+    end_dt = args.get("end_dt")
+    if args["start_dt"]:
+        start = datetime.strptime(args["start_dt"], "%Y-%m-%d").toordinal()
+    elif end_dt and days.values:
+        start = days.first
+    else:
+        today = date.today()
+        try:
+            start = today.replace(year=today.year - 1).toordinal()
+        except ValueError:  # February 29th
+            start = today.replace(year=today.year - 1, day=28).toordinal()
+
+    if end_dt:
+        end = datetime.strptime(end_dt, "%Y-%m-%d").toordinal()
+    else:
+        # 53 weeks from the Monday on or before the start
+        end = start - date.fromordinal(start).weekday() + WEEKS * 7 - 1
 
-        sys.stdout.write("\n")
+    write_output(render_heatmap(days, start, end, colornum, args["custom_tick"]), out)
 
 
 # DEPRECATED: Use Data.normalize() directly instead
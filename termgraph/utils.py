@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 import math
+import os
 import sys
+from typing import TextIO, Union
 from .constants import UNITS, TICK, SM_TICK
+from . import profiling
+
+_console_fixed = False
 
 
 def cvt_to_readable(num):
@@ -33,9 +38,34 @@ def cvt_to_readable(num):
     return (newNum, degree)
 
 
+class SGREncoder:
+    """Colors text, emitting an SGR escape only where the color changes.
 
+    Colors are ANSI foreground codes, so blank text looks the same in any
+    color and is written without switching. The encoder starts in the
+    default color, call reset() at the end to get back to it.
+    """
 
-def print_row_core(
+    def __init__(self):
+        self.color: Union[int, None] = None
+
+    def paint(self, text: str, color: Union[int, None]) -> str:
+        """Return the text in the color, after an escape if it changes."""
+        color = color or None
+        if color == self.color or not text or text.isspace():
+            return text
+        self.color = color
+        return f"\033[{color}m{text}" if color else f"\033[0m{text}"
+
+    def reset(self) -> str:
+        """Return the escape back to the default color, if needed."""
+        if self.color is None:
+            return ""
+        self.color = None
+        return "\033[0m"
+
+
+def format_row_core(
     value: float,
     num_blocks: int,
     val_min: float,
@@ -43,8 +73,9 @@ def print_row_core(
     label_before: bool = False,
     zero_as_small_tick: bool = False,
     tick: str = TICK,
-) -> None:
-    """Core logic for printing a row of bars in horizontal graphs.
+    sgr: Union[SGREncoder, None] = None,
+) -> str:
+    """Core logic for building a row of bars in horizontal graphs.
 
     Args:
         value: The data value being displayed
@@ -54,20 +85,93 @@ def print_row_core(
         label_before: Whether to use small tick for zero values with label_before
         zero_as_small_tick: Additional condition for using small tick on zero
         tick: Custom tick character to use (defaults to TICK constant)
+        sgr: Color state shared with the bars before and after this one on
+            the line, the caller resets it. Without it the row starts and
+            ends in the default color.
+
+    Returns:
+        The row as a single string, including any color escape codes.
     """
-    sys.stdout.write("\033[0m")  # no color
+    encoder = sgr if sgr is not None else SGREncoder()
 
     if (num_blocks < 1 and (value > val_min or value > 0)) or (
         zero_as_small_tick and value == 0.0
     ):
         # Print something if it's not the smallest
         # and the normal value is less than one.
-        sys.stdout.write(SM_TICK)
+        row = encoder.paint(SM_TICK, None)
     else:
-        if color:
-            sys.stdout.write(f"\033[{color}m")  # Start to write colorized.
-        for _ in range(num_blocks):
-            sys.stdout.write(tick)
+        row = encoder.paint(tick * num_blocks, color)
+
+    if sgr is None:
+        row += encoder.reset()
+
+    return row
+
+
+def print_row_core(
+    value: float,
+    num_blocks: int,
+    val_min: float,
+    color: int | None = None,
+    label_before: bool = False,
+    zero_as_small_tick: bool = False,
+    tick: str = TICK,
+) -> None:
+    """Print a row of bars in horizontal graphs, see format_row_core()."""
+    fix_windows_console()
+    sys.stdout.write(
+        format_row_core(
+            value=value,
+            num_blocks=num_blocks,
+            val_min=val_min,
+            color=color,
+            label_before=label_before,
+            zero_as_small_tick=zero_as_small_tick,
+            tick=tick,
+        )
+    )
+
+
+def write_output(text: str, out: Union[TextIO, int, None] = None) -> None:
+    """Write rendered output with a single bulk write.
+
+    Args:
+        text: The rendered output
+        out: A file-like object, a file descriptor or None for sys.stdout
+    """
+    fix_windows_console()
+    if out is None:
+        out = sys.stdout
+
+    with profiling.phase("write"):
+        if isinstance(out, int):
+            # os.write may write less than requested on pipes and sockets.
+            view = memoryview(text.encode("utf-8"))
+            while view:
+                written = os.write(out, view)
+                view = view[written:]
+                profiling.count("writes")
+        else:
+            out.write(text)
+            profiling.count("writes")
+
+    if profiling.active is not None:
+        profiling.count("bytes written", len(text.encode("utf-8")))
+
+
+def fix_windows_console() -> None:
+    """Let the Windows console interpret the ANSI color codes.
+
+    Done once, before the first output. colorama is only imported on
+    Windows, other terminals understand the codes as they are.
+    """
+    global _console_fixed
+    if _console_fixed:
+        return
+    _console_fixed = True
+
+    if sys.platform == "win32":
+        from colorama import just_fix_windows_console
 
-    if color:
-        sys.stdout.write("\033[0m")  # Back to original.
+        just_fix_windows_console()
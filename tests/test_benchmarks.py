@@ -0,0 +1,48 @@
+from benchmarks.compare import compare
+from benchmarks.run import CASES, run_benchmarks
+from benchmarks.startup import HEAVY_MODULES, MODULE, check, import_times
+
+
+def test_run_benchmarks_covers_every_case(tmp_path):
+    results = run_benchmarks([20], repeat=1, data_dir=str(tmp_path), log=lambda line: None)
+
+    names = {(r["kind"], r["name"]) for r in results["results"]}
+    assert names == {(kind, name) for kind in CASES for name in CASES[kind]}
+    assert all(r["peak_bytes"] > 0 for r in results["results"])
+    assert all(
+        bool(r["output_bytes"]) == r["name"].startswith("draw")
+        for r in results["results"]
+    )
+
+
+def test_compare_flags_regressions():
+    def run(seconds, peak):
+        return {("parse", "flat", 100): {"median": seconds, "min": seconds, "peak_bytes": peak}}
+
+    assert not compare(run(0.01, 1000), run(0.0105, 1000))[0]["regression"]
+    assert compare(run(0.01, 1000), run(0.02, 1000))[0]["regression"]
+    assert compare(run(0.01, 1000), run(0.01, 2000))[0]["regression"]
+    # Too fast to tell apart from noise.
+    assert not compare(run(0.0001, 1000), run(0.0005, 1000))[0]["regression"]
+
+
+def test_startup_skips_heavy_modules():
+    times = import_times()
+
+    assert MODULE in times
+    assert not [name for name in HEAVY_MODULES if name in times]
+
+
+def test_client_imports_only_what_forwarding_takes():
+    times = import_times("termgraph.client")
+
+    assert "termgraph.client" in times
+    assert not [name for name in ("termgraph.data", "socket", "json") if name in times]
+
+
+def test_startup_check_budget():
+    result = {"import_ms": 30.0, "heavy_modules": []}
+
+    assert check(result, budget_ms=40) == []
+    assert check(result, budget_ms=20)
+    assert check(dict(result, heavy_modules=["numpy"])) == ["imports numpy"]
@@ -0,0 +1,83 @@
+import io
+import tempfile
+from datetime import date
+from unittest.mock import patch
+
+from termgraph.heatmap import DailyValues, parse_day, render_heatmap
+from termgraph import termgraph as tg
+from termgraph.termgraph import calendar_heatmap
+
+
+def test_parse_day():
+    assert parse_day("2017-07-01") == date(2017, 7, 1).toordinal()
+    assert parse_day("2017-02-30") is None
+    assert parse_day("2017-7-1") is None
+    assert parse_day("label") is None
+
+
+def test_daily_values_from_labels():
+    days = DailyValues.from_labels(
+        ["2017-07-03", "not a date", "2017-07-01", "2017-07-03"], [1.0, 9.0, 2.0, 4.0]
+    )
+
+    assert days.first == date(2017, 7, 1).toordinal()
+    assert days.values == [2.0, None, 4.0]
+    assert days[days.first - 1] is None
+    assert days.max() == 4.0
+
+
+def test_daily_values_from_events():
+    lines = [
+        "2024-05-01T12:00:00Z GET /\n",
+        "2024-05-01 13:00:00 GET /about\n",
+        '127.0.0.1 - - [03/May/2024:13:55:36 -0700] "GET / HTTP/1.1" 200 2326\n',
+        "level=info time=2024-05-03T08:00:00Z\n",
+        "no date here\n",
+    ]
+    days = DailyValues.from_events(lines)
+
+    assert days.first == date(2024, 5, 1).toordinal()
+    assert days.values == [2, None, 2]
+
+
+def test_events_implies_calendar(capsys):
+    with tempfile.NamedTemporaryFile("w", suffix=".log") as f:
+        f.write("2024-05-01 GET /\n2024-05-01 GET /about\n2024-05-03 GET /\n")
+        f.flush()
+        with patch("sys.argv", ["termgraph", "--events", f.name]):
+            tg.main()
+
+    lines = capsys.readouterr().out.split("\n")
+    assert any(line.startswith("Wed: ") for line in lines)
+    assert "▇" not in "".join(lines)
+
+
+def test_render_heatmap_one_year():
+    days = DailyValues.from_labels(["2017-07-03", "2017-07-04"], [4.0, 1.0])
+    start = date(2017, 7, 1).toordinal()
+    lines = render_heatmap(days, start, start - 5 + 53 * 7 - 1).split("\n")
+
+    assert lines[0].startswith("     Jun Jul ")
+    assert len(lines) == 9
+    # The weeks start on the Monday before, June 26th.
+    assert lines[1] == "Mon:  █" + " " * 51
+    assert lines[2] == "Tue:  ░" + " " * 51
+
+
+def test_render_heatmap_stacks_years():
+    days = DailyValues.from_labels(["2020-01-06", "2022-06-01"], [1.0, 1.0])
+    text = render_heatmap(days, days.first, days.last)
+    panels = text.split("\n\n")
+
+    assert len(panels) == 3
+    assert [panel[:4] for panel in panels] == ["2020", "2021", "2022"]
+
+
+def test_calendar_heatmap_end_dt():
+    args = {"color": None, "custom_tick": "", "start_dt": None, "end_dt": "2017-07-16"}
+    out = io.StringIO()
+    calendar_heatmap([[1.0], [2.0]], ["2017-07-03", "2017-07-10"], args, out)
+
+    # From the first day of the data, in the default blue, switched on once.
+    lines = out.getvalue().split("\n")
+    assert lines[1] == "Mon: \033[94m▒█\033[0m"
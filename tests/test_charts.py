@@ -1,6 +1,17 @@
-from termgraph.data import Data
+import pytest
+
+from termgraph.data import Data, RollingData
 from termgraph.args import Args
-from termgraph.chart import BarChart, StackedChart, VerticalChart, HistogramChart
+from termgraph.canvas import BrailleCanvas
+from termgraph.chart import (
+    BarChart,
+    HistogramChart,
+    LineChart,
+    ScatterChart,
+    SparklineChart,
+    StackedChart,
+    VerticalChart,
+)
 
 def test_barchart_draws_correctly():
     labels = ["2007", "2008", "2009", "2010", "2011", "2012", "2014"]
@@ -245,4 +256,229 @@ def test_no_values_with_suffix():
         assert "10" not in output
         assert "20" not in output
 
-    run_for_all_charts(test)
\ No newline at end of file
+    run_for_all_charts(test)
+
+
+def test_render_returns_same_output_as_draw():
+    labels = ["A", "B", "C"]
+    data_values = [[10, 5], [20, 0], [0, 15]]
+    data = Data(data_values, labels, ["x", "y"])
+    args = Args(title="Render", colors=[91, 94])
+
+    def test(ChartType):
+        import io
+        from contextlib import redirect_stdout
+
+        f = io.StringIO()
+        with redirect_stdout(f):
+            ChartType(data, args).draw()
+
+        assert ChartType(data, args).render() == f.getvalue()
+
+    run_for_all_charts(test)
+
+
+def test_render_writes_to_file_object_and_descriptor():
+    import io
+    import tempfile
+
+    data = Data([[10], [20]], ["A", "B"])
+    chart = BarChart(data, Args())
+
+    f = io.StringIO()
+    text = chart.render(f)
+    assert f.getvalue() == text
+    assert "A: " in text
+
+    with tempfile.TemporaryFile() as tmp:
+        chart.render(tmp.fileno())
+        tmp.seek(0)
+        assert tmp.read().decode("utf-8") == text
+
+
+def test_render_chunks_matches_full_render():
+    import io
+
+    labels = ["one", "two", "three", "four", "five"]
+    data_values = [[10, 5], [-20, 0], [0, 15], [3, 3], [7, 1]]
+    full = Data(data_values, labels, ["x", "y"])
+    chunks = [
+        Data(data_values[:2], labels[:2], ["x", "y"]),
+        Data(data_values[2:], labels[2:], ["x", "y"]),
+    ]
+
+    for ChartType in [BarChart, StackedChart]:
+        args = Args(title="Chunks", space_between=True)
+        expected = ChartType(full, args).render()
+
+        args.update_args(scale=(-20, 15), label_width=5)
+        f = io.StringIO()
+        ChartType.render_chunks(chunks, args, f)
+        assert f.getvalue() == expected
+
+    args.update_args(different_scale=True)
+    with pytest.raises(Exception, match="one scale for all the categories"):
+        BarChart.render_chunks(chunks, args, io.StringIO())
+
+
+def test_verticalchart_render_is_repeatable():
+    data = Data([[3], [1], [0]], ["A", "B", "C"])
+    chart = VerticalChart(data, Args(width=3))
+
+    first = chart.render()
+    assert chart.render() == first
+    assert first.startswith("▇    \n▇    \n▇ ▇ ▏\n")
+
+
+def test_verticalchart_groups_categories():
+    data = Data([[2, 1], [1, 2]], ["A", "B"], ["x", "y"])
+    text = VerticalChart(data, Args(width=2, no_values=True)).render()
+
+    bars = text.split("\n\n", 1)[1].split("-", 1)[0]
+    assert bars == "▇      ▇\n▇ ▇  ▇ ▇\n"
+    assert text.endswith("A    B\n")
+    # Without colors there is nothing to escape.
+    assert "\033" not in text
+
+
+def test_verticalchart_window_splits_panels():
+    labels = [str(i) for i in range(10)]
+    data = Data([[i + 1] for i in range(10)], labels)
+    text = VerticalChart(data, Args(width=10, window=8)).render()
+
+    panels = text.split("\n\n")
+    assert len(panels) == 3
+    assert panels[0].endswith("0  1  2  3")
+    assert panels[2].endswith("8  9\n")
+    for panel in panels:
+        bars = panel.split("-", 1)[0]
+        assert all(len(line) <= 8 for line in bars.split("\n"))
+
+
+def test_sgr_encoder_writes_only_changes():
+    from termgraph.utils import SGREncoder
+
+    sgr = SGREncoder()
+    text = sgr.paint("a", 91) + sgr.paint("b", 91) + sgr.paint(" ", 94)
+    text += sgr.paint("c", 94) + sgr.paint("d", None) + sgr.reset()
+    assert text == "\033[91mab \033[94mc\033[0md"
+
+
+def test_uncolored_charts_have_no_escapes():
+    data = Data([[1, 2], [3, 4]], ["A", "B"], ["x", "y"])
+    for chart in (BarChart, StackedChart, VerticalChart):
+        assert "\033" not in chart(data, Args()).render()
+
+
+def test_sparklinechart_buckets_columns_to_width():
+    values = [[i % 100, 50] for i in range(1000)]
+    data = Data(values, [str(i) for i in range(1000)], ["saw", "flat"])
+    lines = SparklineChart(data, Args(width=10)).render().split("\n")
+
+    # Every bucket averages one tooth of the saw to 49.5, half of the range.
+    assert lines[0] == "saw : ▅▅▅▅▅▅▅▅▅▅ 99.00"
+    assert lines[1] == "flat: ▅▅▅▅▅▅▅▅▅▅ 50.00"
+
+    chart = SparklineChart(data, Args(width=10, different_scale=True))
+    assert chart.normal_data[1] == [0] * 10
+
+
+def test_sparklinechart_rows():
+    data = Data([[1, 8, 1, 8], [8, 8, 1, 1]], ["a", "b"])
+    text = SparklineChart(data, Args(spark_rows=True, colors=[92], width=2)).render()
+    assert text == "a: \033[92m▅▅\033[0m 8.00 \nb: \033[92m█▁\033[0m 1.00 \n"
+
+
+def test_braille_canvas():
+    canvas = BrailleCanvas(2, 1)
+    canvas.line(0, 0, 3, 3, 91)
+    canvas.set(9, 9)  # outside, ignored
+    assert canvas.rows() == ["\033[91m⠑⢄\033[0m"]
+
+    canvas = BrailleCanvas(2, 2)
+    canvas.column(3, -5, 4)
+    assert canvas.rows() == [" ⢸", " ⠈"]
+
+
+def test_linechart_draws_on_canvas():
+    data = Data([1, 3, 2, 4], ["a", "b", "c", "d"])
+    text = LineChart(data, Args(width=4, height=1)).render()
+    assert text == "4.00 ┤⡠⠒⠤⠊\n     └────\n      a  d\n"
+
+
+def test_linechart_size_does_not_depend_on_rows():
+    count = 5000
+    values = [[i % 100, 50] for i in range(count)]
+    data = Data(values, [str(i) for i in range(count)], ["saw", "flat"])
+    lines = LineChart(data, Args(width=20, height=5, colors=[91, 94])).render().split("\n")
+
+    assert len(lines) == 10
+    assert lines[0] == "\033[91m▇ saw \033[94m▇ flat \033[0m"
+    assert lines[2].startswith("99.00 ┤")
+    assert lines[6].startswith(" 0.00 ┤")
+    # The labels are numbers, the x axis spans them.
+    assert lines[8] == "       0               4999"
+
+    # The same chart without NumPy
+    data = Data(values, [str(i) for i in range(count)], ["saw", "flat"])
+    data.stats.__dict__["array"] = None
+    assert LineChart(data, Args(width=20, height=5, colors=[91, 94])).render() == "\n".join(lines)
+
+
+def test_scatterchart_uses_numeric_labels_as_x():
+    data = Data([1, 2, 1], ["0", "3", "1"])
+    chart = ScatterChart(data, Args(width=2, height=1, no_labels=True))
+    assert chart.normal_data == [[(0, 3), (1, 3), (3, 0)]]
+    assert chart.render() == "2.00 ┤⣀⠈\n     └──\n"
+
+
+def test_render_async_writes_to_stream_writer():
+    import asyncio
+    import io
+    import socket
+
+    data = Data([1, 2], ["a", "b"])
+    chart = BarChart(data, Args(width=2))
+
+    async def render():
+        ours, theirs = socket.socketpair()
+        _, writer = await asyncio.open_connection(sock=ours)
+        text = await chart.render_async(writer)
+        writer.close()
+        received = theirs.recv(1024).decode()
+        theirs.close()
+        return text, received
+
+    text, received = asyncio.run(render())
+    assert text == received == "a: ▇ 1.00 \nb: ▇▇ 2.00 \n"
+
+    out = io.StringIO()
+    assert asyncio.run(chart.render_async(out)) == out.getvalue() == text
+
+
+def test_chart_update_matches_new_chart():
+    data = Data([[1, 2], [3, 4]], ["a", "b"], ["x", "y"])
+    charts = [BarChart(data, Args(width=10)), StackedChart(data, Args(width=10)),
+              VerticalChart(data, Args(width=10))]
+    charts[0].update("c", [2, 3])
+    charts[0].update("a", [9, 1])
+    for chart in charts[1:]:
+        chart.update()
+
+    fresh = Data([[9, 1], [3, 4], [2, 3]], ["a", "b", "c"], ["x", "y"])
+    for chart in charts:
+        assert chart.render() == type(chart)(fresh, Args(width=10)).render()
+
+
+def test_charts_draw_the_rolling_window():
+    window = RollingData(4, ["x", "y"])
+    for i in range(10):
+        window.push(f"t{i}", [i % 3 + 1, i % 4])
+    chart = SparklineChart(window, Args(width=10))
+    window.push("t10", [9, 0])
+    chart.update()
+
+    fresh = Data([[2, 3], [3, 0], [1, 1], [9, 0]], ["t7", "t8", "t9", "t10"], ["x", "y"])
+    for cls in (BarChart, StackedChart, VerticalChart):
+        assert cls(window, Args(width=10)).render() == cls(fresh, Args(width=10)).render()
+    assert chart.render() == SparklineChart(fresh, Args(width=10)).render()
@@ -1,5 +1,5 @@
 import pytest
-from termgraph.data import Data
+from termgraph.data import Data, RollingData, bin_counts
 
 
 def test_find_min_returns_lowest_value():
@@ -68,4 +68,158 @@ def test_data_missing_values_for_categories_raises_exception():
         [30.0, 20.0],
     ]
     with pytest.raises(Exception, match="inner dimensions of the data are different"):
-        Data(data, labels)
\ No newline at end of file
+        Data(data, labels)
+
+
+def test_downsample_aggregates_consecutive_rows():
+    data_obj = Data([1, 2, 3, 4, 5, 6], ["a", "b", "c", "d", "e", "f"])
+
+    mean = data_obj.downsample(3)
+    assert mean.labels == ["a", "c", "e"]
+    assert mean.data == [1.5, 3.5, 5.5]
+
+    assert data_obj.downsample(2, "min").data == [1, 4]
+    assert data_obj.downsample(2, "max").data == [3, 6]
+    assert data_obj.downsample(2, "sum").data == [6, 15]
+    assert data_obj.downsample(10) is data_obj
+
+
+def test_downsample_categories_per_column():
+    data_obj = Data([[1, 10], [3, 30], [5, 50]], ["a", "b", "c"], ["x", "y"])
+    result = data_obj.downsample(1, "max")
+    assert result.data == [[5, 50]]
+    assert result.categories == ["x", "y"]
+
+
+def test_downsample_lttb_keeps_peaks_and_ends():
+    values = [0.0] * 100
+    values[37] = 10.0
+    values[71] = -5.0
+    data_obj = Data(values, [str(i) for i in range(100)])
+    result = data_obj.downsample(10, "lttb")
+    assert len(result.data) == 10
+    assert result.labels[0] == "0" and result.labels[-1] == "99"
+    assert "37" in result.labels and "71" in result.labels
+
+
+def test_downsample_numpy_matches_pure_python(monkeypatch):
+    pytest.importorskip("numpy")
+    import termgraph.data as data_module
+
+    values = [[float(i % 13), float(i % 7)] for i in range(3000)]
+    labels = [str(i) for i in range(3000)]
+    for method in ("mean", "min", "max", "sum", "lttb"):
+        fast = Data(values, labels).downsample(40, method)
+        monkeypatch.setattr(data_module, "_NUMPY_MIN_VALUES", 10**9)
+        slow = Data(values, labels).downsample(40, method)
+        monkeypatch.undo()
+        assert fast.labels == slow.labels
+        for fast_row, slow_row in zip(fast.data, slow.data):
+            assert fast_row == pytest.approx(slow_row)
+
+
+def test_downsample_invalid_method():
+    with pytest.raises(Exception, match="Invalid downsample method"):
+        Data([1, 2], ["a", "b"]).downsample(1, "median")
+
+
+def test_bin_counts_half_open_bins():
+    assert bin_counts([1, 2, 2, 5, 9, -1, 3], [0, 3, 6, 9]) == [3, 2, 0]
+
+
+def test_bin_counts_discrete_values_match_continuous():
+    values = [float(i % 20) for i in range(10000)]
+    borders = [0.0, 2.5, 7.0, 13.3, 20.0]
+    expected = [sum(1 for v in values if start <= v < end) for start, end in zip(borders, borders[1:])]
+    assert bin_counts(values, borders) == expected
+    assert bin_counts(iter(values), borders) == expected
+
+
+def test_stats_are_memoized_and_invalidated():
+    data_obj = Data([[1, 5], [3, -2]], ["a", "bbb"])
+    stats = data_obj.stats
+    assert data_obj.stats is stats
+    assert (stats.min, stats.max) == (-2, 5)
+    assert stats.column_min == [1, -2]
+    assert stats.column_max == [3, 5]
+    assert stats.max_label_length == 3
+    assert data_obj.normalize(10) is data_obj.normalize(10)
+
+    data_obj.data = [[7, 8], [9, 10]]
+    assert data_obj.stats is not stats
+    assert data_obj.find_max() == 10
+
+    data_obj.data[0][0] = 20
+    data_obj.invalidate()
+    assert data_obj.find_max() == 20
+
+    data_obj.labels = ["a", "longer"]
+    assert data_obj.find_max_label_length() == 6
+
+
+def test_append_and_update_keep_stats_current():
+    data_obj = Data([[1, 5], [3, -2]], ["a", "bbb"])
+    stats = data_obj.stats
+    normal = data_obj.normalize(10)
+    data_obj.find_max_label_length()
+
+    # Within the scale, only the new row is normalized
+    data_obj.append("cc", [2, 4])
+    assert data_obj.stats is stats
+    assert data_obj.normalize(10) is normal
+    assert data_obj.dims == (3, 2)
+    assert data_obj.find_max_label_length() == 3
+
+    data_obj.extend(["dddd"], [[6, 0]])
+    data_obj.update("a", [0, 1])
+    assert (stats.min, stats.max) == (-2, 6)
+    assert stats.column_max == [6, 4]
+    assert data_obj.find_max_label_length() == 4
+
+    # Replacing the only maximum rescans
+    data_obj.update("dddd", [1, 1])
+    assert data_obj.find_max() == 4
+
+    fresh = Data([list(row) for row in data_obj.data], list(data_obj.labels))
+    assert data_obj.normalize(10) == fresh.normalize(10)
+    assert data_obj.normalize_categories(10) == fresh.normalize_categories(10)
+
+    with pytest.raises(Exception, match="Expected 2 values"):
+        data_obj.append("e", [1])
+
+
+def test_update_leaves_the_wrapped_buffer_alone():
+    from array import array
+
+    buf = array("d", range(2048))
+    data_obj = Data.from_buffer(buf, columns=2)
+    assert data_obj.find_max() == 2047
+    data_obj.update("2", [999, 0])
+    assert buf[4:6].tolist() == [4.0, 5.0]
+    assert data_obj.find_max() == 2047
+    assert list(data_obj.data[2]) == [999, 0]
+
+
+def test_rolling_data_keeps_the_window_extremes():
+    window = RollingData(3, ["a", "b"])
+    with pytest.raises(Exception, match="No data provided"):
+        window.find_min()
+
+    pushed = []
+    for i, row in enumerate([[5, 1], [2, 8], [7, 3], [1, 1], [4, 2], [3, 0]]):
+        window.push(str(i), row)
+        pushed.append(row)
+        last = pushed[-3:]
+        assert [list(r) for r in window.data] == last
+        assert window.find_min() == min(min(r) for r in last)
+        assert window.find_max() == max(max(r) for r in last)
+        assert window.stats.column_max == [max(c) for c in zip(*last)]
+
+    assert list(window.labels) == ["3", "4", "5"]
+    assert window.dims == (3, 2)
+    assert window.normalize(10) == Data(last, ["3", "4", "5"]).normalize(10)
+
+    with pytest.raises(Exception, match="Expected 2 values"):
+        window.push("x", 1)
+    with pytest.raises(Exception, match="can only be pushed"):
+        window.data = [[1, 2]]
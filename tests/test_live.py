@@ -0,0 +1,57 @@
+import re
+
+import pytest
+
+from termgraph import Args, BarChart, Data
+from termgraph import termgraph as tg
+from termgraph.live import CLEAR_LINE, CLEAR_SCREEN, LiveRenderer, render_fitted
+
+
+def test_live_renderer_rewrites_only_changed_lines():
+    renderer = LiveRenderer()
+    first = renderer.frame("a\nb\nc\n", (80, 24))
+    assert first == f"{CLEAR_LINE}a\n{CLEAR_LINE}b\n{CLEAR_LINE}c\n"
+
+    second = renderer.frame("a\nB\nc\n", (80, 24))
+    assert second == f"\033[3F\033[1E{CLEAR_LINE}B\n\033[1E"
+
+    assert renderer.frame("a\nB\nc\n", (80, 24)) == "\033[3F\033[3E"
+
+
+def test_live_renderer_clears_screen_on_resize():
+    renderer = LiveRenderer()
+    renderer.frame("a\nb\n", (80, 24))
+    output = renderer.frame("a\nb\n", (60, 24))
+    assert output.startswith(CLEAR_SCREEN)
+    assert output.count(CLEAR_LINE) == 2
+
+
+def test_live_renderer_clears_below_shorter_frame():
+    renderer = LiveRenderer()
+    renderer.frame("a\nb\nc\n", (80, 24))
+    assert renderer.frame("a\n", (80, 24)).endswith("\033[J")
+
+
+def _visible(line):
+    return re.sub(r"\033\[[0-9;]*m", "", line)
+
+
+def test_render_fitted_narrows_bars_to_terminal():
+    data = Data([[10.0], [20.0]], ["a", "b"])
+
+    def make_chart(data, width):
+        return BarChart(data, Args(width=width))
+
+    text = render_fitted(make_chart, data, 50, 30)
+    assert max(len(_visible(line)) for line in text.split("\n")) <= 30
+    assert "▇" in text
+
+
+def test_fps_must_be_above_zero(capsys):
+    for fps in ["0", "-5", "nan"]:
+        with pytest.raises(SystemExit) as e:
+            tg._parser().parse_args(["--follow", "--fps", fps])
+        assert e.value.code == 2
+        assert "must be above 0" in capsys.readouterr().err
+
+    assert tg._parser().parse_args(["--fps", "2.5"]).fps == 2.5
@@ -1,3 +1,4 @@
+import pytest
 from termgraph import termgraph as tg
 
 
@@ -59,4 +60,26 @@ def test_normalize_with_larger_width_does_not_normalize():
         [39.29504685934338],
     ]
     results = tg.normalize(data, 20000)
-    assert results == expected
\ No newline at end of file
+    assert results == expected
+
+
+def test_normalize_numpy_matches_pure_python(monkeypatch):
+    pytest.importorskip("numpy")
+    from termgraph import data as data_module
+    from termgraph.data import Data
+
+    values = [[183.32, -4], [231.23, 7], [16.43, 0], [-10.0, 3], [508.97, 7]]
+    labels = [str(i) for i in range(len(values))]
+
+    monkeypatch.setattr(data_module, "_NUMPY_MIN_VALUES", 10**9)
+    expected = Data(values, labels)
+    assert expected.array is None
+
+    monkeypatch.setattr(data_module, "_NUMPY_MIN_VALUES", 0)
+    vectorized = Data(values, labels)
+    assert vectorized.array is not None
+
+    assert vectorized.normalize(50) == expected.normalize(50)
+    assert vectorized.normalize_categories(50) == expected.normalize_categories(50)
+    assert vectorized.find_min() == expected.find_min() == -10.0
+    assert vectorized.find_max() == expected.find_max() == 508.97
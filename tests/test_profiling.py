@@ -0,0 +1,58 @@
+import io
+import json
+from unittest.mock import patch
+
+from termgraph import profiling
+from termgraph import termgraph as tg
+from termgraph.args import Args
+from termgraph.chart import BarChart
+from termgraph.data import Data
+from termgraph.profiling import Profiler
+
+
+def test_profiler_times_the_phases():
+    out = io.StringIO()
+    with Profiler(memory=True) as profiler:
+        data = Data.from_bytes(b"# comment\na 1\n\nb 2\n", {})
+        BarChart(data, Args()).render(out)
+
+    assert profiling.active is None
+    assert list(profiler.phases) == ["parse", "normalize", "render", "format", "write"]
+    assert profiler.phases["format"][1] == 2
+    assert profiler.counters == {
+        "rows": 2,
+        "values": 2,
+        "lines skipped": 2,
+        "writes": 1,
+        "bytes written": len(out.getvalue().encode("utf-8")),
+    }
+    assert profiler.peak_memory > 0
+
+    report = json.loads(profiler.report("json"))
+    assert report["phases"]["render"]["calls"] == 1
+    assert report["counters"]["rows"] == 2
+    # format runs inside render and is indented under it
+    assert "\n  format " in profiler.report()
+
+
+def test_main_profile_reports_to_stderr(capsys):
+    argv = ["termgraph", "data/ex1.dat", "--profile-format", "json"]
+    with patch("sys.argv", argv):
+        tg.main()
+    captured = capsys.readouterr()
+
+    report = json.loads(captured.err)
+    assert report["counters"]["rows"] == 7
+    assert report["peak_memory_bytes"] is None
+    assert captured.out.startswith("2007: ")
+
+
+def test_main_profile_merges_the_worker_processes(capsys):
+    argv = ["termgraph", "data/ex1.dat", "data/ex1.dat", "--jobs", "2"]
+    with patch("sys.argv", argv + ["--profile-format", "json"]):
+        tg.main()
+    report = json.loads(capsys.readouterr().err)
+
+    assert report["phases"]["parse"]["calls"] == 2
+    assert report["phases"]["render"]["calls"] == 2
+    assert report["counters"]["rows"] == 14
@@ -1,3 +1,4 @@
+import pytest
 import tempfile
 from unittest.mock import patch
 from io import StringIO
@@ -155,3 +156,305 @@ def test_read_data_custom_delimiter():
     assert labels == ["Label One", "Label Two", "Label Three"]
     assert data == [[10.5, 20.3, 15.8], [25.0, 18.5, 30.2], [12.1, 22.7, 19.4]]
     assert colors == []
+
+
+def test_iter_file_yields_chunks():
+    from termgraph.data import Data
+
+    chunks = list(Data.iter_file("data/ex4.dat", {}, chunk_size=2))
+    full = Data.from_file("data/ex4.dat", {})
+
+    assert [len(chunk.labels) for chunk in chunks] == [2, 2, 2, 1]
+    assert sum((chunk.labels for chunk in chunks), []) == full.labels
+    assert sum((chunk.data for chunk in chunks), []) == full.data
+    assert all(chunk.categories == full.categories for chunk in chunks)
+
+
+def test_scan_file_returns_scale_and_label_width():
+    from termgraph.data import Data
+
+    assert Data.scan_file("data/ex1.dat", {}, chunk_size=3) == (1.0, 508.97, 4)
+
+
+def test_bulk_parser_matches_line_parser():
+    import glob
+    from termgraph.data import _parse_lines, _parse_text
+
+    for filename in sorted(glob.glob("data/*.dat")):
+        delim = "|" if filename.endswith("ex_pipe.dat") else ","
+        with open(filename) as f:
+            rows = list(_parse_lines(f, delim))
+            f.seek(0)
+            categories, labels, data = _parse_text(f.read(), delim)
+
+        headers = [row for row in rows if isinstance(row, list)]
+        assert labels == [row.label for row in rows if not isinstance(row, list)]
+        assert data == [row.data for row in rows if not isinstance(row, list)]
+        assert categories == (headers[-1] if headers else [])
+
+
+def test_from_bytes_irregular_lines():
+    from termgraph.data import Data
+
+    data = Data.from_bytes(
+        b"# header\n@ A,B\n2001,1,2\n\n  # note\n2002 3 4\nlabel two,5,6\r\n7,8,last\n",
+        {},
+    )
+    assert data.categories == ["A", "B"]
+    assert data.labels == ["2001", "2002", "label two", "last"]
+    assert data.data == [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0], [7.0, 8.0]]
+
+
+def test_from_buffer_wraps_rows_without_copying():
+    import array
+    from termgraph.args import Args
+    from termgraph.chart import BarChart
+    from termgraph.data import Data
+
+    values = array.array("d", [1, 2, 3, 4, 5, 6])
+    data = Data.from_buffer(values, ["x", "y", "z"], ["A", "B"], columns=2)
+    expected = Data([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]], ["x", "y", "z"], ["A", "B"])
+
+    assert data.dims == (3, 2)
+    assert list(data.data[1]) == [3.0, 4.0]
+    assert BarChart(data, Args()).render() == BarChart(expected, Args()).render()
+
+    values[5] = 60
+    data.invalidate()
+    assert data.find_max() == 60
+
+
+def test_from_buffer_flat_and_numpy():
+    import array
+    from termgraph.data import Data
+
+    flat = Data.from_buffer(array.array("i", [3, 1, 2]))
+    assert flat.dims == (3,)
+    assert flat.labels == ["0", "1", "2"]
+    assert flat.find_min() == 1
+
+    np = pytest.importorskip("numpy")
+    matrix = np.arange(6, dtype=np.int64).reshape(3, 2)
+    data = Data.from_buffer(matrix, ["a", "b", "c"])
+    assert data.dims == (3, 2)
+    assert data.normalize(5) == Data([[0, 1], [2, 3], [4, 5]], ["a", "b", "c"]).normalize(5)
+
+    with pytest.raises(Exception, match="C-contiguous"):
+        Data.from_buffer(matrix.T, ["a", "b"])
+
+
+def test_from_columns_takes_categories_from_names():
+    import array
+    from termgraph.data import Data
+
+    data = Data.from_columns(
+        {"Boys": array.array("d", [1, 2]), "Girls": array.array("d", [3, 4])},
+        ["2001", "2002"],
+    )
+    assert data.categories == ["Boys", "Girls"]
+    assert data.dims == (2, 2)
+    assert [list(row) for row in data.data] == [[1.0, 3.0], [2.0, 4.0]]
+
+    with pytest.raises(Exception, match="same length"):
+        Data.from_columns([array.array("d", [1]), array.array("d", [1, 2])])
+
+
+def test_from_dataframe():
+    pd = pytest.importorskip("pandas")
+    from termgraph.data import Data
+
+    frame = pd.DataFrame({"year": [2001, 2002], "Boys": [1.0, 2.0], "Girls": [3.0, 4.0]})
+    data = Data.from_dataframe(frame, label_column="year")
+    assert data.labels == ["2001", "2002"]
+    assert data.categories == ["Boys", "Girls"]
+    assert [list(row) for row in data.data] == [[1.0, 3.0], [2.0, 4.0]]
+
+    series = Data.from_dataframe(frame["Boys"])
+    assert series.labels == ["0", "1"]
+    assert list(series.data) == [1.0, 2.0]
+
+    # Only the numeric columns are drawn
+    mixed = pd.DataFrame({"x": [1.0, 2.0], "tag": ["u", "v"], "n": [3, 4]})
+    data = Data.from_dataframe(mixed)
+    assert data.categories == ["x", "n"]
+    assert [list(row) for row in data.data] == [[1.0, 3], [2.0, 4]]
+
+
+def test_expand_globs_keeps_order():
+    assert tg._expand_globs(["data/ex2.dat", "data/ex[13].dat", "missing.dat"]) == [
+        "data/ex2.dat",
+        "data/ex1.dat",
+        "data/ex3.dat",
+        "missing.dat",
+    ]
+
+
+def test_multiple_files_render_in_order(capsys):
+    argv = ["termgraph", "data/ex2.dat", "data/ex1.dat", "data/ex3.dat", "--width", "10"]
+    with patch("sys.argv", argv + ["--jobs", "1"]):
+        tg.main()
+    serial = capsys.readouterr().out
+
+    with patch("sys.argv", argv + ["--jobs", "2"]):
+        tg.main()
+    assert capsys.readouterr().out == serial
+
+    titles = [line for line in serial.split("\n") if line.startswith("# ")]
+    assert titles == ["# data/ex2.dat", "# data/ex1.dat", "# data/ex3.dat"]
+
+
+def test_multiple_files_missing_one_exits(capsys):
+    argv = ["termgraph", "data/ex1.dat", "nope.dat", "data/ex2.dat"]
+    with patch("sys.argv", argv), pytest.raises(SystemExit) as e:
+        tg.main()
+    assert e.value.code == 2
+    out = capsys.readouterr().out
+    assert out == ">> Error: The specified file [nope.dat] does not exist.\n"
+
+
+def test_multiple_files_shared_scale(capsys):
+    argv = ["termgraph", "data/ex1.dat", "data/ex2.dat", "--width", "10"]
+    with patch("sys.argv", argv + ["--shared-scale"]):
+        tg.main()
+    lines = capsys.readouterr().out.split("\n")
+
+    # Labels are aligned across charts and 6 is small next to 508.97.
+    assert "2011     : ▇▇▇▇▇▇▇▇▇▇ 508.97" in lines
+    assert "wut      : ▏ 6.00 " in lines
+
+
+def test_from_struct_casts_uniform_records():
+    import struct
+    from termgraph.data import Data
+
+    records = struct.pack("<4d", 1.0, 2.0, 3.0, 4.0)
+    data = Data.from_struct(records, "<d d", categories=["x", "y"])
+
+    assert isinstance(data.data[0], memoryview)
+    assert [list(row) for row in data.data] == [[1.0, 2.0], [3.0, 4.0]]
+    assert data.labels == ["0", "1"]
+
+    # Mixed types are unpacked.
+    data = Data.from_struct(struct.pack("<dI", 1.5, 3) * 2, "<dI", ["a", "b"])
+    assert data.data == [[1.5, 3], [1.5, 3]]
+
+    with pytest.raises(Exception, match="whole number"):
+        Data.from_struct(records[:-1], "<d d")
+
+
+def test_from_npy_maps_the_file(tmp_path):
+    np = pytest.importorskip("numpy")
+    from termgraph.data import Data
+
+    path = str(tmp_path / "values.npy")
+    np.save(path, np.arange(6, dtype=np.float64).reshape(3, 2))
+    data = Data.from_npy(path, ["a", "b", "c"])
+
+    assert isinstance(data.data[0], memoryview)
+    assert [list(row) for row in data.data] == [[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]]
+
+    np.save(path, np.arange(3, dtype=">i4"))
+    with pytest.raises(Exception, match="Unsupported"):
+        Data.from_npy(path)
+
+
+def test_main_reads_binary_stdin(capsys, tmp_path):
+    import io
+    import struct
+
+    labels = tmp_path / "labels.txt"
+    labels.write_text("one\ntwo\n")
+    stdin = io.TextIOWrapper(io.BytesIO(struct.pack("=2d", 1.0, 2.0)))
+    argv = ["termgraph", "--binary", "=d", "--labels", str(labels), "--width", "4"]
+
+    with patch("sys.argv", argv), patch("sys.stdin", stdin):
+        tg.main()
+    assert capsys.readouterr().out == "one: ▇▇ 1.00 \ntwo: ▇▇▇▇ 2.00 \n"
+
+
+def test_from_csv_selects_columns():
+    from termgraph.data import Data
+
+    lines = [
+        'name,city,"sales, q1",q2\n',
+        'alpha,"Rome, IT",10,n/a\n',
+        "beta,Paris,20,4\n",
+    ]
+    data = Data.from_csv(lines, cols=["sales, q1"])
+    assert data.labels == ["alpha", "beta"]
+    assert data.categories == ["sales, q1"]
+
+    data = Data.from_csv(lines, label_col="city", cols=["3"])
+    assert data.labels == ["Rome, IT", "Paris"]
+    assert data.data == [[10.0], [20.0]]
+    assert data.categories == ["sales, q1"]
+
+    # By default the numeric columns are drawn, without a header no categories.
+    data = Data.from_csv(["a;1;x;2\n", "b;3;y;4\n"], delimiter=";")
+    assert data.data == [[1.0, 2.0], [3.0, 4.0]]
+    assert data.categories == []
+
+    # A column missing its first value is reported, not dropped.
+    with pytest.raises(Exception, match="Line 2"):
+        Data.from_csv(["name,a,b\n", "x,1,\n", "y,3,4\n"])
+    with pytest.raises(Exception, match="Line 2"):
+        Data.from_csv(["name,a,b\n", "x,1\n", "y,3,4\n"])
+
+    with pytest.raises(Exception, match="Line 2"):
+        Data.from_csv(lines, cols=["3", "4"])
+    with pytest.raises(Exception, match="No CSV column named 'q9'"):
+        Data.from_csv(lines, cols=["q9"])
+
+
+def test_from_async_iter_merges_sources():
+    import asyncio
+    from termgraph.data import Data
+
+    async def lines():
+        yield "@ a,b\n"
+        yield "one 1 2"  # without a new line
+        await asyncio.sleep(0)
+        yield b"two 3 4\n"
+
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"three 5 6\nfour 7 8")
+        reader.feed_eof()
+        return await Data.from_async_iter(lines(), reader)
+
+    data = asyncio.run(read())
+    assert data.labels == ["one", "two", "three", "four"]
+    assert data.data == [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0], [7.0, 8.0]]
+    assert data.categories == ["a", "b"]
+
+
+def test_main_reads_csv(capsys, tmp_path):
+    path = tmp_path / "sales.tsv"
+    path.write_text("name\tcity\tsales\nalpha\tParis\t1\nbeta\tRome\t2\n")
+    argv = ["termgraph", str(path), "--cols", "sales", "--width", "4"]
+
+    with patch("sys.argv", argv):
+        tg.main()
+    assert capsys.readouterr().out.endswith(
+        "alpha: ▇▇ 1.00 \nbeta : ▇▇▇▇ 2.00 \n"
+    )
+
+
+def test_color_mode(capsys):
+    argv = ["termgraph", "data/ex4.dat", "--color", "red", "blue", "--width", "10"]
+
+    # Not a terminal, so auto writes plain text.
+    with patch("sys.argv", argv):
+        tg.main()
+    assert "\033" not in capsys.readouterr().out
+
+    with patch("sys.argv", argv + ["--color-mode", "always"]):
+        tg.main()
+    lines = capsys.readouterr().out.split("\n")
+    assert lines[0] == "\033[91m▇ Boys \033[94m▇ Girls \033[0m"
+    assert lines[2] == "2007: \033[91m▇▇▇\033[0m 183.32"
+
+    with patch("sys.argv", argv + ["--stacked", "--color-mode", "always"]):
+        tg.main()
+    lines = capsys.readouterr().out.split("\n")
+    assert lines[2] == "2007: \033[91m▇▇▇\033[94m▇▇▇\033[0m 373.84"
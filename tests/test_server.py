@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from termgraph.client import default_socket, forward_argv, parse_request
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+
+CLIENT = [sys.executable, "-c", "from termgraph.client import main; main()"]
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = str(tmp_path / "termgraph.sock")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "termgraph.termgraph", "--serve", "--socket", path, "--jobs", "2"]
+    )
+    for _ in range(100):
+        if os.path.exists(path):
+            break
+        time.sleep(0.05)
+    yield path
+    process.terminate()
+    process.wait(5)
+    assert not os.path.exists(path)
+
+
+def test_client_draws_like_termgraph(server):
+    def termgraph(*args, env=None):
+        return subprocess.run(
+            [*CLIENT, *args], input=b"a 1\nb 2\n", capture_output=True, env=env
+        )
+
+    local = termgraph("data/ex4.dat", "--color-mode", "always")
+    remote = termgraph("--client", "--socket", server, "data/ex4.dat", "--color-mode", "always")
+    assert remote.returncode == 0
+    assert remote.stdout == local.stdout
+
+    # Stdin of the client, and the server from the environment
+    env = dict(os.environ, TERMGRAPH_SERVER=server)
+    text = termgraph("--width", "2", env=env).stdout.decode()
+    assert text == "a: ▇ 1.00 \nb: ▇▇ 2.00 \n"
+
+    error = termgraph("--client", "--socket", server, "--width", "x")
+    assert error.returncode == 2
+    assert b"invalid int value" in error.stderr
+
+
+def test_forward_without_server(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "none.sock")
+    monkeypatch.setenv("TERMGRAPH_SERVER", path)
+
+    # Drawn here, unless the server was asked for
+    assert forward_argv(["data/ex1.dat"]) is None
+    assert forward_argv(["--client", "--foll", "data/ex1.dat"]) is None
+    assert forward_argv(["--client", "data/ex1.dat"]) == 2
+    assert capsys.readouterr().out == f">> Error: No termgraph server is listening on {path}\n"
+
+
+def test_forward_only_to_a_private_socket(tmp_path, monkeypatch, capsys):
+    import socket
+
+    path = str(tmp_path / "open.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+    os.chmod(path, 0o666)
+    try:
+        assert forward_argv(["--client", "--socket", path, "data/ex1.dat"]) == 2
+    finally:
+        listener.close()
+    assert "is not private to this user" in capsys.readouterr().out
+
+    monkeypatch.delenv("TERMGRAPH_SERVER", raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    directory = tmp_path / f"termgraph-{os.getuid()}"
+    assert default_socket() == str(directory / "termgraph.sock")
+
+
+def test_parse_request():
+    payload = b"cwd\0/tmp\0env\0COLUMNS=80\0arg\0--width\0arg\0\0stdin_tty\0"
+    assert parse_request(payload) == {
+        "argv": ["--width", ""],
+        "env": {"COLUMNS": "80"},
+        "cwd": "/tmp",
+        "stdin_tty": "",
+    }
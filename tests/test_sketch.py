@@ -0,0 +1,59 @@
+import random
+from bisect import bisect_left
+
+import pytest
+
+from termgraph.args import Args
+from termgraph.chart import ApproxHistogramChart, HistogramChart
+from termgraph.data import Data
+from termgraph.sketch import KLLSketch
+
+
+def test_sketch_is_exact_below_capacity():
+    sketch = KLLSketch()
+    sketch.extend([5, 1, 4, 2, 3])
+    assert sketch.count == 5
+    assert (sketch.min, sketch.max) == (1, 5)
+    assert sketch.rank(3) == 2
+    assert sketch.rank(3, inclusive=True) == 3
+    assert sketch.quantile(0.5) == 3
+    assert sketch.bin_counts([1, 3, 6]) == [2, 3]
+
+
+def test_sketch_rank_error_within_bound():
+    rng = random.Random(7)
+    values = [rng.gauss(0, 1) for _ in range(100000)]
+    ordered = sorted(values)
+
+    sketch = KLLSketch(seed=7)
+    sketch.extend(values)
+
+    assert sum(map(len, sketch.compactors)) < 3 * sketch.k
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+        value = ordered[int(q * len(ordered))]
+        error = abs(sketch.rank(value) - bisect_left(ordered, value)) / len(values)
+        assert error < 0.0165
+
+
+def test_sketch_merge_matches_count_and_range():
+    left, right = KLLSketch(seed=1), KLLSketch(seed=2)
+    left.extend(range(0, 50000))
+    right.extend(range(50000, 60000))
+    left.merge(right)
+
+    assert left.count == 60000
+    assert (left.min, left.max) == (0, 59999)
+    assert left.quantile(0.5) == pytest.approx(30000, rel=0.05)
+
+
+def test_approx_histogram_matches_exact_for_small_input():
+    values = [[v] for v in (12.5, 15.3, 18.7, 22.1, 25.6, 28.9, 32.4, 35.8, 38.2, 41.7)]
+    args = Args(bins=5, percentiles=True)
+
+    sketch = KLLSketch()
+    sketch.extend(v[0] for v in values)
+
+    exact = HistogramChart(Data(values, [str(i) for i in range(10)]), args).render()
+    approx = ApproxHistogramChart(sketch, args).render()
+    assert approx == exact
+    assert "p50: 25.60 p90: 38.20 p99: 41.70" in exact